@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+import argparse
+import os
+import sys
+from collections import defaultdict
+from devana.syntax_abstraction.organizers.sourcefile import SourceFile
+# pylint: disable=protected-access
+from devana.syntax_abstraction import _detached
+
+
+def collect_elements(paths):
+    """Parse files, evaluate their models completely and return all reachable syntax elements."""
+    elements = {}
+    for path in paths:
+        file = SourceFile.from_path(path)
+        _detached.detach(file)
+        stack = [file]
+        visited = set()
+        while stack:
+            value = stack.pop()
+            if id(value) in visited:
+                continue
+            visited.add(id(value))
+            # elements of model, without lexicons and private helpers
+            if _detached._is_model_object(value) and _detached._get_slot_names(type(value)):
+                if not type(value).__name__.startswith("_"):
+                    elements[id(value)] = value
+            stack.extend(_detached._children(value))
+    return list(elements.values())
+
+
+def size_with_dict(value, shadow_classes):
+    """Size of element with the same attributes stored in instance dictionary (layout without slots)."""
+    cls = type(value)
+    if cls not in shadow_classes:
+        shadow_classes[cls] = type(cls.__name__, (), {})
+    shadow = shadow_classes[cls]()
+    for name, attribute in _detached._fields(value).items():
+        setattr(shadow, name, attribute)
+    return sys.getsizeof(shadow) + sys.getsizeof(shadow.__dict__)
+
+
+def size(value):
+    """Size of element with its current layout."""
+    result = sys.getsizeof(value)
+    if hasattr(value, "__dict__"):
+        result += sys.getsizeof(value.__dict__)
+    return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Memory used by syntax elements: bytes per element with attributes "
+                                                 "stored in instance dictionaries (before) and with the current "
+                                                 "layout (after). Sizes of attribute values are not included.")
+    parser.add_argument("paths", nargs="*", help="Parsed files, by default source files of unit tests.")
+    args = parser.parse_args()
+
+    files = args.paths
+    if not files:
+        directory = os.path.join(os.path.dirname(__file__), os.pardir, "tests", "parsing", "unit", "source_files")
+        files = sorted(os.path.join(directory, f) for f in os.listdir(directory) if f.endswith((".h", ".hpp")))
+
+    statistics = defaultdict(lambda: [0, 0, 0])
+    shadows = {}
+    for element in collect_elements(files):
+        entry = statistics[type(element).__qualname__]
+        entry[0] += 1
+        entry[1] += size_with_dict(element, shadows)
+        entry[2] += size(element)
+
+    print(f"{'element':<40}{'count':>8}{'before':>10}{'after':>10}")
+    print("-" * 68)
+    for name, (count, before, after) in sorted(statistics.items(), key=lambda s: -s[1][1]):
+        print(f"{name:<40}{count:>8}{before // count:>10}{after // count:>10}")
+    print("-" * 68)
+    count = sum(s[0] for s in statistics.values())
+    before = sum(s[1] for s in statistics.values())
+    after = sum(s[2] for s in statistics.values())
+    print(f"{'all':<40}{count:>8}{before // count:>10}{after // count:>10}")
+    print(f"Total: {before} bytes before, {after} bytes after ({100 - after * 100 // before}% less).")
@@ -23,14 +23,15 @@ def download_and_extract_code():
 
 def create_dependency_graph(api: SourceModule):
     network = Network(height='1080px', width='1920px')
-    for i, f in enumerate(api.files):
-        network.add_node(i + 1, label=f.name, physics=False)
-    for i, f in enumerate(api.files):
-        for inc in f.includes:
-            name = os.path.basename(inc.path)
-            for j, s in enumerate(api.files):
-                if name == os.path.basename(s.path):
-                    network.add_edge(i + 1, j + 1, physics=False)
+    graph = api.include_graph()
+    # show only files of module, without standard library and other external headers
+    paths = [path for path in graph.nodes if path.startswith(os.path.abspath(api.path))]
+    for path in paths:
+        network.add_node(path, label=os.path.basename(path), title=path, physics=False)
+    for path in paths:
+        for include in graph.includes(path):
+            if include in paths:
+                network.add_edge(path, include, physics=False)
     network.options.edges.arrows = "to"
     network.show("dependency.html")
 
@@ -1,10 +1,14 @@
 from enum import Enum, auto
 from dataclasses import dataclass, field
+import hashlib
 import logging
+import os
 import platform
+import tempfile
 from pathlib import Path
 from abc import ABC, abstractmethod
-from typing import List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
+from devana.utility.errors import ParsingProfileError
 
 
 class IValidateConfig(ABC):
@@ -75,6 +79,10 @@ class LanguageStandard(Enum):
     def create_default(cls):
         return cls.CPP_17
 
+    def __reduce_ex__(self, protocol):
+        # values are instances of a nested class which cannot be pickled by value, so members are pickled by name
+        return getattr, (type(self), self._name_)  # pylint: disable=no-member
+
 
 class ParsingErrorPolicy(Enum):
     """Rules for dealing with errors when parsing."""
@@ -90,6 +98,24 @@ class ParsingErrorPolicy(Enum):
         return cls.IGNORE
 
 
+class ParsingProfile(Enum):
+    """Defines how deep files are parsed."""
+    FULL = auto()
+    """Complete code model: declarations, function bodies, comments and attributes."""
+    FAST_INDEX = auto()
+    """Declarations only. The backend skips function bodies and comments, attributes and function bodies are
+    not extracted - accessing them raises ParsingProfileError. Much faster for headers with inline implementations."""
+
+    @classmethod
+    def create_default(cls):
+        return cls.FULL
+
+    @property
+    def is_body_extracted(self) -> bool:
+        """Whether function bodies, comments and attributes are available."""
+        return self is ParsingProfile.FULL
+
+
 class StandardLibraryMode(Enum):
     """C/C++ Standard Library delivery mode."""
     NONE = auto()
@@ -116,12 +142,30 @@ class StandardLibraryConfiguration(IValidateConfig):
     """Delivery mode"""
     path: Optional[Path] = None
     """Path for custom standard library, if any."""
+    precompiled_header: bool = False
+    """Parse standard library includes once to precompiled header and reuse it for every parsed file.
+    Available only for DEVANA_CLANG mode and C++ language standards. Header is built once per language standard
+    and cached on disk. Includes satisfied by the precompiled header are not reported by libclang."""
+    precompiled_includes: List[str] = field(default_factory=lambda: [
+        "algorithm", "array", "functional", "map", "memory", "optional", "set", "string", "string_view", "tuple",
+        "unordered_map", "unordered_set", "utility", "vector"
+    ])
+    """Standard library headers included in the precompiled header."""
+    precompiled_cache: Optional[Path] = None
+    """Directory to store precompiled headers. System temporary directory is used if not set."""
+    _precompiled_paths: Dict[Tuple[str, ...], Path] = field(default_factory=lambda: {}, init=False, repr=False,
+                                                            compare=False)
 
     def validate(self):
         if self.mode is StandardLibraryMode.CUSTOM and self.path is None:
             raise ValueError("For custom mode path is required.")
         if self.path is not None and not self.path.is_dir():
             raise ValueError("Path must be directory.")
+        if self.precompiled_header and self.mode is not StandardLibraryMode.DEVANA_CLANG:
+            raise ValueError("Precompiled header is available only for DEVANA_CLANG mode.")
+        if self.precompiled_cache is not None and self.precompiled_cache.exists() \
+                and not self.precompiled_cache.is_dir():
+            raise ValueError("Precompiled header cache path must be directory.")
 
     def get_compilation_flags(self) -> List[str]:
         if self.mode is StandardLibraryMode.PLATFORM:
@@ -136,6 +180,51 @@ class StandardLibraryConfiguration(IValidateConfig):
             return no_std_flags + std_path
         return []
 
+    def get_precompiled_header_flags(self, language: LanguageStandard,
+                                     options: Optional[List[str]] = None) -> List[str]:
+        """Flags to use the precompiled header for the given language standard. The header is built if needed.
+
+        Options are all other parsing options (by default, language and standard library options only). The header
+        is built with them, because libclang rejects headers built with different options, so each set of options
+        has its own header. Paths of headers are remembered, so the header is looked for once per set of options."""
+        if not self.precompiled_header or self.mode is not StandardLibraryMode.DEVANA_CLANG:
+            return []
+        if "-xc++" not in language.value.options:
+            return []
+        if options is None:
+            options = language.value.options + self.get_compilation_flags()
+        key = tuple(options)
+        if key not in self._precompiled_paths:
+            self._precompiled_paths[key] = self._precompiled_header_path(language, options)
+        return ["-include-pch", str(self._precompiled_paths[key])]
+
+    def _precompiled_header_path(self, language: LanguageStandard, options: List[str]) -> Path:
+        from clang import cindex  # pylint: disable=import-outside-toplevel
+        options = [o if o != "-xc++" else "-xc++-header" for o in options]
+        text = "".join(f"#include <{include}>\n" for include in self.precompiled_includes)
+        library = cindex.conf.lib._name  # pylint: disable=protected-access
+        library_stat = os.stat(library) if library and os.path.exists(library) else None
+        key = "\n".join(options + [text, str(library), str(library_stat and library_stat.st_mtime_ns)])
+        digest = hashlib.sha256(key.encode()).hexdigest()[:16]
+        directory = self.precompiled_cache or Path(tempfile.gettempdir()) / "devana" / "pch"
+        path = directory / f"std_{language.name.lower()}_{digest}.pch"
+        if path.exists():
+            return path
+
+        directory.mkdir(parents=True, exist_ok=True)
+        source_name = "devana_precompiled_std.hpp"
+        translation_unit = cindex.Index.create().parse(source_name, args=options,
+                                                       unsaved_files=[(source_name, text)],
+                                                       options=cindex.TranslationUnit.PARSE_INCOMPLETE)
+        errors = [d for d in translation_unit.diagnostics if d.severity >= cindex.Diagnostic.Error]
+        if errors:
+            raise ValueError(f"Unable to build precompiled header: {errors[0].spelling}")
+        # save to unique temporary file first, other processes may build the same header at the same time
+        temporary_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        translation_unit.save(str(temporary_path))
+        os.replace(temporary_path, path)
+        return path
+
 
 @dataclass
 class IncludesSet(IValidateConfig):
@@ -151,6 +240,25 @@ class IncludesSet(IValidateConfig):
         return [f"-I{d}" for d in self.directories]
 
 
+@dataclass
+class TranslationUnitCacheConfiguration(IValidateConfig):
+    """Configuration of on-disk cache of parsed translation units."""
+    directory: Optional[Path] = None
+    """Directory to store serialized translation units. Cache is disabled if not set."""
+    max_size: int = 1024 * 1024 * 1024
+    """Maximum size of cache directory in bytes. The least recently used entries are removed above this limit."""
+
+    @property
+    def is_enabled(self) -> bool:
+        return self.directory is not None
+
+    def validate(self):
+        if self.directory is not None and self.directory.exists() and not self.directory.is_dir():
+            raise ValueError("Cache path must be directory.")
+        if self.max_size < 0:
+            raise ValueError("Cache size can not be negative.")
+
+
 @dataclass
 class ParsingConfiguration(IValidateConfig):
     """Code parser configuration."""
@@ -173,9 +281,43 @@ class ParsingConfiguration(IValidateConfig):
     This is a less powerful solution but more economical in terms of RAM. When working with larger projects,
     we recommend creating multiple modules used sequentially, containing a small slice of local context
     instead of this option."""
+    umbrella_parsing: bool = False
+    """If true, headers of a module are not parsed one by one. Instead, they are included by umbrella translation
+    units (see umbrella_shards) which are parsed once, and each header takes its declarations from the shared
+    syntax tree. Headers included by many others are parsed only once, so it is much faster for header-only
+    libraries, but headers have to be compatible with each other (e.g., protected by header guards). Implementation
+    files are parsed as usual."""
+    umbrella_shards: int = 1
+    """Number of umbrella translation units. Headers are split into shards in order of paths, so headers from the
+    same directory are usually parsed together."""
+    jobs: int = 1
+    """Number of worker processes used to parse files of a module. For values greater than one, files are parsed
+    in a process pool and each worker returns a complete model of its file (without libclang handles) which is
+    merged into the module lexicon."""
+    profile: ParsingProfile = field(default_factory=lambda: ParsingProfile.create_default())
+    """Depth of parsing."""
+    cache: TranslationUnitCacheConfiguration = field(default_factory=lambda: TranslationUnitCacheConfiguration())
+    """On-disk cache of parsed files. If enabled, files are loaded from cache instead of being parsed when
+    neither they, nor their includes, nor parsing options have changed."""
+    intern_types: bool = False
+    """If true, type expressions provide canonical type records (see TypeExpression.record) shared by all expressions
+    of the same type, so types can be compared and hashed by identity of records. Expressions keep their own
+    modification and namespaces, which can be changed in place as before."""
+    mmap_threshold: Optional[int] = None
+    """Parsed files bigger than this size (in bytes) are mapped to memory instead of being read. It avoids copying
+    huge (for example, generated) headers, only the used fragments are loaded. None value disables mapping."""
 
     def validate(self):
+        if self.jobs < 1:
+            raise ValueError("Number of parsing jobs must be greater than zero.")
+        if self.umbrella_shards < 1:
+            raise ValueError("Number of umbrella shards must be greater than zero.")
+        if self.umbrella_parsing and self.file_by_file_parsing:
+            raise ValueError("Umbrella parsing is not available for file by file parsing.")
+        if self.mmap_threshold is not None and self.mmap_threshold < 0:
+            raise ValueError("Memory map threshold can not be negative.")
         self.comments.validate()
+        self.cache.validate()
         self.standard_library.validate()
         self.libraries.validate()
 
@@ -184,7 +326,21 @@ class ParsingConfiguration(IValidateConfig):
         std_library = self.standard_library.get_compilation_flags()
         language = self.language_version.value.options
         other_commands = self.compiler_commands
-        return language + includes + std_library + other_commands
+        options = language + includes + std_library + other_commands
+        return options + self.standard_library.get_precompiled_header_flags(self.language_version, options)
+
+    def parsing_flags(self) -> int:
+        """Backend translation unit options according to the parsing profile."""
+        from clang import cindex  # pylint: disable=import-outside-toplevel
+        if self.profile is ParsingProfile.FAST_INDEX:
+            return cindex.TranslationUnit.PARSE_SKIP_FUNCTION_BODIES | cindex.TranslationUnit.PARSE_INCOMPLETE
+        return cindex.TranslationUnit.PARSE_NONE
+
+    def require_full_profile(self, feature: str):
+        """Raise ParsingProfileError if the given feature is not extracted with the current parsing profile."""
+        if not self.profile.is_body_extracted:
+            raise ParsingProfileError(f"{feature.capitalize()} are not available for {self.profile.name} "
+                                      f"parsing profile.")
 
 
 @dataclass
@@ -211,6 +367,7 @@ class Configuration(IValidateConfig):
     @staticmethod
     def _create_default_logger():
         logger = logging.getLogger("devana")
-        logger.addHandler(logging.StreamHandler())
+        if not logger.handlers:
+            logger.addHandler(logging.StreamHandler())
         logger.setLevel(logging.WARNING)
         return logger
@@ -0,0 +1,34 @@
+from typing import Any, Callable, Dict, Hashable, Iterable, List
+from clang import cindex
+
+
+class CursorDispatch:
+    """Table of candidate types for kinds of cursors created once for a list of content types.
+
+    Types declare kinds of cursors they handle by cursor_kinds (see ICursorValidate). Candidates of every kind keep
+    the order of content types, so the first type which creates an element wins as before. Types without declared
+    kinds are candidates for all cursors."""
+
+    _dispatches: Dict[Hashable, "CursorDispatch"] = {}
+
+    def __init__(self, types: Iterable[Any]):
+        types = list(types)
+        kinds = {k for t in types for k in (getattr(t, "cursor_kinds", None) or ())}
+        self._fallback: List[Any] = [t for t in types if getattr(t, "cursor_kinds", None) is None]
+        self._candidates: Dict[cindex.CursorKind, List[Any]] = {
+            kind: [t for t in types if getattr(t, "cursor_kinds", None) is None or kind in t.cursor_kinds]
+            for kind in kinds
+        }
+
+    def candidates(self, kind: cindex.CursorKind) -> List[Any]:
+        """Types which can create element from cursor of given kind, in order of content types."""
+        return self._candidates.get(kind, self._fallback)
+
+    @classmethod
+    def get_dispatch(cls, owner: Hashable, types: Callable[[], Iterable[Any]]) -> "CursorDispatch":
+        """Table of owner (usually type of container) created from its content types on the first use."""
+        dispatch = cls._dispatches.get(owner)
+        if dispatch is None:
+            dispatch = cls(types())
+            cls._dispatches[owner] = dispatch
+        return dispatch
@@ -0,0 +1,116 @@
+import os
+from typing import Dict, Iterable, Iterator, List, Optional, Set
+from clang import cindex
+
+
+_CHILD_VISIT_CONTINUE = 1
+
+
+class CursorTree:
+    """Record of cursors of translation unit created in a single traversal.
+
+    Kind, spelling, extent and type of every cursor are evaluated once (libclang cursors cache them) and children of
+    every cursor are stored, so elements do not visit the same children through ctypes again. Declarations from
+    included files are recorded as children of translation unit, but their own children are not visited - they are
+    used only on demand (e.g. as external types) and are read directly from libclang. The exception are main files
+    of translation unit (see set_main_files) - declarations from them are visited and grouped by file."""
+
+    _attribute = "_devana_cursor_tree"
+    _main_files_attribute = "_devana_main_files"
+
+    def __init__(self, translation_unit: cindex.TranslationUnit):
+        self._children: Dict[cindex.Cursor, List[cindex.Cursor]] = {}
+        self._file_children: Dict[str, List[cindex.Cursor]] = {}
+        self._build(translation_unit)
+
+    def _build(self, translation_unit: cindex.TranslationUnit):
+        root = translation_unit.cursor
+        main_files = self.main_files(translation_unit)
+        self._file_children = {f: [] for f in main_files}
+        file_keys: Dict[str, Optional[str]] = {}
+        stack = [root]
+
+        def visitor(child, _, children):
+            child._tu = translation_unit  # pylint: disable=protected-access
+            _ = child.spelling, child.extent, child.type
+            children.append(child)
+            return _CHILD_VISIT_CONTINUE
+
+        callback = cindex.callbacks["cursor_visit"](visitor)
+        while stack:
+            parent = stack.pop()
+            children = []
+            cindex.conf.lib.clang_visitChildren(parent, callback, children)
+            self._children[parent] = children
+            if parent is root:
+                children = []
+                for child in self._children[root]:
+                    file = child.location.file
+                    if file is None:
+                        continue
+                    if file.name not in file_keys:
+                        key = os.path.abspath(file.name)
+                        file_keys[file.name] = key if key in main_files else None
+                    if file_keys[file.name] is not None:
+                        self._file_children[file_keys[file.name]].append(child)
+                        children.append(child)
+            stack.extend(children)
+
+    def children(self, cursor: cindex.Cursor) -> Optional[List[cindex.Cursor]]:
+        """Recorded children of cursor or None if cursor was not visited."""
+        return self._children.get(cursor)
+
+    def file_children(self, path: str) -> Optional[List[cindex.Cursor]]:
+        """Children of translation unit declared in the main file or None if the file is not a main file."""
+        return self._file_children.get(os.path.abspath(str(path)))
+
+    @classmethod
+    def main_files(cls, translation_unit: cindex.TranslationUnit) -> Set[str]:
+        """Absolute paths of files which declarations are parsed from translation unit."""
+        main_files = getattr(translation_unit, cls._main_files_attribute, None)
+        if main_files is None:
+            return {os.path.abspath(translation_unit.spelling)}
+        return main_files
+
+    @classmethod
+    def set_main_files(cls, translation_unit: cindex.TranslationUnit, files: Iterable[str]):
+        """Set files which declarations are parsed from translation unit instead of its main file. It is used by
+        translation units which only include parsed files (for example, umbrella translation units of module)."""
+        setattr(translation_unit, cls._main_files_attribute, {os.path.abspath(str(f)) for f in files})
+        cls.invalidate(translation_unit)
+
+    @classmethod
+    def get_tree(cls, translation_unit: cindex.TranslationUnit) -> "CursorTree":
+        """Tree of translation unit. It is created on the first use."""
+        tree = getattr(translation_unit, cls._attribute, None)
+        if tree is None:
+            tree = cls(translation_unit)
+            # tree is kept by translation unit to share its lifetime with cursors
+            setattr(translation_unit, cls._attribute, tree)
+        return tree
+
+    @classmethod
+    def invalidate(cls, translation_unit: cindex.TranslationUnit):
+        """Remove tree of translation unit. It has to be called when translation unit is reparsed."""
+        if hasattr(translation_unit, cls._attribute):
+            delattr(translation_unit, cls._attribute)
+
+
+def get_children(cursor: cindex.Cursor) -> Iterator[cindex.Cursor]:
+    """Children of cursor taken from tree of its translation unit. Cursors outside the tree are visited directly."""
+    translation_unit = getattr(cursor, "_tu", None)
+    if translation_unit is not None:
+        children = CursorTree.get_tree(translation_unit).children(cursor)
+        if children is not None:
+            return iter(children)
+    return cursor.get_children()
+
+
+def get_file_children(translation_unit: cindex.TranslationUnit, path: str) -> List[cindex.Cursor]:
+    """Children of translation unit declared in given file."""
+    children = CursorTree.get_tree(translation_unit).file_children(path)
+    if children is not None:
+        return children
+    path = os.path.abspath(str(path))
+    return [c for c in translation_unit.cursor.get_children()
+            if c.location.file is not None and os.path.abspath(c.location.file.name) == path]
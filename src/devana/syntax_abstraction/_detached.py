@@ -0,0 +1,226 @@
+from typing import Any, Dict, List, Set, Tuple
+from clang import cindex
+from devana.syntax_abstraction.codepiece import CodePiece
+from devana.utility.lazy import LazyNotInit, LazyError, is_lazy
+
+
+_SKIPPED_PROPERTIES = ("source_file",)
+"""Lazy properties that do not need libclang and would parse other files if evaluated eagerly."""
+
+_EXTERNAL_SKIPPED_PROPERTIES = _SKIPPED_PROPERTIES + ("content", "values", "specialisations")
+"""External types are detached shallowly - their bodies (and specialisations, which need bodies of all types of
+their lexicons) are not part of the parsed file."""
+
+
+_EXPECTED_ERRORS = (ValueError, NotImplementedError, OSError)
+"""Errors raised by lazy properties for code which cannot be represented (errors of devana derive from ValueError)
+or for sources which cannot be read."""
+
+
+_slot_names: Dict[type, Tuple[str, ...]] = {}
+"""Names of slots of classes, including slots of base classes."""
+
+_properties: Dict[Tuple[type, Tuple[str, ...]], List[Tuple[str, property]]] = {}
+"""Backing fields of properties of classes."""
+
+_model_types: Dict[type, bool] = {}
+"""Classes of model objects - objects of devana which store their attributes."""
+
+_missing = object()
+
+
+def _get_slot_names(cls: type) -> Tuple[str, ...]:
+    if cls not in _slot_names:
+        names = []
+        for base in cls.__mro__:
+            slots = base.__dict__.get("__slots__", ())
+            for name in (slots,) if isinstance(slots, str) else slots:
+                if name not in ("__dict__", "__weakref__") and name not in names:
+                    names.append(name)
+        _slot_names[cls] = tuple(names)
+    return _slot_names[cls]
+
+
+def _fields(value: Any) -> Dict[str, Any]:
+    """Attributes of element, both from slots and from instance dictionary."""
+    fields = {}
+    for name in _get_slot_names(type(value)):
+        attribute = getattr(value, name, _missing)
+        if attribute is not _missing:
+            fields[name] = attribute
+    fields.update(getattr(value, "__dict__", {}))
+    return fields
+
+
+def _is_model_object(value: Any) -> bool:
+    cls = type(value)
+    if cls not in _model_types:
+        _model_types[cls] = cls.__module__.startswith("devana.") and not issubclass(cls, (list, tuple, dict)) and (
+                cls.__dictoffset__ != 0 or len(_get_slot_names(cls)) > 0)
+    return _model_types[cls]
+
+
+def _is_backend_object(value: Any) -> bool:
+    return type(value).__module__ == cindex.__name__
+
+
+def _lazy_properties(cls: type, names: Tuple[str, ...]) -> List[Tuple[str, property]]:
+    """Fields of class given by names which are backing fields of properties (property name without leading
+    underscore)."""
+    key = (cls, names)
+    if key not in _properties:
+        _properties[key] = [(name, getattr(cls, name[1:])) for name in names if name.startswith("_")
+                            and isinstance(getattr(cls, name[1:], None), property)]
+    return _properties[key]
+
+
+def _evaluate_lazy(element: Any, skipped: Tuple[str, ...]):
+    """Evaluate all not initialized lazy properties of element and store computed values. Evaluation of property may
+    reset other properties, so it is repeated until no property is pending.
+
+    Expected errors of lazy properties are stored and raised again on access (see LazyError), as the same property
+    of not detached model raises them. Other errors are raised."""
+    names = _get_slot_names(type(element)) + tuple(getattr(element, "__dict__", ()))
+    properties = [(name, p) for name, p in _lazy_properties(type(element), names) if name[1:] not in skipped]
+    while True:
+        pending = [(name, p) for name, p in properties if getattr(element, name, None) is LazyNotInit]
+        if not pending:
+            return
+        for name, p in pending:
+            try:
+                value = p.fget(element)
+            except _EXPECTED_ERRORS as e:
+                if not is_lazy(p.fget):
+                    raise
+                value = LazyError(e)
+            if getattr(element, name, None) is LazyNotInit:
+                setattr(element, name, value)
+
+
+def _is_external(element: Any, root: Any) -> bool:
+    # pylint: disable=import-outside-toplevel
+    from devana.syntax_abstraction.organizers.codecontainer import CodeContainer
+    from devana.syntax_abstraction.typedefinfo import TypedefInfo
+    if element is root or not isinstance(element, (CodeContainer, TypedefInfo)):
+        return False
+    return getattr(element, "_parent", None) is None and isinstance(getattr(element, "_cursor", None), cindex.Cursor)
+
+
+def _children(value: Any) -> List[Any]:
+    if isinstance(value, (list, tuple)):
+        return list(value)
+    if isinstance(value, dict):
+        return list(value.values())
+    if _is_model_object(value):
+        return list(_fields(value).values())
+    return []
+
+
+def _materialize(root: Any, stack: List[Any], visited: Dict[int, Any], shallow: Set[int],
+                 externals: Dict[int, Tuple[Any, List[str]]], *, is_shallow: bool) -> List[Any]:
+    """Evaluate lazy properties of all not visited elements reachable from stack and add them to visited.
+
+    External types are evaluated only if is_shallow is set, otherwise they are returned to be evaluated later. All
+    elements evaluated with is_shallow set are evaluated shallowly and they are added to shallow."""
+    # pylint: disable=import-outside-toplevel
+    from devana.syntax_abstraction.organizers.lexicon import Lexicon
+    deferred = []
+    skipped = _EXTERNAL_SKIPPED_PROPERTIES if is_shallow else _SKIPPED_PROPERTIES
+    while stack:
+        value = stack.pop()
+        if id(value) in visited:
+            continue
+        if _is_model_object(value) and _is_external(value, root):
+            if id(value) not in externals:
+                externals[id(value)] = (value, Lexicon.semantic_path(value._cursor))  # pylint: disable=protected-access
+            if not is_shallow:
+                deferred.append(value)
+                continue
+        visited[id(value)] = value
+        if not _is_model_object(value):
+            stack.extend(_children(value))
+            continue
+        _evaluate_lazy(value, skipped)
+        if isinstance(value, CodePiece) and value._cursor is not None:  # pylint: disable=protected-access
+            try:
+                value.text = value.text
+            except _EXPECTED_ERRORS:
+                value.text = None
+        if is_shallow:
+            shallow.add(id(value))
+            stack.extend(a for n, a in _fields(value).items() if n[1:] not in skipped)
+        else:
+            stack.extend(_children(value))
+    return deferred
+
+
+def _new_children(visited: Dict[int, Any], shallow: Set[int]) -> Tuple[List[Any], List[Any]]:
+    """Not visited objects referenced by visited objects: referenced by fully evaluated objects and referenced by
+    shallowly evaluated objects."""
+    children = []
+    shallow_children = []
+    for value in visited.values():
+        if id(value) in shallow:
+            shallow_children.extend(a for n, a in _fields(value).items()
+                                    if n[1:] not in _EXTERNAL_SKIPPED_PROPERTIES and id(a) not in visited)
+        else:
+            children.extend(c for c in _children(value) if id(c) not in visited)
+    return children, shallow_children
+
+
+def detach(root: Any) -> List[Tuple[Any, List[str]]]:
+    """Fully evaluate the model reachable from root and remove all libclang handles from it,
+    so the model can be pickled and used without libclang.
+
+    Types declared outside the root (created as external types) are detached shallowly. They are returned
+    with their semantic path (namespaces, classes and own name) to allow linking them to the matching types
+    of a bigger lexicon later, see rebind."""
+    externals: Dict[int, Tuple[Any, List[str]]] = {}
+    visited: Dict[int, Any] = {}
+    shallow: Set[int] = set()
+    stack = [root]
+    shallow_stack = []
+    while stack or shallow_stack:
+        shallow_stack.extend(_materialize(root, stack, visited, shallow, externals, is_shallow=False))
+        _materialize(root, shallow_stack, visited, shallow, externals, is_shallow=True)
+        # evaluation of lazy properties may create new elements bound to already visited objects (e.g. lexicon
+        # entries), so visited objects are checked until no new objects appear
+        stack, shallow_stack = _new_children(visited, shallow)
+
+    for value in visited.values():
+        if not _is_model_object(value):
+            continue
+        for name, attribute in _fields(value).items():
+            if _is_backend_object(attribute):
+                setattr(value, name, None)
+            elif id(value) in shallow and name[1:] in _EXTERNAL_SKIPPED_PROPERTIES:
+                if name[1:] not in _SKIPPED_PROPERTIES:
+                    setattr(value, name, [])
+    return list(externals.values())
+
+
+def rebind(root: Any, replacements: Dict[int, Any], is_bound: bool = False):
+    """Replace every reference reachable from root to objects given by id in replacements. Replaced objects are not
+    visited. If is_bound is set, objects which replace others are not visited as well - they belong to the model
+    root is bound to, so only objects of root are visited."""
+    if not replacements:
+        return
+    skipped = set(replacements)
+    if is_bound:
+        skipped.update(id(r) for r in replacements.values())
+    visited: Dict[int, Any] = {}
+    stack = [root]
+    while stack:
+        value = stack.pop()
+        if id(value) in visited:
+            continue
+        visited[id(value)] = value
+        stack.extend(c for c in _children(value) if id(c) not in skipped)
+        if isinstance(value, list):
+            for i, item in enumerate(value):
+                if id(item) in replacements:
+                    value[i] = replacements[id(item)]
+        elif _is_model_object(value):
+            for name, attribute in _fields(value).items():
+                if id(attribute) in replacements:
+                    setattr(value, name, replacements[id(attribute)])
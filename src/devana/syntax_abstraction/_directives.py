@@ -0,0 +1,104 @@
+import re
+from bisect import bisect_right
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+from clang import cindex
+from devana.syntax_abstraction.sourcebuffer import get_derived, read_text
+
+
+_DIRECTIVE_LEXER = re.compile(r"""
+    ^[ \t]*\#[ \t]*(?P<name>\w+)(?P<argument>(?:\\\n|[^\n])*)
+    |/\*.*?(?:\*/|\Z)
+    |//[^\n]*
+    |(?:u8|[uUL])?R"(?P<delimiter>[^()\\\s"]{0,16})\(.*?\)(?P=delimiter)"
+    |"(?:\\.|[^"\\\n])*"
+    |'(?:\\.|[^'\\\n])*'
+    |\.?\d(?:[eEpP][+-]|[\w.'])*
+    |[A-Za-z_]\w*
+""", re.DOTALL | re.MULTILINE | re.VERBOSE)
+"""Lexer of preprocessor directives. Comments and literals are matched as well, so directives inside them are
+skipped."""
+
+_INCLUDE_ARGUMENT = re.compile(r'\s*(?:"([^"]+)"|<([^>]+)>)')
+
+
+@dataclass(frozen=True)
+class Directive:
+    """Preprocessor directive found in file."""
+
+    name: str
+    """Name of directive, for example: include, ifndef or pragma."""
+    argument: str
+    """Text after the name of directive."""
+    line: int
+    """Line of directive (counted from 1)."""
+    offset: int
+    """Offset of directive in text of file."""
+    text: str
+    """Whole text of directive line."""
+
+    @property
+    def word(self) -> Optional[str]:
+        """First word of argument, for example name of defined macro."""
+        words = self.argument.split(maxsplit=1)
+        return words[0] if words else None
+
+    @property
+    def include(self) -> Optional[Tuple[str, bool]]:
+        """Included file and information if it is a standard include (in angle brackets). None if directive is not
+        a valid include."""
+        if self.name != "include":
+            return None
+        match = _INCLUDE_ARGUMENT.match(self.argument)
+        if match is None:
+            return None
+        return (match.group(1), False) if match.group(1) is not None else (match.group(2), True)
+
+
+class DirectiveIndex:
+    """All preprocessor directives of file found by a single scan of the file text."""
+
+    def __init__(self, text: str):
+        line_starts = [0] + [m.end() for m in re.finditer("\n", text)]
+        lines = text.split("\n")
+        self.directives: List[Directive] = []
+        for match in _DIRECTIVE_LEXER.finditer(text):
+            if match.group("name") is None:
+                continue
+            line = bisect_right(line_starts, match.start())
+            self.directives.append(Directive(match.group("name"), match.group("argument").strip(), line, match.start(),
+                                             lines[line - 1].rstrip()))
+        self._by_line: Dict[int, Directive] = {d.line: d for d in reversed(self.directives)}
+
+    @property
+    def includes(self) -> List[Directive]:
+        """All valid include directives."""
+        return [d for d in self.directives if d.include is not None]
+
+    @property
+    def pragma_once(self) -> Optional[Directive]:
+        """Pragma once directive if present."""
+        return next((d for d in self.directives if d.name == "pragma" and d.word == "once"), None)
+
+    def at_line(self, line: int) -> Optional[Directive]:
+        """Directive which starts on given line."""
+        return self._by_line.get(line)
+
+    def header_guard(self, first_content_line: int, last_content_line: int) -> Optional[str]:
+        """Name of macro used as header guard: the first #ifndef before content, directly followed by #define of
+        the same macro, closed by #endif after content."""
+        ifndef = next((d for d in self.directives if d.name == "ifndef" and d.line <= first_content_line), None)
+        if ifndef is None:
+            return None
+        define = self.at_line(ifndef.line + 1)
+        if define is None or define.name != "define" or define.word != ifndef.word:
+            return None
+        if not any(d.name == "endif" and d.line > last_content_line for d in self.directives):
+            return None
+        return ifndef.word
+
+
+def get_directives(path: str, translation_unit: Optional[cindex.TranslationUnit] = None) -> DirectiveIndex:
+    """Directive index of file (see sourcebuffer.read_text for translation_unit). Index is kept with the content of
+    the file, so it is created again only if the content was changed."""
+    return get_derived(path, "directives", lambda: DirectiveIndex(read_text(path, translation_unit)), translation_unit)
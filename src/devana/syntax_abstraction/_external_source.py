@@ -1,9 +1,9 @@
-from typing import Optional, Any
+from typing import Optional, Any, List
 from clang import cindex
+from devana.syntax_abstraction._cursordispatch import CursorDispatch
 
 
-def create_external(cursor: cindex.Cursor) -> Optional[Any]:
-    """Create external content without lexicon."""
+def _external_types() -> List[Any]:
     # pylint: disable=import-outside-toplevel
     from devana.syntax_abstraction.classinfo import ClassInfo
     from devana.syntax_abstraction.unioninfo import UnionInfo
@@ -15,9 +15,13 @@ def create_external(cursor: cindex.Cursor) -> Optional[Any]:
     from devana.syntax_abstraction.variable import GlobalVariable
     from devana.syntax_abstraction.externc import ExternC
     from devana.syntax_abstraction.using import Using
-    types = [ClassInfo, UnionInfo, FunctionInfo, EnumInfo, TypedefInfo, NamespaceInfo, UsingNamespace,
-             GlobalVariable, ExternC, Using]
-    for candidate in types:
+    return [ClassInfo, UnionInfo, FunctionInfo, EnumInfo, TypedefInfo, NamespaceInfo, UsingNamespace,
+            GlobalVariable, ExternC, Using]
+
+
+def create_external(cursor: cindex.Cursor) -> Optional[Any]:
+    """Create external content without lexicon."""
+    for candidate in CursorDispatch.get_dispatch(create_external, _external_types).candidates(cursor.kind):
         instance: Optional = candidate.from_cursor(cursor)
         if instance:
             return instance
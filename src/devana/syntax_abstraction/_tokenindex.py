@@ -0,0 +1,87 @@
+import os
+from array import array
+from bisect import bisect_left
+from typing import Dict, List
+from clang import cindex
+from devana.syntax_abstraction._cursortree import CursorTree
+from devana.syntax_abstraction.sourcebuffer import read_bytes
+
+
+class TokenIndex:
+    """Tokens of one file of translation unit created by a single tokenization of the whole file.
+
+    Tokens are stored compactly as arrays of kinds, offsets and lengths. Spellings are interned - every distinct
+    spelling is stored once and tokens keep only its index. Elements query tokens by extent instead of tokenizing
+    their extents through libclang again."""
+
+    _attribute = "_devana_token_indexes"
+
+    def __init__(self, translation_unit: cindex.TranslationUnit, file_name: str):
+        self.kinds = array("B")
+        self.offsets = array("L")
+        self.lengths = array("L")
+        self._spelling_ids = array("L")
+        self._spellings: List[str] = []
+        self._build(translation_unit, file_name)
+
+    def _build(self, translation_unit: cindex.TranslationUnit, file_name: str):
+        file = cindex.File.from_name(translation_unit, file_name)
+        size = len(read_bytes(file_name, translation_unit))
+        extent = cindex.SourceRange.from_locations(cindex.SourceLocation.from_offset(translation_unit, file, 0),
+                                                   cindex.SourceLocation.from_offset(translation_unit, file, size))
+        interned: Dict[str, int] = {}
+        for token in translation_unit.get_tokens(extent=extent):
+            spelling = token.spelling
+            self.kinds.append(token.kind.value)
+            self.offsets.append(token.location.offset)
+            self.lengths.append(len(spelling.encode()))
+            self._spelling_ids.append(interned.setdefault(spelling, len(interned)))
+        self._spellings = list(interned)
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def spelling(self, position: int) -> str:
+        """Spelling of token on given position."""
+        return self._spellings[self._spelling_ids[position]]
+
+    def find(self, start: int, end: int) -> range:
+        """Positions of tokens starting in range of offsets [start, end)."""
+        return range(bisect_left(self.offsets, start), bisect_left(self.offsets, end))
+
+    def spellings(self, start: int, end: int) -> List[str]:
+        """Spellings of tokens starting in range of offsets [start, end)."""
+        return [self.spelling(i) for i in self.find(start, end)]
+
+    @classmethod
+    def get_index(cls, translation_unit: cindex.TranslationUnit, file_name: str) -> "TokenIndex":
+        """Index of file from translation unit. It is created on the first use."""
+        indexes = getattr(translation_unit, cls._attribute, None)
+        if indexes is None:
+            indexes = {}
+            setattr(translation_unit, cls._attribute, indexes)
+        if file_name not in indexes:
+            indexes[file_name] = cls(translation_unit, file_name)
+        return indexes[file_name]
+
+    @classmethod
+    def invalidate(cls, translation_unit: cindex.TranslationUnit):
+        """Remove indexes of translation unit. It has to be called when translation unit is reparsed."""
+        if hasattr(translation_unit, cls._attribute):
+            delattr(translation_unit, cls._attribute)
+
+
+def get_token_spellings(cursor: cindex.Cursor) -> List[str]:
+    """Spellings of tokens of cursor extent taken from index of its file. Only main files of translation units (see
+    CursorTree.main_files) are indexed - declarations from included files (for example, external types from standard
+    library) are used rarely, so they are tokenized directly."""
+    translation_unit = getattr(cursor, "_tu", None)
+    extent = cursor.extent
+    if translation_unit is not None and extent.start.file is not None:
+        if os.path.abspath(extent.start.file.name) in CursorTree.main_files(translation_unit):
+            try:
+                index = TokenIndex.get_index(translation_unit, extent.start.file.name)
+            except IOError:
+                return [t.spelling for t in cursor.get_tokens()]
+            return index.spellings(extent.start.offset, extent.end.offset)
+    return [t.spelling for t in cursor.get_tokens()]
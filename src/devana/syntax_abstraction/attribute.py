@@ -1,7 +1,8 @@
-from typing import Optional, List, Any
+from typing import Optional, List, Any, Callable
 import re
 from devana.utility.lazy import LazyNotInit, lazy_invoke
-from devana.syntax_abstraction.codepiece import CodePiece
+from devana.syntax_abstraction.sourcebuffer import read_bytes, offset
+from devana.configuration import Configuration
 
 
 class Attribute:
@@ -14,6 +15,8 @@ class Attribute:
     Whether the attributes will be printed depends on the currently used configuration.
     Attributes are pre-parsed to extract the namespace and arguments. """
 
+    __slots__ = ("_name", "_namespace", "_arguments", "_parent")
+
     def __init__(self, name: str, namespace: Optional = None, arguments: Optional[List[str]] = None,
                  parent: Optional = None):
         self._name = name
@@ -130,6 +133,8 @@ class AttributeDeclaration:
     """C++11 attribute declaration. Provides a description of a single declaration in curly braces that may contain
     either the using keyword or a list of multiple attributes."""
 
+    __slots__ = ("_attributes", "_using_namespace", "_parent")
+
     def __init__(self, attributes: List[Attribute], using_namespace: Optional[str] = None, parent: Optional = None):
         self._attributes = attributes
         self._using_namespace = using_namespace
@@ -157,33 +162,53 @@ class AttributeDeclaration:
     def parent(self) -> Optional:
         return self._parent
 
+    _declaration_pattern = re.compile(rb"\[\[(.*?)\]\]", re.DOTALL)
+
     @classmethod
     def create_from_element(cls, source: Any, scope: List[Any], parent: Optional = None) -> List:
         if not hasattr(source, "parent"):
             return []
         if source.parent is None:
             return []
+        return cls.create_from_scope(source, scope, lambda _: parent)[scope.index(source)]
 
-        index_in_scope = scope.index(source)
-        begin = source.parent.text_source.begin if index_in_scope == 0 else scope[index_in_scope - 1].text_source.end
-        end = source.text_source.begin
-        text = CodePiece.from_location(begin, end, source.parent.text_source.file).text
-        pattern = r"\[\[(.*?)\]\]"
-        attributes_declarations = re.findall(pattern, text)
-        if attributes_declarations is None:
-            return []
+    @classmethod
+    def create_from_scope(cls, source: Any, scope: List[Any],
+                          parent_of: Callable[[Any], Optional[Any]]) -> List[List["AttributeDeclaration"]]:
+        """Create attribute declarations of all elements of scope (siblings of source), in order of scope.
+        Declarations of element are searched between the end of previous element (or the begin of parent of source)
+        and the begin of element. Every range is searched once, without decoding the text of file.
+        The parent of declarations is given by parent_of function called with element of scope."""
+        Configuration.get_configuration(source).parsing.require_full_profile("attributes")
+        parent_piece = source.parent.text_source
+        data = read_bytes(parent_piece.file, parent_piece.translation_unit)
         result = []
-        for decl in attributes_declarations:
-            using_pattern = r"^using (\w+) : "
-            using_match = re.match(using_pattern, decl)
-            namespace = None
-            if using_match:
-                namespace = using_match[1]
-            attributes = Attribute.from_whole_declaration_text(decl, parent)
-            result.append(AttributeDeclaration(attributes, namespace, parent))
-
+        begin = parent_piece.begin
+        for element in scope:
+            text_source = getattr(element, "text_source", None)
+            if text_source is None:
+                result.append([])
+                continue
+            end = text_source.begin
+            start_offset = offset(parent_piece.file, begin.row, begin.col, parent_piece.translation_unit)
+            end_offset = offset(parent_piece.file, end.row, end.col + 1, parent_piece.translation_unit)
+            declarations = []
+            for match in cls._declaration_pattern.finditer(data, start_offset, end_offset):
+                declarations.append(cls._from_declaration_text(match.group(1).decode(), parent_of(element)))
+            result.append(declarations)
+            begin = text_source.end
         return result
 
+    @classmethod
+    def _from_declaration_text(cls, text: str, parent: Optional = None) -> "AttributeDeclaration":
+        using_pattern = r"^using (\w+) : "
+        using_match = re.match(using_pattern, text)
+        namespace = None
+        if using_match:
+            namespace = using_match[1]
+        attributes = Attribute.from_whole_declaration_text(text, parent)
+        return AttributeDeclaration(attributes, namespace, parent)
+
     def __repr__(self):
         result = ""
         if self.using_namespace is not None:
@@ -198,6 +223,10 @@ class AttributeDeclaration:
 class DescriptiveByAttributes:
     """Mixin class for implement C++ standard attributes linked to a code element."""
 
+    # fields of mixin are declared by elements, so they can use slots of other bases
+    __slots__ = ()
+    # pylint: disable=assigning-non-slot
+
     def __init__(self, cursor: Optional, parent: Optional = None):
         if cursor is None:
             self._attributes = []
@@ -209,10 +238,28 @@ class DescriptiveByAttributes:
     @lazy_invoke
     def attributes(self) -> List[AttributeDeclaration]:
         """C++11/C23 attributes associated with the syntax."""
-        self._attributes = AttributeDeclaration.create_from_element(self, self._parent.content if self._parent else [],
-                                                                    self)
+        if self._parent is None:
+            self._attributes = []
+            return self._attributes
+        self._attributes = self._create_scope_attributes(self._parent.content, lambda element: element)
         return self._attributes
 
+    def _create_scope_attributes(self, scope: List[Any],
+                                 parent_of: Callable[[Any], Optional[Any]]) -> List[AttributeDeclaration]:
+        """Create attributes of element and all its siblings from scope which use the same attributes property,
+        so declarations of the whole scope are searched once. Attributes of element are returned and attributes of
+        siblings are assigned to them."""
+        property_source = getattr(type(self), "attributes")
+        declarations = AttributeDeclaration.create_from_scope(self, scope, parent_of)
+        result = []
+        for element, element_declarations in zip(scope, declarations):
+            if element is self:
+                result = element_declarations
+            elif (getattr(type(element), "attributes", None) is property_source
+                  and getattr(element, "_attributes", None) is LazyNotInit):
+                element._attributes = element_declarations  # pylint: disable=protected-access
+        return result
+
     @attributes.setter
     def attributes(self, value: List[AttributeDeclaration]):
         self._attributes = value
@@ -1,7 +1,11 @@
+from abc import abstractmethod
 from enum import Enum, auto
 import re
 from typing import Optional, List, Tuple, cast, Any, Union
 from clang import cindex
+from devana.syntax_abstraction._tokenindex import get_token_spellings
+from devana.syntax_abstraction._cursortree import get_children
+from devana.syntax_abstraction._cursordispatch import CursorDispatch
 from devana.syntax_abstraction.functioninfo import FunctionInfo, FunctionModification
 from devana.syntax_abstraction.organizers.codecontainer import CodeContainer
 from devana.syntax_abstraction.codepiece import CodePiece
@@ -41,7 +45,11 @@ class AccessSpecifier(Enum):
 
 
 class ClassMember(IBasicCreatable, ISyntaxElement):
-    """Base class for all class members."""
+    """Base class for all class members. Members declare the _access_specifier slot - the class stays abstract
+    until they do."""
+
+    # fields of mixin are declared by members, so they can use slots of other bases
+    __slots__ = ()
 
     def __init__(self, cursor: Optional[cindex.Cursor] = None):
         if cursor is None:
@@ -49,6 +57,11 @@ class ClassMember(IBasicCreatable, ISyntaxElement):
         else:
             self._access_specifier = AccessSpecifier.from_cursor(cursor)
 
+    @property
+    @abstractmethod
+    def _access_specifier(self) -> AccessSpecifier:
+        """Storage of access specifier, overwritten by slot of member."""
+
     @classmethod
     def create_default(cls, _: Optional = None) -> "ClassMember":
         result = cls(None)
@@ -185,6 +198,8 @@ class MethodType(Enum):
 class MethodInfo(FunctionInfo, ClassMember):
     """Information abut class member function - methods."""
 
+    __slots__ = ("_type", "_access_specifier")
+
     def __init__(self, cursor: Optional[cindex.Cursor] = None, parent: Optional[CodeContainer] = None):
         FunctionInfo.__init__(self, cursor, parent)
         ClassMember.__init__(self, cursor)
@@ -231,10 +246,15 @@ class MethodInfo(FunctionInfo, ClassMember):
     def type(self, value):
         self._type = value
 
+    cursor_kinds = (
+        cindex.CursorKind.CXX_METHOD,
+        cindex.CursorKind.FUNCTION_TEMPLATE,
+        cindex.CursorKind.CONVERSION_FUNCTION
+    )
+
     @staticmethod
     def is_cursor_valid(cursor: cindex.Cursor) -> bool:
-        return cursor.kind in (cindex.CursorKind.CXX_METHOD, cindex.CursorKind.FUNCTION_TEMPLATE,
-                               cindex.CursorKind.CONVERSION_FUNCTION)
+        return cursor.kind in MethodInfo.cursor_kinds
 
     @property
     @lazy_invoke
@@ -259,9 +279,13 @@ class MethodInfo(FunctionInfo, ClassMember):
 class ConstructorInfo(MethodInfo):
     """Constructor method information."""
 
+    __slots__ = ("_initializer_list",)
+
     class InitializerInfo:
         """Information about one of initializer lists."""
 
+        __slots__ = ("_name", "_value")
+
         def __init__(self, name, value):
             self._name: str = name
             self._value: str = value
@@ -319,7 +343,7 @@ class ConstructorInfo(MethodInfo):
     def initializer_list(self) -> List[InitializerInfo]:
         """Initializer list paired with constructor."""
         self._initializer_list = []
-        it = self._cursor.get_children()
+        it = get_children(self._cursor)
         c = next(it, None)
         if c is not None:
             try:
@@ -381,10 +405,13 @@ class ConstructorInfo(MethodInfo):
     @name.setter
     def name(self, value):
         self._name = value
+        Lexicon.renamed()
+
+    cursor_kinds = (cindex.CursorKind.CONSTRUCTOR,)
 
     @staticmethod
     def is_cursor_valid(cursor: cindex.Cursor) -> bool:
-        return cursor.kind == cindex.CursorKind.CONSTRUCTOR
+        return cursor.kind in ConstructorInfo.cursor_kinds
 
     @property
     def return_type(self) -> None:
@@ -398,6 +425,8 @@ class ConstructorInfo(MethodInfo):
 class DestructorInfo(MethodInfo):
     """Destructor information."""
 
+    __slots__ = ()
+
     def __init__(self, cursor: Optional[cindex.Cursor] = None, parent: Optional[CodeContainer] = None):
         super().__init__(cursor, parent)
         if cursor is None:
@@ -433,6 +462,7 @@ class DestructorInfo(MethodInfo):
     @name.setter
     def name(self, value):
         self._name = value
+        Lexicon.renamed()
 
     @property
     def return_type(self) -> None:
@@ -446,14 +476,18 @@ class DestructorInfo(MethodInfo):
     def type(self) -> MethodType:
         return MethodType.DESTRUCTOR
 
+    cursor_kinds = (cindex.CursorKind.DESTRUCTOR,)
+
     @staticmethod
     def is_cursor_valid(cursor: cindex.Cursor) -> bool:
-        return cursor.kind == cindex.CursorKind.DESTRUCTOR
+        return cursor.kind in DestructorInfo.cursor_kinds
 
 
 class FieldInfo(Variable, ClassMember, ICursorValidate, DescriptiveByAttributes):
     """Field of class/struct."""
 
+    __slots__ = ("_associated_comment", "_access_specifier", "_attributes")
+
     def __init__(self, cursor: Optional[cindex.Cursor] = None, parent: Optional[CodeContainer] = None):
         Variable.__init__(self, cursor, parent)
         ClassMember.__init__(self, cursor)
@@ -466,9 +500,11 @@ class FieldInfo(Variable, ClassMember, ICursorValidate, DescriptiveByAttributes)
         else:
             self._associated_comment = LazyNotInit
 
+    cursor_kinds = (cindex.CursorKind.FIELD_DECL, cindex.CursorKind.VAR_DECL)
+
     @staticmethod
     def is_cursor_valid(cursor: cindex.Cursor) -> bool:
-        return cursor.kind in (cindex.CursorKind.FIELD_DECL, cindex.CursorKind.VAR_DECL)
+        return cursor.kind in FieldInfo.cursor_kinds
 
     @classmethod
     def create_default(cls, parent: Optional = None) -> "FieldInfo":
@@ -515,6 +551,8 @@ class FieldInfo(Variable, ClassMember, ICursorValidate, DescriptiveByAttributes)
 class SectionInfo(IBasicCreatable, ICursorValidate, ISyntaxElement):
     """Representation of class sections like private, public and protected."""
 
+    __slots__ = ("_cursor", "_parent", "_content", "_type", "_is_unnamed", "_text_source")
+
     def __init__(self, cursor: Optional[cindex.Cursor] = None, parent: Optional[CodeContainer] = None):
         if parent is None:
             raise ValueError()
@@ -558,9 +596,11 @@ class SectionInfo(IBasicCreatable, ICursorValidate, ISyntaxElement):
     ) -> "SectionInfo":
         return cls(None, parent)
 
+    cursor_kinds = (cindex.CursorKind.CXX_ACCESS_SPEC_DECL,)
+
     @staticmethod
     def is_cursor_valid(cursor: cindex.Cursor) -> bool:
-        return cursor.kind == cindex.CursorKind.CXX_ACCESS_SPEC_DECL
+        return cursor.kind in SectionInfo.cursor_kinds
 
     @property
     @lazy_invoke
@@ -633,9 +673,14 @@ class SectionInfo(IBasicCreatable, ICursorValidate, ISyntaxElement):
 class InheritanceInfo(IFromCursorCreatable, IFromParamsCreatable, ISyntaxElement):
     """Information about class/structure inheritance."""
 
+    __slots__ = ("_cursor", "_parent", "_lexicon", "_type_parents")
+
     class InheritanceValue(IBasicCreatable, ISyntaxElement):
         """One of parent (in C++ mean) information."""
 
+        __slots__ = ("_cursor", "_parent", "_access_specifier", "_is_virtual", "_type", "_template_arguments",
+                     "_namespaces")
+
         def __init__(self, cursor: Optional[cindex.Cursor] = None, parent: Optional = None):
             self._cursor = cursor
             self._parent = parent
@@ -792,7 +837,7 @@ class InheritanceInfo(IFromCursorCreatable, IFromParamsCreatable, ISyntaxElement
     def type_parents(self) -> List[InheritanceValue]:
         """List of parents in code meaning."""
         parents = []
-        for children in self._cursor.get_children():
+        for children in get_children(self._cursor):
             if children.kind == cindex.CursorKind.CXX_BASE_SPECIFIER:
                 parents.append(self.InheritanceValue(children, self))
         self._type_parents = parents
@@ -818,6 +863,9 @@ class InheritanceInfo(IFromCursorCreatable, IFromParamsCreatable, ISyntaxElement
 class ClassInfo(CodeContainer, DescriptiveByAttributes):
     """Data of a class type."""
 
+    __slots__ = ("_prefix", "_name", "_is_final", "_template", "_is_class", "_inheritance", "_is_declaration",
+                 "_namespaces", "_associated_comment", "_attributes")
+
     def __init__(self, cursor: Optional[cindex.Cursor] = None, parent: Optional[CodeContainer] = None):
         super().__init__(cursor, parent)
         DescriptiveByAttributes.__init__(self, cursor, parent)
@@ -874,7 +922,7 @@ class ClassInfo(CodeContainer, DescriptiveByAttributes):
                     parent = parent.semantic_parent
                 semantic_parents = semantic_parents[:-1]  # remove last element - file path
                 semantic_parents = [p.spelling for p in semantic_parents]
-                namespaces_parents = [n.spelling for n in self._cursor.get_children()
+                namespaces_parents = [n.spelling for n in get_children(self._cursor)
                                       if n.kind == cindex.CursorKind.NAMESPACE_REF]
                 namespaces = list(set(semantic_parents) & set(namespaces_parents))
 
@@ -919,17 +967,16 @@ class ClassInfo(CodeContainer, DescriptiveByAttributes):
     ) -> "ClassInfo":
         return cls(None, parent)
 
+    cursor_kinds = (
+        cindex.CursorKind.STRUCT_DECL,
+        cindex.CursorKind.CLASS_DECL,
+        cindex.CursorKind.CLASS_TEMPLATE,
+        cindex.CursorKind.CLASS_TEMPLATE_PARTIAL_SPECIALIZATION
+    )
+
     @staticmethod
     def is_cursor_valid(cursor: cindex.Cursor) -> bool:
-        if cursor.kind == cindex.CursorKind.STRUCT_DECL:
-            return True
-        elif cursor.kind == cindex.CursorKind.CLASS_DECL:
-            return True
-        elif cursor.kind in (cindex.CursorKind.CLASS_TEMPLATE,
-                             cindex.CursorKind.CLASS_TEMPLATE_PARTIAL_SPECIALIZATION):
-            return True
-        else:
-            return False
+        return cursor.kind in ClassInfo.cursor_kinds
 
     @property
     def constructors(self) -> Tuple[ConstructorInfo]:
@@ -1005,7 +1052,7 @@ class ClassInfo(CodeContainer, DescriptiveByAttributes):
     def is_final(self) -> bool:
         """Flag about final key-world in class."""
         self._is_final = False
-        for c in self._cursor.get_children():
+        for c in get_children(self._cursor):
             if c.kind == cindex.CursorKind.CXX_FINAL_ATTR:
                 self._is_final = True
         return self._is_final
@@ -1050,6 +1097,7 @@ class ClassInfo(CodeContainer, DescriptiveByAttributes):
     @name.setter
     def name(self, value):
         self._name = value
+        Lexicon.renamed()
 
     @property
     @lazy_invoke
@@ -1069,10 +1117,8 @@ class ClassInfo(CodeContainer, DescriptiveByAttributes):
     def is_declaration(self) -> bool:
         """Determine kind, definition or declaration."""
         self._is_declaration = True
-        for token in self._cursor.get_tokens():
-            if "{" == token.spelling:
-                self._is_declaration = False
-                break
+        if "{" in get_token_spellings(self._cursor):
+            self._is_declaration = False
         return self._is_declaration
 
     @is_declaration.setter
@@ -1104,7 +1150,7 @@ class ClassInfo(CodeContainer, DescriptiveByAttributes):
         For example: class namespace1::namespace2::ClassName; or class namespace1::ClassName {};"""
         if self.is_definition:
             return []
-        self._namespaces = [n.spelling for n in self._cursor.get_children()
+        self._namespaces = [n.spelling for n in get_children(self._cursor)
                             if n.kind == cindex.CursorKind.NAMESPACE_REF]
         return self._namespaces
 
@@ -1180,12 +1226,12 @@ class ClassInfo(CodeContainer, DescriptiveByAttributes):
         return types
 
     def _create_content(self) -> List[Any]:
-        types = self._content_types
+        dispatch = CursorDispatch.get_dispatch(type(self), lambda: self._content_types)
         content = []
         config = Configuration.get_configuration(self)
         is_abort_on_error = config.parsing.error_strategy == ParsingErrorPolicy.ABORT
         is_ignore_on_error = config.parsing.error_strategy == ParsingErrorPolicy.IGNORE
-        for children in self._cursor.get_children():
+        for children in get_children(self._cursor):
             if children.kind in (cindex.CursorKind.CXX_FINAL_ATTR,
                                  cindex.CursorKind.TEMPLATE_TYPE_PARAMETER,
                                  cindex.CursorKind.CXX_BASE_SPECIFIER,
@@ -1193,7 +1239,7 @@ class ClassInfo(CodeContainer, DescriptiveByAttributes):
                                  cindex.CursorKind.TYPE_REF):
                 continue  # to avoid parsing keywords in class declaration - final and templates params
             element: Optional = None
-            for t in types:
+            for t in dispatch.candidates(children.kind):
                 try:
                     element = t.from_cursor(children, self)
                     if element is None:
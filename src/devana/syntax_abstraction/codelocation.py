@@ -1,6 +1,8 @@
 class CodeLocation:
     """Class hold information about code coordinates in file."""
 
+    __slots__ = ("_row", "_col")
+
     def __init__(self, row, col):
         if col <= 0 or row <= 0:
             raise ValueError("Col and row must be greater than zero.")
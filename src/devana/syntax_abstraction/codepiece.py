@@ -1,6 +1,7 @@
 from typing import Optional
 from clang import cindex
 from devana.syntax_abstraction.codelocation import CodeLocation
+from devana.syntax_abstraction.sourcebuffer import TextView, offset, read_view
 from devana.utility.lazy import LazyNotInit, lazy_invoke
 
 
@@ -11,6 +12,8 @@ class CodePiece:
     Code can be bind to existing file if its source is file or CodePiece is used as representative of
     code generation result."""
 
+    __slots__ = ("_cursor", "_text", "_begin", "_end", "_file", "_translation_unit")
+
     def __init__(self, cursor: Optional[cindex.Cursor] = None):
         self._cursor = cursor
         if self._cursor is not None:
@@ -22,13 +25,18 @@ class CodePiece:
             self._end = CodeLocation(1, 2)
             self._file = ""
         self._text = None
+        self._translation_unit = None
 
     @classmethod
-    def from_location(cls, begin: CodeLocation, end: CodeLocation, file: str):
+    def from_location(cls, begin: CodeLocation, end: CodeLocation, file: str,
+                      translation_unit: Optional[cindex.TranslationUnit] = None):
+        """Create code of file between locations. If translation unit is given, unsaved content of file parsed by
+        it is used (see sourcebuffer.set_unsaved_text)."""
         instance = cls(None)
         instance.begin = begin
         instance.end = end
         instance.file = file
+        instance._translation_unit = translation_unit
         return instance
 
     @property
@@ -67,43 +75,37 @@ class CodePiece:
     def end(self, value: CodeLocation):
         self._end = value
 
+    @property
+    def translation_unit(self) -> Optional[cindex.TranslationUnit]:
+        """Backend translation unit of code. None value mean code not bound to the backend."""
+        return self._translation_unit if self._cursor is None else self._cursor.translation_unit
+
+    @property
+    def view(self) -> TextView:
+        """Raw text of code as a view of file content. Text is not copied or decoded and, in contrast to the text
+        property, base indentation is not removed."""
+        if self._text is not None:
+            return TextView(self._text.encode())
+        if self._cursor is None:
+            begin = offset(self.file, self.begin.row, self.begin.col, self._translation_unit)
+            end = offset(self.file, self.end.row, self.end.col + 1, self._translation_unit)
+        else:
+            begin = self._cursor.extent.start.offset
+            end = self._cursor.extent.end.offset
+        return read_view(self.file, begin, end, self.translation_unit)
+
     @property
     def text(self) -> str:
         """Raw text of code, from begin to end."""
         if self._text is None:
             try:
-                # standard file
-                with open(self.file, "rb") as f:
-                    if self._cursor is None:
-                        lines = f.read().split(b'\n')
-                        row_start = self.begin.row - 1
-                        row_end = self.end.row - 1
-                        col_start = self.begin.col - 1
-                        col_end = self.end.col
-                        text = b""
-                        if len(lines) < row_start or len(lines) < row_end:
-                            raise ValueError("Code begin and end extend file size.")
-                        for index, line in enumerate(lines):
-                            if row_start == index and row_end == index:
-                                text = line[col_start:col_end + 1]
-                                if len(lines) != index + 1:
-                                    text += b'\n'
-                                return str(text)
-                            elif row_start == index:
-                                text += line[col_start:] + b'\n'
-                            elif row_end == index:
-                                text += line[:col_end]
-                            elif row_start <= index <= row_end:
-                                text += line + b'\n'
-                            elif row_end < index:
-                                break
-                        return str(text)
-                    else:
-                        begin = self._cursor.extent.start.offset
-                        end = self._cursor.extent.end.offset
-                        f.seek(begin)
-                        return self._remove_base_indent(f.read(end - begin).decode())
+                if self._cursor is None:
+                    # both, begin and end are included
+                    return str(self.view)
+                self._text = self._remove_base_indent(str(self.view))
             except IOError:
+                if self._cursor is None:
+                    raise
                 # clang in memory file (special dragon case) - do not look
                 return self._cursor.spelling
         return self._text
@@ -116,12 +118,5 @@ class CodePiece:
     def _remove_base_indent(text: Optional[str]) -> Optional[str]:
         split_text = text.split("\n")
         last_line = split_text[-1]
-        indent_len = len(last_line) - len(last_line.lstrip())
-        prefix = ""
-        for _ in range(indent_len):
-            prefix += " "
-        result = ""
-        for line in split_text:
-            result += line[line.startswith(prefix) and len(prefix):]
-            result += "\n"
-        return result[:-1]
+        prefix = " " * (len(last_line) - len(last_line.lstrip()))
+        return "\n".join(line[len(prefix):] if line.startswith(prefix) else line for line in split_text)
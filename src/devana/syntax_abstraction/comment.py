@@ -1,8 +1,10 @@
+from bisect import bisect_left, bisect_right
 from enum import Enum, auto
 from typing import List, Optional
 import re
 from devana.syntax_abstraction.codepiece import CodePiece
 from devana.syntax_abstraction.codelocation import CodeLocation
+from devana.syntax_abstraction.sourcebuffer import read_lines, read_text
 from devana.utility.lazy import LazyNotInit, lazy_invoke
 from devana.configuration import Configuration
 
@@ -34,6 +36,8 @@ class Comment:
     In particular, comments inside implementation bodies are not instantiated
     and other, depending on parsing settings."""
 
+    __slots__ = ("_marker", "_begin", "_end", "_parent", "_text")
+
     def __init__(self, marker: CommentMarker = CommentMarker.ONE_LINE, begin: Optional[CodeLocation] = None,
                  end: Optional[CodeLocation] = None, parent: Optional = None):
         self._marker = marker
@@ -101,23 +105,21 @@ class Comment:
     def _text_from_location(self) -> List[str]:
         if self._parent.path is None:
             return []
-        with open(self._parent.path, "r") as file:  # pylint: disable=unspecified-encoding
-            lines = file.read().split('\n')
-            lines = list(map(lambda e: e.rstrip('\r'), lines))
-            if self._marker == CommentMarker.MULTI_LINE and self._begin.row == self._end.row:
-                return [lines[self._begin.row - 1][self._begin.col + 1:self._end.col - 2]]
-            lines = lines[self._begin.row - 1:self._end.row]
-            result = []
-            if self._marker == CommentMarker.ONE_LINE:
-                for line in lines:
-                    result.append(line[self._begin.col + 1:])
-                return result
-            elif self._marker == CommentMarker.MULTI_LINE:
-                lines[0] = lines[0][self._begin.col + 1:]
-                lines[-1] = lines[-1][:self._end.col - 2]
-                for _index, line in enumerate(lines):
-                    result.append(line)
+        lines = read_lines(self._parent.path, self._parent.translation_unit)
+        if self._marker == CommentMarker.MULTI_LINE and self._begin.row == self._end.row:
+            return [lines[self._begin.row - 1][self._begin.col + 1:self._end.col - 2]]
+        lines = lines[self._begin.row - 1:self._end.row]
+        result = []
+        if self._marker == CommentMarker.ONE_LINE:
+            for line in lines:
+                result.append(line[self._begin.col + 1:])
             return result
+        elif self._marker == CommentMarker.MULTI_LINE:
+            lines[0] = lines[0][self._begin.col + 1:]
+            lines[-1] = lines[-1][:self._end.col - 2]
+            for _index, line in enumerate(lines):
+                result.append(line)
+        return result
 
     def _format_text(self, lines: List[str]) -> List[str]:
         result: List[str] = []
@@ -139,6 +141,20 @@ class Comment:
         return result
 
 
+_COMMENT_LEXER = re.compile(r"""
+    (?P<one_line>//[^\n]*)
+    |(?P<multi_line>/\*.*?\*/)
+    |(?P<unterminated>/\*.*)
+    |(?:u8|[uUL])?R"(?P<delimiter>[^()\\\s"]{0,16})\(.*?\)(?P=delimiter)"
+    |"(?:\\.|[^"\\\n])*"
+    |'(?:\\.|[^'\\\n])*'
+    |\.?\d(?:[eEpP][+-]|[\w.'])*
+    |[A-Za-z_]\w*
+""", re.DOTALL | re.VERBOSE)
+"""Lexer of comments. Literals (strings, raw strings, characters and numbers with digit separators) are matched as
+well, so comment markers inside them are skipped."""
+
+
 class CommentsFactory:
     """Internal the class that collects all detected comments in the file.
     Its purpose is to help you find comments requested by specific code elements."""
@@ -146,39 +162,52 @@ class CommentsFactory:
     def __init__(self, source):
         self._source = source
         self._comments = LazyNotInit
+        self._end_rows: List[int] = []
+        self._accumulated: List[Optional[Comment]] = []
 
     @property
     @lazy_invoke
     def comments(self) -> List[Comment]:
         self._comments = self._create_comments_list()
+        self._create_index(self._comments)
         return self._comments
 
     def get_upper_comment(self, element: CodePiece) -> Optional[Comment]:
-        result = None
         line = element.begin.row
         col = element.begin.col
         config: Configuration = self._source.configuration
-        for index, comment in enumerate(self.comments):
-            if comment.end.row == line - 1 and comment.begin.col == col:
+        comments = self.comments
+        index = bisect_left(self._end_rows, line - 1)
+        while index < len(comments) and self._end_rows[index] == line - 1:
+            comment = comments[index]
+            if comment.begin.col == col:
                 if comment.marker == CommentMarker.ONE_LINE and config.parsing.comments.accumulate:
-                    begin = comment.begin
-                    end = comment.end
-                    for i in reversed(range(0, index + 1)):
-                        if not (self.comments[i].begin.row == line - 1 - (index - i) and self.comments[
-                            i].begin.col == col
-                                and self.comments[i].marker == CommentMarker.ONE_LINE):
-                            break
-                        begin = self.comments[i].begin
-                    if begin.row == comment.begin.row:
-                        result = comment
-                    else:
-                        result = Comment.from_code_piece(CommentMarker.ONE_LINE,
-                                                         CodePiece.from_location(begin, end, self._source.path),
-                                                         self._source)
-                else:
-                    result = comment
-                break
-        return result
+                    return self._accumulated[index]
+                return comment
+            index += 1
+        return None
+
+    def _create_index(self, comments: List[Comment]):
+        """Index comments by end row (comments are sorted by position) and join runs of consecutive one-line
+        comments which begin in the same column."""
+        self._end_rows = [comment.end.row for comment in comments]
+        self._accumulated = []
+        run_begin: Optional[int] = None
+        for index, comment in enumerate(comments):
+            if comment.marker != CommentMarker.ONE_LINE:
+                self._accumulated.append(None)
+                run_begin = None
+                continue
+            previous = comments[index - 1] if index > 0 else None
+            if (run_begin is None or previous.begin.row != comment.begin.row - 1
+                    or previous.begin.col != comment.begin.col):
+                run_begin = index
+            if run_begin == index:
+                self._accumulated.append(comment)
+            else:
+                code_piece = CodePiece.from_location(comments[run_begin].begin, comment.end, self._source.path,
+                                                     self._source.translation_unit)
+                self._accumulated.append(Comment.from_code_piece(CommentMarker.ONE_LINE, code_piece, self._source))
 
     def preamble(self) -> Optional[Comment]:
         if not self.comments:
@@ -191,54 +220,19 @@ class CommentsFactory:
     def _create_comments_list(self) -> List[Comment]:
         if self._source.path is None:
             return []
-        text = self._source.text_source.text
-        lines = text.split('\n')
-        lines = list(map(lambda e: e.rstrip('\r'), lines))  # windows \r\n compatibility
-        results = []
-        is_multi_line_mode = False
-        multi_line_begin = None
-
-        for index, line in enumerate(lines):
-            if is_multi_line_mode:
-                # match  comment */ (multi line begin)
-                match = re.search(r"(.*)\*/", line)
-                if match:
-                    multi_line_end = CodeLocation(index + 1, match.regs[0][1])
-                    results.append(Comment.from_code_piece(CommentMarker.MULTI_LINE,
-                                                           CodePiece.from_location(multi_line_begin, multi_line_end,
-                                                                                   self._source.path),
-                                                           self._source))
-                    is_multi_line_mode = False
-                    multi_line_begin = None
-                    continue
-            else:
+        text = read_text(self._source.path, self._source.translation_unit)
+        line_starts = [0] + [m.end() for m in re.finditer("\n", text)]
 
-                # match /* comment */
-                matches = list(re.finditer(r"/\*(.+?)\*/", line))
-                if matches:
-                    for match in matches:
-                        begin = CodeLocation(index + 1, match.regs[0][0] + 1)
-                        end = CodeLocation(index + 1, match.regs[0][1])
-                        results.append(Comment.from_code_piece(CommentMarker.MULTI_LINE,
-                                                               CodePiece.from_location(begin, end, self._source.path),
-                                                               self._source))
-                    continue
-
-                # match /* comment (multi line begin)
-                match = re.search(r"/\*(.*)", line)
-                if match:
-                    is_multi_line_mode = True
-                    multi_line_begin = CodeLocation(index + 1, match.regs[0][0] + 1)
-                    continue
-
-                # match // comment
-                match = re.search(r"//(.*)", line)
-                if match:
-                    begin = CodeLocation(index + 1, match.regs[0][0] + 1)
-                    end = CodeLocation(index + 1, len(line))
-                    results.append(Comment.from_code_piece(CommentMarker.ONE_LINE,
-                                                           CodePiece.from_location(begin, end, self._source.path),
-                                                           self._source))
-                    continue
+        def location(position: int) -> CodeLocation:
+            row = bisect_right(line_starts, position)
+            return CodeLocation(row, position - line_starts[row - 1] + 1)
 
+        results = []
+        for match in _COMMENT_LEXER.finditer(text):
+            if match.lastgroup not in ("one_line", "multi_line"):
+                continue
+            marker = CommentMarker.ONE_LINE if match.lastgroup == "one_line" else CommentMarker.MULTI_LINE
+            begin = location(match.start())
+            end = location(match.end() - 1)
+            results.append(Comment(marker, begin, end, self._source))
         return results
@@ -2,6 +2,7 @@ from __future__ import annotations
 from typing import Optional, List
 from clang import cindex
 
+from devana.syntax_abstraction._cursortree import get_children
 from devana.syntax_abstraction.organizers.codecontainer import CodeContainer
 from devana.syntax_abstraction.typeexpression import TypeExpression
 from devana.utility.traits import IBasicCreatable, ICursorValidate
@@ -17,6 +18,8 @@ from devana.utility.errors import ParserError
 class ConceptInfo(IBasicCreatable, ICursorValidate, ISyntaxElement):
     """Represents a C++ concept as a full definition."""
 
+    __slots__ = ("_cursor", "_parent", "_lexicon", "_name", "_body", "_template", "_associated_comment", "_text_source")
+
     def __init__(self, cursor: Optional[cindex.Cursor] = None, parent: Optional[CodeContainer] = None):
         self._cursor = cursor
         self._parent = parent
@@ -65,9 +68,11 @@ class ConceptInfo(IBasicCreatable, ICursorValidate, ISyntaxElement):
     ) -> "ConceptInfo":
         return cls(None, parent)
 
+    cursor_kinds = (cindex.CursorKind.CONCEPT_DECL,)
+
     @staticmethod
     def is_cursor_valid(cursor: cindex.Cursor) -> bool:
-        return cursor.kind == cindex.CursorKind.CONCEPT_DECL
+        return cursor.kind in ConceptInfo.cursor_kinds
 
     @property
     @lazy_invoke
@@ -78,6 +83,7 @@ class ConceptInfo(IBasicCreatable, ICursorValidate, ISyntaxElement):
     @name.setter
     def name(self, value) -> None:
         self._name = value
+        Lexicon.renamed()
 
     @property
     @lazy_invoke
@@ -96,7 +102,7 @@ class ConceptInfo(IBasicCreatable, ICursorValidate, ISyntaxElement):
     def body(self) -> str:
         """The body of the concept, which defines its constraint expression."""
         self._body = ""
-        for child in self._cursor.get_children():
+        for child in get_children(self._cursor):
             if child.kind != cindex.CursorKind.TEMPLATE_TYPE_PARAMETER:
                 self._body = CodePiece(child).text
                 break
@@ -144,6 +150,8 @@ class ConceptInfo(IBasicCreatable, ICursorValidate, ISyntaxElement):
 class ConceptUsage(IBasicCreatable, ICursorValidate, ISyntaxElement):
     """Represents a usage of a C++ concept."""
 
+    __slots__ = ("_cursor", "_parent", "_lexicon", "_concept", "_namespaces", "_parameters")
+
     def __init__(self, cursor: Optional[cindex.Cursor] = None, parent: Optional[ISyntaxElement] = None):
         self._cursor = cursor
         self._parent = parent
@@ -182,7 +190,7 @@ class ConceptUsage(IBasicCreatable, ICursorValidate, ISyntaxElement):
 
     @staticmethod
     def is_cursor_valid(cursor: cindex.Cursor) -> bool:
-        for child in cursor.get_children():
+        for child in get_children(cursor):
             if child.referenced and child.referenced.kind == cindex.CursorKind.CONCEPT_DECL:
                 return True
         return False
@@ -192,7 +200,7 @@ class ConceptUsage(IBasicCreatable, ICursorValidate, ISyntaxElement):
     def concept(self) -> ConceptInfo:
         concept_cursors = list(filter(
             lambda c: c.referenced and c.referenced.kind == cindex.CursorKind.CONCEPT_DECL,
-            self._cursor.get_children())
+            get_children(self._cursor))
         )
         self._concept = self._lexicon.find_type(concept_cursors[0].referenced)
         if self._concept is None: # case for std and other headers outside module
@@ -207,7 +215,7 @@ class ConceptUsage(IBasicCreatable, ICursorValidate, ISyntaxElement):
     @lazy_invoke
     def namespaces(self) -> List[str]:
         self._namespaces = []
-        for child in self._cursor.get_children():
+        for child in get_children(self._cursor):
             if child.kind == cindex.CursorKind.NAMESPACE_REF:
                 self._namespaces.append(child.spelling)
         return self._namespaces
@@ -221,7 +229,7 @@ class ConceptUsage(IBasicCreatable, ICursorValidate, ISyntaxElement):
     def parameters(self) -> List[str]:
         """Retrieves the concept parameters '<...>'."""
         self._parameters = []
-        for c in self._cursor.get_children():
+        for c in get_children(self._cursor):
             if c.kind == cindex.CursorKind.TYPE_REF:
                 self._parameters.append(c.spelling)
         return self._parameters
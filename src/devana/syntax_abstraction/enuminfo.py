@@ -1,6 +1,8 @@
 import re
 from typing import Optional, List, Literal, Any
 from clang import cindex
+from devana.syntax_abstraction._tokenindex import get_token_spellings
+from devana.syntax_abstraction._cursortree import get_children
 from devana.syntax_abstraction.codepiece import CodePiece
 from devana.syntax_abstraction.organizers.codecontainer import CodeContainer
 from devana.syntax_abstraction.comment import Comment
@@ -17,9 +19,14 @@ from devana.syntax_abstraction.syntax import ISyntaxElement
 class EnumInfo(CodeContainer, DescriptiveByAttributes):
     """Enum declaration."""
 
+    __slots__ = ("_name", "_values", "_is_scoped", "_prefix", "_numeric_type", "_is_declaration", "_associated_comment",
+                 "_attributes")
+
     class EnumValue(IBasicCreatable, ICursorValidate, ISyntaxElement):
         """Enum value stored in EnumInfo."""
 
+        __slots__ = ("_cursor", "_parent", "_text_source", "_name", "_value", "_is_default", "_associated_comment")
+
         def __init__(self, cursor: Optional[cindex.Cursor] = None, parent: Optional[CodeContainer] = None):
             self._cursor = cursor
             self._parent = parent
@@ -37,7 +44,7 @@ class EnumInfo(CodeContainer, DescriptiveByAttributes):
                 if not self.is_cursor_valid(cursor):
                     raise ParserError("It is not a valid type cursor.")
                 self._is_default = True
-                for _ in cursor.get_children():
+                for _ in get_children(cursor):
                     self._is_default = False
 
         @classmethod
@@ -63,9 +70,11 @@ class EnumInfo(CodeContainer, DescriptiveByAttributes):
         ) -> "EnumInfo.EnumValue":
             return cls(None, parent)
 
+        cursor_kinds = (cindex.CursorKind.ENUM_CONSTANT_DECL,)
+
         @staticmethod
         def is_cursor_valid(cursor: cindex.Cursor) -> bool:
-            return cursor.kind == cindex.CursorKind.ENUM_CONSTANT_DECL
+            return cursor.kind in EnumInfo.EnumValue.cursor_kinds
 
         @property
         @lazy_invoke
@@ -77,6 +86,7 @@ class EnumInfo(CodeContainer, DescriptiveByAttributes):
         @name.setter
         def name(self, value):
             self._name = value
+            Lexicon.renamed()
 
         @property
         @lazy_invoke
@@ -153,9 +163,11 @@ class EnumInfo(CodeContainer, DescriptiveByAttributes):
             self._associated_comment = LazyNotInit
         self._lexicon = Lexicon.create(self)
 
+    cursor_kinds = (cindex.CursorKind.ENUM_DECL,)
+
     @staticmethod
     def is_cursor_valid(cursor: cindex.Cursor) -> bool:
-        return cursor.kind == cindex.CursorKind.ENUM_DECL
+        return cursor.kind in EnumInfo.cursor_kinds
 
     @classmethod
     @init_params(skip={"parent"})
@@ -187,13 +199,14 @@ class EnumInfo(CodeContainer, DescriptiveByAttributes):
     @name.setter
     def name(self, value):
         self._name = value
+        Lexicon.renamed()
 
     @property
     @lazy_invoke
     def values(self) -> List[EnumValue]:
         """List of possible values of enum."""
         self._values = []
-        for children in self._cursor.get_children():
+        for children in get_children(self._cursor):
             self._values.append(self.EnumValue(children, self))
         return self._values
 
@@ -240,7 +253,8 @@ class EnumInfo(CodeContainer, DescriptiveByAttributes):
     def numeric_type(self) -> BasicType:
         """Used numeric type."""
         self._numeric_type = BasicType.from_cursor(self._cursor.enum_type)
-        assert self._numeric_type is not None
+        if self._numeric_type is None:
+            raise ParserError("Unable to parse enum numeric type.")
         return self._numeric_type
 
     @numeric_type.setter
@@ -259,10 +273,8 @@ class EnumInfo(CodeContainer, DescriptiveByAttributes):
     def is_declaration(self) -> bool:
         """Determine kind, definition or declaration."""
         self._is_declaration = True
-        for token in self._cursor.get_tokens():
-            if "{" == token.spelling:
-                self._is_declaration = False
-                break
+        if "{" in get_token_spellings(self._cursor):
+            self._is_declaration = False
         return self._is_declaration
 
     @is_declaration.setter
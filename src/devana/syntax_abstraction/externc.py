@@ -1,5 +1,6 @@
 from typing import Optional, List, Any
 from clang import cindex
+from devana.syntax_abstraction._cursortree import get_children
 from devana.syntax_abstraction.organizers.codecontainer import CodeContainer
 from devana.syntax_abstraction.organizers.lexicon import Lexicon
 from devana.syntax_abstraction.functioninfo import FunctionInfo
@@ -12,14 +13,16 @@ from devana.utility.init_params import init_params
 class ExternC(CodeContainer):
     """Object representation of current usage of extern C set of functions. It may contain one or more functions."""
 
+    __slots__ = ("_name",)
+
     def __init__(self, cursor: Optional[cindex.Cursor] = None, parent: Optional[CodeContainer] = None):
         super().__init__(cursor, parent)
         if cursor is not None:
             if self._cursor.kind != cindex.CursorKind.LINKAGE_SPEC:
                 raise ParserError("It is not a valid type cursor.")
-            if len(list(self._cursor.get_children())) <= 0:
+            if len(list(get_children(self._cursor))) <= 0:
                 raise ParserError("It is not a valid type cursor.")
-            for children in self._cursor.get_children():
+            for children in get_children(self._cursor):
                 if children.kind != cindex.CursorKind.FUNCTION_DECL:
                     raise ParserError("It is not a valid type cursor. ExternC allow only functions content.")
         self._name = 'extern "C"'
@@ -38,13 +41,15 @@ class ExternC(CodeContainer):
     ):
         return cls(None, parent)
 
+    cursor_kinds = (cindex.CursorKind.LINKAGE_SPEC,)
+
     @staticmethod
     def is_cursor_valid(cursor: cindex.Cursor) -> bool:
         if cursor.kind != cindex.CursorKind.LINKAGE_SPEC:
             return False
-        if len(list(cursor.get_children())) <= 0:
+        if len(list(get_children(cursor))) <= 0:
             return False
-        for children in cursor.get_children():
+        for children in get_children(cursor):
             if children.kind != cindex.CursorKind.FUNCTION_DECL:
                 return False
         return True
@@ -58,6 +63,7 @@ class ExternC(CodeContainer):
     @name.setter
     def name(self, value):
         self._name = value
+        Lexicon.renamed()
 
     @property
     def lexicon(self) -> Lexicon:
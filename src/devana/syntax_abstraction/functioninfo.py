@@ -3,12 +3,15 @@ from enum import auto, IntFlag
 import re
 from clang import cindex
 
+from devana.syntax_abstraction._cursortree import get_children
+from devana.syntax_abstraction._tokenindex import get_token_spellings
 from devana.syntax_abstraction.variable import Variable
 from devana.syntax_abstraction.typeexpression import TypeExpression, BasicType
 from devana.syntax_abstraction.organizers.lexicon import Lexicon
 from devana.syntax_abstraction.organizers.codecontainer import CodeContainer
 from devana.syntax_abstraction.comment import Comment
 from devana.syntax_abstraction.codepiece import CodePiece
+from devana.syntax_abstraction.sourcebuffer import read_bytes
 from devana.syntax_abstraction.templateinfo import TemplateInfo
 from devana.syntax_abstraction.attribute import DescriptiveByAttributes, AttributeDeclaration
 from devana.syntax_abstraction.conceptinfo import ConceptUsage
@@ -19,11 +22,14 @@ from devana.utility.errors import ParserError, CodeError
 from devana.utility.init_params import init_params
 from devana.syntax_abstraction.syntax import ISyntaxElement
 from devana.code_generation.stubtype import StubType
+from devana.configuration import Configuration
 
 
 class FunctionModification(metaclass=FakeEnum):
     """Modification for functions and methods."""
 
+    __slots__ = ("_value", "_noexcept_value")
+
     class ModificationKind(IntFlag):
         """Internal enum list."""
         NONE = auto()
@@ -262,9 +268,14 @@ class FunctionModification(metaclass=FakeEnum):
 class FunctionInfo(IBasicCreatable, ICursorValidate, DescriptiveByAttributes, ISyntaxElement):
     """Representative of function definition or declaration."""
 
+    __slots__ = ("_cursor", "_parent", "_prefix", "_lexicon", "_arguments", "_name", "_return_type", "_modification",
+                 "_body", "_template", "_text_source", "_namespaces", "_associated_comment", "_requires", "_attributes")
+
     class Argument(Variable, ICursorValidate, DescriptiveByAttributes, ISyntaxElement):
         """Data of function or method argument."""
 
+        __slots__ = ("_attributes",)
+
         def __init__(self, cursor: Optional[cindex.Cursor] = None, parent: Optional = None):
             super().__init__(cursor, parent)
             DescriptiveByAttributes.__init__(self, cursor, parent)
@@ -296,7 +307,10 @@ class FunctionInfo(IBasicCreatable, ICursorValidate, DescriptiveByAttributes, IS
         @lazy_invoke
         def attributes(self) -> List[AttributeDeclaration]:
             """C++11/C23 attributes associated with the syntax."""
-            self._attributes = AttributeDeclaration.create_from_element(self, self._parent.arguments)
+            if self._parent is None:
+                self._attributes = []
+                return self._attributes
+            self._attributes = self._create_scope_attributes(self._parent.arguments, lambda _: None)
             return self._attributes
 
         @attributes.setter
@@ -344,9 +358,11 @@ class FunctionInfo(IBasicCreatable, ICursorValidate, DescriptiveByAttributes, IS
         result = cls(None, parent)
         return result
 
+    cursor_kinds = (cindex.CursorKind.FUNCTION_DECL, cindex.CursorKind.FUNCTION_TEMPLATE)
+
     @staticmethod
     def is_cursor_valid(cursor: cindex.Cursor) -> bool:
-        return cursor.kind in (cindex.CursorKind.FUNCTION_DECL, cindex.CursorKind.FUNCTION_TEMPLATE)
+        return cursor.kind in FunctionInfo.cursor_kinds
 
     @classmethod
     def from_cursor(cls, cursor: cindex.Cursor, parent: Optional = None) -> Optional["FunctionInfo"]:
@@ -379,7 +395,7 @@ class FunctionInfo(IBasicCreatable, ICursorValidate, DescriptiveByAttributes, IS
     def arguments(self) -> List[Argument]:
         """List of function input arguments."""
         self._arguments = []
-        for children in self._cursor.get_children():
+        for children in get_children(self._cursor):
             if children.kind == cindex.CursorKind.PARM_DECL:
                 self._arguments.append(self.Argument(children, self))
         return self._arguments
@@ -398,6 +414,7 @@ class FunctionInfo(IBasicCreatable, ICursorValidate, DescriptiveByAttributes, IS
     @name.setter
     def name(self, value):
         self._name = value
+        Lexicon.renamed()
 
     @property
     def complex_name(self) -> str:
@@ -424,106 +441,65 @@ class FunctionInfo(IBasicCreatable, ICursorValidate, DescriptiveByAttributes, IS
     @property
     def overloading(self) -> Tuple:
         """List of another function overloading this name."""
-        family = list(self.overloading_family)
-        if family:
-            args = [arg.type for arg in self.arguments]
-            family = [f for f in family if args != [arg.type for arg in f.arguments]]
-        return tuple(family)
+        if self._lexicon is None:
+            return ()
+        index = _OverloadIndex.get_index(self._lexicon, self.name)
+        if index is None:
+            return ()
+        return index.family(self, overloads_only=True)
 
     @property
     def overloading_family(self) -> Tuple:
         """List of all functions overloading this name including this one."""
         if self._lexicon is None:
             return ()
-
-        functions: List[FunctionInfo] = self._lexicon.find_content(self.name)
-        if functions is None:
+        index = _OverloadIndex.get_index(self._lexicon, self.name)
+        if index is None:
             return ()
-
-        def check_eq(a: FunctionInfo, b: FunctionInfo) -> bool:
-            if [arg.type for arg in a.arguments] == [arg.type for arg in b.arguments]:
-                if b.lexicon is not None:
-                    a_namespaces = a.lexicon.namespaces_chain + a.namespaces
-                    b_namespaces = b.lexicon.namespaces_chain + b.namespaces
-                    if a_namespaces != b_namespaces:
-                        return False
-                if a.is_definition and b.is_definition:
-                    raise CodeError("Ambiguous functions definitions.")
-                if a.return_type != b.return_type:
-                    raise CodeError("Ambiguous functions return arguments.")
-                return True
-            else:
-                return False
-
-        result = []
-        duplicated_idx = []
-        for i in range(len(functions)):
-            for j in range(len(functions)):
-                if i == j:
-                    continue
-                if check_eq(functions[i], functions[j]):
-                    duplicated_idx.append(j)
-            if i in duplicated_idx:
-                continue
-            if functions[i].template is not None:
-                if functions[i].template.specialisation_values:
-                    continue
-            result.append(functions[i])
-
-        for i in range(len(result)):
-            definition = result[i].definition
-            if definition is not None:
-                result[i] = definition
-
-        # remove an element from other namespaces
-        base_namespace = self.lexicon.namespaces_chain + self.namespaces
-        result = filter(lambda f: f.lexicon is None or f.lexicon.namespaces_chain + f.namespaces == base_namespace,
-                        result)
-
-        return tuple(result)
+        return index.family(self)
 
     @property
     @lazy_invoke
     def modification(self) -> FunctionModification:
         """Function modification enum flag."""
         self._modification = FunctionModification.NONE
-        tokens = list(self._cursor.get_tokens())
+        tokens = get_token_spellings(self._cursor)
         for i in range(len(tokens)):
             token = tokens[i]
-            if token.spelling == "constexpr":
+            if token == "constexpr":
                 self._modification |= FunctionModification.CONSTEXPR
-            if token.spelling == "consteval":
+            if token == "consteval":
                 try:
-                    opening_bracket_index = list(map(lambda t: t.spelling, tokens)).index("{")
+                    opening_bracket_index = tokens.index("{")
                     if i < opening_bracket_index:
                         self._modification |= FunctionModification.CONSTEVAL
                 except ValueError:
                     self._modification |= FunctionModification.CONSTEVAL
-            elif token.spelling == "static":
+            elif token == "static":
                 self._modification |= FunctionModification.STATIC
-            elif token.spelling == "inline":
+            elif token == "inline":
                 self._modification |= FunctionModification.INLINE
-            elif token.spelling == "explicit":
+            elif token == "explicit":
                 self._modification |= FunctionModification.EXPLICIT
-            elif token.spelling == "final":
+            elif token == "final":
                 self._modification |= FunctionModification.FINAL
-            elif token.spelling == "delete":
+            elif token == "delete":
                 self._modification |= FunctionModification.DELETE
-            elif token.spelling == "override":
+            elif token == "override":
                 self._modification |= FunctionModification.OVERRIDE
-            elif token.spelling == "volatile":
+            elif token == "volatile":
                 self._modification |= FunctionModification.VOLATILE
-            elif token.spelling == "noexcept":
-                if i + 1 != len(tokens) and tokens[i + 1].spelling == "(":
+            elif token == "noexcept":
+                if i + 1 != len(tokens) and tokens[i + 1] == "(":
                     noexcept_value: str = ""
                     bracket_counter = 0
                     while True:
                         i += 1
-                        if tokens[i].spelling == "(":
+                        if tokens[i] == "(":
                             bracket_counter += 1
-                        elif tokens[i].spelling == ")":
+                        elif tokens[i] == ")":
                             bracket_counter -= 1
-                        noexcept_value += tokens[i].spelling
+                        noexcept_value += tokens[i]
                         if not bracket_counter > 0:
                             break
 
@@ -551,8 +527,9 @@ class FunctionInfo(IBasicCreatable, ICursorValidate, DescriptiveByAttributes, IS
     @lazy_invoke
     def body(self) -> Optional[str]:
         """Body of function - source code. None if it is a declaration."""
+        Configuration.get_configuration(self).parsing.require_full_profile("function bodies")
         self._body = None
-        for children in self._cursor.get_children():
+        for children in get_children(self._cursor):
             if children.kind == cindex.CursorKind.COMPOUND_STMT:
                 self._body = CodePiece(children).text
                 break
@@ -562,9 +539,27 @@ class FunctionInfo(IBasicCreatable, ICursorValidate, DescriptiveByAttributes, IS
     def body(self, value):
         self._body = value
 
+    def _has_body_text(self) -> bool:
+        """Check if function has body without creating it - either the body is part of the function extent (bodies
+        of some functions, e.g. constexpr, are never skipped) or the code after skipped body starts the body,
+        constructor initializer list or function-try-block."""
+        end = self._cursor.extent.end
+        if end.file is None:
+            return False
+        try:
+            source = read_bytes(end.file.name, self._cursor.translation_unit)
+        except IOError:
+            return False
+        if source[end.offset - 1:end.offset] == b"}":
+            return True
+        pattern = re.compile(rb"(?:\s|//[^\n]*|/\*.*?\*/)*({|:|try\b)", re.DOTALL)
+        return pattern.match(source, end.offset) is not None
+
     @property
     def is_declaration(self) -> bool:
         """Determine function kind, definition or declaration."""
+        if self._body is LazyNotInit and not Configuration.get_configuration(self).parsing.profile.is_body_extracted:
+            return not self._has_body_text()
         return self.body is None
 
     @property
@@ -577,6 +572,17 @@ class FunctionInfo(IBasicCreatable, ICursorValidate, DescriptiveByAttributes, IS
         """Definition of function."""
         if self.lexicon is None:
             return None
+        if self._cursor is None:
+            if self.is_definition:
+                return self
+            functions = self.lexicon.find_content(self.name)
+            if functions is None:
+                return None
+            arguments = [arg.type for arg in self.arguments]
+            for f in functions:
+                if isinstance(f, FunctionInfo) and f.is_definition and [arg.type for arg in f.arguments] == arguments:
+                    return f
+            return None
         cursor = self._cursor.get_definition()
         if cursor is None:
             return None
@@ -590,7 +596,7 @@ class FunctionInfo(IBasicCreatable, ICursorValidate, DescriptiveByAttributes, IS
         self._namespaces = []
         text_without_function_name = CodePiece(self._cursor).text
         text = text_without_function_name[:text_without_function_name.find(f"{self._cursor.spelling}(")]
-        if text[-1].isspace():
+        if not text or text[-1].isspace():
             return self._namespaces
         namespace_tokens = text.split()[-1].split("::")
         namespace_tokens = list(filter(lambda element: element, namespace_tokens))
@@ -684,7 +690,7 @@ class FunctionInfo(IBasicCreatable, ICursorValidate, DescriptiveByAttributes, IS
         self._requires = []
 
         def find_concepts(cursor: cindex.Cursor) -> Iterable[cindex.Cursor]:
-            for child in cursor.get_children():
+            for child in get_children(cursor):
                 if child.location.line < self._cursor.location.line:
                     # Ignore template elements.
                     continue
@@ -720,3 +726,77 @@ class FunctionInfo(IBasicCreatable, ICursorValidate, DescriptiveByAttributes, IS
 
     def __repr__(self):
         return f"{type(self).__name__}:{self.name} ({super().__repr__()})"
+
+
+def _qualified_name(function: FunctionInfo) -> Optional[Tuple]:
+    if function.lexicon is None:
+        return None
+    return tuple(function.lexicon.namespaces_chain + function.namespaces)
+
+
+def _type_key(type_expression: Any) -> Any:
+    # coarse key of type - equal types always have equal keys, so only functions with equal keys are compared
+    if not isinstance(type_expression, TypeExpression):
+        return None
+    modification = type_expression.modification
+    array_order = modification.array_order
+    return (modification.value, modification.pointer_order, None if array_order is None else tuple(array_order),
+            getattr(type_expression.details, "name", None))
+
+
+class _OverloadIndex:
+    """Functions of the same name found by lexicon grouped into classes of functions with the same qualified name
+    and the same argument types (declarations and the definition of one function). Index is created once for
+    the list of functions and kept by lexicon as long as it finds the same functions (see Lexicon.find_overloads)."""
+
+    def __init__(self, functions: List):
+        self._groups = {}
+        self._families = {}
+        buckets = {}
+        for function in functions:
+            if not isinstance(function, FunctionInfo):
+                continue
+            qualified_name = _qualified_name(function)
+            arguments = [arg.type for arg in function.arguments]
+            key = (qualified_name, tuple(_type_key(a) for a in arguments))
+            groups = buckets.setdefault(key, [])
+            for group in groups:
+                if group[0] == arguments:
+                    self._add(group, function)
+                    break
+            else:
+                group = [arguments, function]
+                groups.append(group)
+                if function.template is None or not function.template.specialisation_values:
+                    self._families.setdefault(qualified_name, []).append(function)
+            self._groups[id(function)] = group
+
+    def _add(self, group: List, function: FunctionInfo):
+        if function.is_definition and any(f.is_definition for f in group[1:]):
+            raise CodeError("Ambiguous functions definitions.")
+        if group[1].return_type != function.return_type:
+            raise CodeError("Ambiguous functions return arguments.")
+        group.append(function)
+
+    def family(self, function: FunctionInfo, overloads_only: bool = False) -> Tuple:
+        """Functions with the qualified name of function, one per overload (definitions are preferred)."""
+        qualified_name = _qualified_name(function)
+        group = self._groups.get(id(function))
+        result = []
+        for member in self._families.get(qualified_name, ()):
+            if overloads_only and group is not None and self._groups[id(member)] is group:
+                continue
+            definition = member.definition
+            if definition is not None:
+                member = definition
+            if member.lexicon is None or _qualified_name(member) == qualified_name:
+                result.append(member)
+        if overloads_only and group is None:
+            arguments = [arg.type for arg in function.arguments]
+            result = [f for f in result if arguments != [arg.type for arg in f.arguments]]
+        return tuple(result)
+
+    @classmethod
+    def get_index(cls, lexicon: Lexicon, name: str) -> Optional["_OverloadIndex"]:
+        """Index of functions found by lexicon for name, or None if nothing is found."""
+        return lexicon.find_overloads(name, cls)
@@ -16,6 +16,8 @@ class FunctionType(IBasicCreatable, ICursorValidate, ISyntaxElement):
     """Class representing the type of function (function pointer) that can
     appear as a variable or in a typedef etc."""
 
+    __slots__ = ("_cursor", "_parent", "_name", "_lexicon", "_arguments", "_return_type", "_text_source")
+
     def __init__(self, cursor: Optional[cindex.Cursor] = None, parent: Optional[CodeContainer] = None):
         self._cursor = cursor
         self._parent = parent
@@ -89,9 +91,10 @@ class FunctionType(IBasicCreatable, ICursorValidate, ISyntaxElement):
 
     @property
     @lazy_invoke
-    def text_source(self) -> CodePiece:
-        """Source of this element."""
-        self._text_source = CodePiece(self._cursor)
+    def text_source(self) -> Optional[CodePiece]:
+        """Source of this element. Function types have no source of their own, it is a part of declarations which
+        use them."""
+        self._text_source = None
         return self._text_source
 
     @property
@@ -16,6 +16,8 @@ class NamespaceInfo(CodeContainer, DescriptiveByAttributes):
     """Object representation of current scope namespace, for example usage in file or global namespace with all
     namespaces component placed in many files."""
 
+    __slots__ = ("_name", "_associated_comment", "_attributes")
+
     def __init__(self, cursor: Optional[cindex.Cursor] = None, parent: Optional[CodeContainer] = None):
         super().__init__(cursor, parent)
         if cursor is None:
@@ -44,9 +46,11 @@ class NamespaceInfo(CodeContainer, DescriptiveByAttributes):
     ) -> "NamespaceInfo":
         return cls(None, parent)
 
+    cursor_kinds = (cindex.CursorKind.NAMESPACE,)
+
     @staticmethod
     def is_cursor_valid(cursor: cindex.Cursor) -> bool:
-        return cursor.kind == cindex.CursorKind.NAMESPACE
+        return cursor.kind in NamespaceInfo.cursor_kinds
 
     @property
     @lazy_invoke
@@ -57,8 +61,10 @@ class NamespaceInfo(CodeContainer, DescriptiveByAttributes):
     @name.setter
     def name(self, value):
         self._name = value
+        Lexicon.renamed()
 
     @property
+    @lazy_invoke
     def text_source(self) -> Optional[CodePiece]:
         """Source of this element."""
         self._text_source = CodePiece(self._cursor)
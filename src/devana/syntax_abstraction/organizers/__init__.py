@@ -3,7 +3,10 @@ Organizers provides pythons classes, including base classes, that can store othe
 hierarchy.
 """
 
+from .includegraph import IncludeGraph
 from .lexicon import Lexicon
+from .parsingsession import ParsingSession
 from .sourcefile import IncludeInfo, SourceFile, SourceFileType
 from .sourcemodule import ModuleFilter, SourceModule
+from .translationunitcache import TranslationUnitCache
 from .codecontainer import CodeContainer
@@ -1,6 +1,8 @@
 from abc import ABC, abstractmethod
-from typing import Optional, List, Any
+from typing import Optional, List, Any, Callable
 from clang import cindex
+from devana.syntax_abstraction._cursortree import get_children
+from devana.syntax_abstraction._cursordispatch import CursorDispatch
 from devana.syntax_abstraction.codepiece import CodePiece
 from devana.utility.lazy import LazyNotInit, lazy_invoke
 from devana.utility.traits import IBasicCreatable, ICursorValidate
@@ -10,15 +12,95 @@ from devana.utility.errors import ParserError
 from devana.syntax_abstraction.syntax import ISyntaxElement
 
 
+class ContentList(list):
+    """Content of code container. Every change of the list is counted by version and reported to observers, so
+    indexes of content (see Lexicon) are not created again until the content is changed."""
+
+    __slots__ = ("version", "_observers")
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.version = 0
+        self._observers: List[Callable[[], None]] = []
+
+    def observe(self, observer: Callable[[], None]):
+        """Call observer after each change of the list."""
+        if observer not in self._observers:
+            self._observers.append(observer)
+
+    def changed(self):
+        """Count the change of the list and report it to observers."""
+        self.version += 1
+        for observer in self._observers:
+            observer()
+
+    def __reduce__(self):
+        # observers are not a part of content
+        return type(self), (), None, iter(self)
+
+    def append(self, value):
+        super().append(value)
+        self.changed()
+
+    def extend(self, values):
+        super().extend(values)
+        self.changed()
+
+    def insert(self, index, value):
+        super().insert(index, value)
+        self.changed()
+
+    def remove(self, value):
+        super().remove(value)
+        self.changed()
+
+    def pop(self, index=-1):
+        value = super().pop(index)
+        self.changed()
+        return value
+
+    def clear(self):
+        super().clear()
+        self.changed()
+
+    def sort(self, *args, **kwargs):
+        super().sort(*args, **kwargs)
+        self.changed()
+
+    def reverse(self):
+        super().reverse()
+        self.changed()
+
+    def __setitem__(self, index, value):
+        super().__setitem__(index, value)
+        self.changed()
+
+    def __delitem__(self, index):
+        super().__delitem__(index)
+        self.changed()
+
+    def __iadd__(self, values):
+        result = super().__iadd__(values)
+        self.changed()
+        return result
+
+    def __imul__(self, value):
+        result = super().__imul__(value)
+        self.changed()
+        return result
+
+
 class CodeContainer(IBasicCreatable, ICursorValidate, ISyntaxElement, ABC):
     """Class representing part of code source who is able to hold other sources in his body."""
 
+    __slots__ = ("_cursor", "_parent", "_namespace", "_content", "_text_source", "_lexicon")
+
     def __init__(self, cursor: Optional[cindex.Cursor] = None, parent: Optional = None):
         self._cursor = cursor
         self._parent = parent
         if cursor is None:
             self._namespace = None
-            self._content = []
+            self._content = ContentList()
             self._text_source = None
         else:
             self._namespace = LazyNotInit
@@ -49,12 +131,16 @@ class CodeContainer(IBasicCreatable, ICursorValidate, ISyntaxElement, ABC):
     @lazy_invoke
     def content(self) -> List[Any]:
         """List of source code objects."""
-        self._content = list(self._create_content())
+        self._content = ContentList(self._create_content())
         return self._content
 
     @content.setter
     def content(self, value):
-        self._content = value
+        previous = getattr(self, "_content", None)
+        self._content = value if isinstance(value, ContentList) or value is None else ContentList(value)
+        if isinstance(previous, ContentList) and previous is not self._content:
+            # replaced content is changed for observers of the previous list
+            previous.changed()
 
     @property
     @lazy_invoke
@@ -109,14 +195,14 @@ class CodeContainer(IBasicCreatable, ICursorValidate, ISyntaxElement, ABC):
 
     def _create_content(self) -> List[Any]:
         """Overwrite this method to filter witch content should be parsed inside class."""
-        types = self._content_types
+        dispatch = CursorDispatch.get_dispatch(type(self), lambda: self._content_types)
         content = []
         config = Configuration.get_configuration(self)
         is_abort_on_error = config.parsing.error_strategy == ParsingErrorPolicy.ABORT
         is_ignore_on_error = config.parsing.error_strategy == ParsingErrorPolicy.IGNORE
-        for children in self._cursor.get_children():
+        for children in get_children(self._cursor):
             element: Optional = None
-            for t in types:
+            for t in dispatch.candidates(children.kind):
                 try:
                     element = t.from_cursor(children, self)
                     if element is None:
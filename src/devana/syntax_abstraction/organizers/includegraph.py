@@ -0,0 +1,141 @@
+import os
+from typing import Dict, Iterable, List, Set, Tuple
+
+
+class IncludeGraph:
+    """Graph of includes between files. Files are identified by absolute paths. Edge from file A to file B means
+    that A includes B directly.
+
+    Reverse edges, strongly connected components (include cycles), topological order and transitive includes
+    are computed on the first use and stored."""
+
+    def __init__(self, edges: Iterable[Tuple[str, Iterable[str]]]):
+        self._edges: Dict[str, List[str]] = {}
+        for path, includes in edges:
+            path = os.path.abspath(str(path))
+            targets = self._edges.setdefault(path, [])
+            for include in includes:
+                include = os.path.abspath(str(include))
+                self._edges.setdefault(include, [])
+                if include not in targets:
+                    targets.append(include)
+        self._reverse_edges: Dict[str, List[str]] = {}
+        self._components: List[List[str]] = []
+        self._closures: Dict[str, Set[str]] = {}
+
+    @property
+    def nodes(self) -> List[str]:
+        """All files of graph: files of module and files included by them."""
+        return list(self._edges)
+
+    def _node(self, path: str) -> str:
+        path = os.path.abspath(str(path))
+        if path not in self._edges:
+            raise KeyError(f"File {path} is not a part of include graph.")
+        return path
+
+    def includes(self, path: str) -> List[str]:
+        """Files included directly by file."""
+        return list(self._edges[self._node(path)])
+
+    def included_by(self, path: str) -> List[str]:
+        """Files which include file directly."""
+        if not self._reverse_edges:
+            self._reverse_edges = {node: [] for node in self._edges}
+            for node, targets in self._edges.items():
+                for target in targets:
+                    self._reverse_edges[target].append(node)
+        return list(self._reverse_edges[self._node(path)])
+
+    @property
+    def strongly_connected_components(self) -> List[List[str]]:
+        """Groups of files which include each other (directly or not). Files without include cycles are groups
+        of one file. Groups are ordered in the same way as topological_order."""
+        if not self._components and self._edges:
+            self._components = self._find_components()
+        return [list(component) for component in self._components]
+
+    @property
+    def topological_order(self) -> List[str]:
+        """All files ordered so that each file is placed after files included by it. Files from include cycles are
+        placed next to each other."""
+        return [node for component in self.strongly_connected_components for node in component]
+
+    @property
+    def cycles(self) -> List[List[str]]:
+        """Groups of files which include each other."""
+        return [component for component in self.strongly_connected_components
+                if len(component) > 1 or component[0] in self._edges[component[0]]]
+
+    def transitive_includes(self, path: str) -> Set[str]:
+        """All files included by file, directly or by other included files."""
+        node = self._node(path)
+        if not self._closures:
+            self._closures = self._find_closures()
+        return set(self._closures[node])
+
+    def transitive_included_by(self, path: str) -> Set[str]:
+        """All files which include file, directly or by other files."""
+        node = self._node(path)
+        if not self._closures:
+            self._closures = self._find_closures()
+        return {other for other, closure in self._closures.items() if node in closure}
+
+    def _find_components(self) -> List[List[str]]:
+        # iterative Tarjan algorithm - components are found in reverse topological order of the condensed graph,
+        # so the included files come first
+        index: Dict[str, int] = {}
+        low_link: Dict[str, int] = {}
+        stack: List[str] = []
+        on_stack: Set[str] = set()
+        components = []
+        for root in self._edges:
+            if root in index:
+                continue
+            work = [(root, 0)]
+            while work:
+                node, position = work.pop()
+                if position == 0:
+                    index[node] = low_link[node] = len(index)
+                    stack.append(node)
+                    on_stack.add(node)
+                targets = self._edges[node]
+                for i in range(position, len(targets)):
+                    target = targets[i]
+                    if target not in index:
+                        work.append((node, i + 1))
+                        work.append((target, 0))
+                        break
+                    if target in on_stack:
+                        low_link[node] = min(low_link[node], index[target])
+                else:
+                    if low_link[node] == index[node]:
+                        component = []
+                        while True:
+                            member = stack.pop()
+                            on_stack.discard(member)
+                            component.append(member)
+                            if member == node:
+                                break
+                        components.append(component)
+                    if work:
+                        parent = work[-1][0]
+                        low_link[parent] = min(low_link[parent], low_link[node])
+        return components
+
+    def _find_closures(self) -> Dict[str, Set[str]]:
+        closures: Dict[str, Set[str]] = {}
+        for component in self.strongly_connected_components:
+            # included components are already computed thanks to the topological order
+            members = set(component)
+            closure: Set[str] = set()
+            for node in component:
+                for target in self._edges[node]:
+                    closure.add(target)
+                    if target not in members:
+                        closure |= closures[target]
+            if len(component) > 1:
+                closure |= members
+            for node in component:
+                closures[node] = closure
+        return closures
@@ -1,9 +1,109 @@
-from typing import Optional, List, Union
+from typing import Optional, List, Union, Dict, Any, Callable, Tuple
 from clang import cindex
-from devana.syntax_abstraction.organizers.codecontainer import CodeContainer
+from devana.syntax_abstraction.organizers.codecontainer import CodeContainer, ContentList
 from devana.utility.errors import ParserError
 
 
+_TYPE_KINDS = frozenset((cindex.CursorKind.CLASS_DECL, cindex.CursorKind.STRUCT_DECL, cindex.CursorKind.UNION_DECL,
+                         cindex.CursorKind.ENUM_DECL, cindex.CursorKind.TYPEDEF_DECL, cindex.CursorKind.TYPE_ALIAS_DECL,
+                         cindex.CursorKind.CLASS_TEMPLATE, cindex.CursorKind.TYPE_ALIAS_TEMPLATE_DECL,
+                         cindex.CursorKind.CLASS_TEMPLATE_PARTIAL_SPECIALIZATION, cindex.CursorKind.CONCEPT_DECL))
+"""Kinds of cursors registered by USR - the USR table is used to resolve types."""
+
+_PRIMARY_TEMPLATE_KINDS = frozenset((cindex.CursorKind.FUNCTION_TEMPLATE, cindex.CursorKind.CLASS_TEMPLATE))
+
+_SPECIALISATION_KINDS = frozenset((cindex.CursorKind.FUNCTION_DECL, cindex.CursorKind.CXX_METHOD,
+                                   cindex.CursorKind.CONSTRUCTOR, cindex.CursorKind.CONVERSION_FUNCTION,
+                                   cindex.CursorKind.CLASS_DECL, cindex.CursorKind.STRUCT_DECL,
+                                   cindex.CursorKind.UNION_DECL,
+                                   cindex.CursorKind.CLASS_TEMPLATE_PARTIAL_SPECIALIZATION))
+"""Kinds of cursors which can be specialisations of templates."""
+
+
+def _is_definition(element: Any) -> bool:
+    return hasattr(element, "is_definition") and element.is_definition
+
+
+class _SymbolTable:
+    """Elements of lexicon tree created from cursors, keyed by cursors and (for types) by USRs of cursors. USR is
+    shared by all declarations and the definition of the same entity, so the definition is kept if it is
+    registered. Primary templates and their partial and full specialisations are grouped by USR of primary
+    template."""
+
+    __slots__ = ("cursors", "usrs", "templates")
+
+    def __init__(self):
+        self.cursors: Dict[cindex.Cursor, Any] = {}
+        self.usrs: Dict[str, Any] = {}
+        self.templates: Dict[str, List] = {}
+
+    def register(self, element: Any):
+        cursor = getattr(element, "_cursor", None)
+        if not isinstance(cursor, cindex.Cursor):
+            return
+        if self.cursors.setdefault(cursor, element) is element:
+            self._register_template(cursor, element)
+        if cursor.kind not in _TYPE_KINDS:
+            return
+        usr = cursor.get_usr()
+        if usr:
+            registered = self.usrs.get(usr)
+            if registered is None or (not _is_definition(registered) and _is_definition(element)):
+                self.usrs[usr] = element
+
+    def _register_template(self, cursor: cindex.Cursor, element: Any):
+        if cursor.kind in _PRIMARY_TEMPLATE_KINDS:
+            usr = cursor.get_usr()
+        elif cursor.kind in _SPECIALISATION_KINDS:
+            primary = cindex.conf.lib.clang_getSpecializedCursorTemplate(cursor)
+            usr = None if primary is None else primary.get_usr()
+        else:
+            return
+        if usr:
+            family = self.templates.setdefault(usr, [])
+            if not any(e is element for e in family):
+                family.append(element)
+
+    def merge(self, other: "_SymbolTable"):
+        for element in other.cursors.values():
+            self.register(element)
+
+    def remove(self, predicate: Callable[[Any], bool]):
+        """Remove elements matching predicate."""
+        self.cursors = {c: e for c, e in self.cursors.items() if not predicate(e)}
+        self.usrs = {u: e for u, e in self.usrs.items() if not predicate(e)}
+        self.templates = {u: [e for e in f if not predicate(e)] for u, f in self.templates.items()}
+
+
+class _ContentIndex:
+    """Elements of content of one lexicon source grouped by names, with using namespace directives. Index is valid as
+    long as the content list of source is neither replaced nor changed (see ContentList) and no element is renamed
+    (see Lexicon.renamed). Elements are registered in the given symbol table."""
+
+    __slots__ = ("source", "content", "length", "version", "renames", "names", "usings")
+
+    def __init__(self, source: Any, content: Optional[List], items: List, symbols: _SymbolTable, *, renames: int):
+        from devana.syntax_abstraction.usingnamespace import UsingNamespace  # pylint: disable=import-outside-toplevel
+        self.source = source
+        self.content = content
+        self.length = 0 if content is None else len(content)
+        self.version = getattr(content, "version", None)
+        self.renames = renames
+        self.names: Dict[str, List] = {}
+        self.usings: List[UsingNamespace] = []
+        for item in items:
+            if hasattr(item, "name"):
+                self.names.setdefault(item.name, []).append(item)
+            if isinstance(item, UsingNamespace):
+                self.usings.append(item)
+            symbols.register(item)
+
+    def is_valid(self, source: Any, content: Optional[List], renames: int) -> bool:
+        return self.source is source and self.content is content and self.length == (
+            0 if content is None else len(content)) and self.version == getattr(content, "version", None) \
+            and self.renames == renames
+
+
 class Lexicon:
     """Class storage all multiple usage code elements in working context.
 
@@ -14,6 +114,9 @@ class Lexicon:
     and handcrafted code generation.
     Lexicon data are stacked in tree-like structures by data namespaces."""
 
+    _renames = 0
+    """Counter of renamed elements of all lexicons (see renamed)."""
+
     @classmethod
     def create(cls, source=None):
         """Use this method to create lexicon inside syntax object to fit lexicon scope."""
@@ -37,38 +140,13 @@ class Lexicon:
                 instance: Lexicon = source.parent.lexicon
                 if source is not None:
                     instance._sources.append(source)  # pylint: disable=protected-access
+                    instance._changed()  # pylint: disable=protected-access
                 return instance
 
-            match = list(x for x in source.parent.lexicon.nodes if x.namespace == source.namespace)
-            if match:
-                assert len(match) == 1
-                instance: Lexicon = match[0]
-
-                if hasattr(source, "is_declaration") and (hasattr(source, "template") and source.template is None):
-                    sources = []
-                    for s in instance._sources:  # pylint: disable=protected-access
-                        if not hasattr(s, "is_declaration"):
-                            sources.append(s)
-                            continue
-                        if hasattr(s, "template") and s.template is not None: # noqa
-                            sources.append(s)
-                            continue
-                        if s.name == source.name: # noqa
-                            if source.is_declaration:
-                                if s.is_declaration: # noqa
-                                    sources.append(s)
-                                else:
-                                    sources.append(source)
-                            else:  # source is definition
-                                if s.is_definition: # noqa
-                                    raise ParserError("Multiple definitions.")
-                                sources.append(source)
-                    instance._sources = sources  # pylint: disable=protected-access
-                else:
-                    if source is not None:
-                        instance._sources.append(source)  # pylint: disable=protected-access
-
-                return instance
+            match = source.parent.lexicon._get_node(source.namespace)  # pylint: disable=protected-access
+            if match is not None:
+                match._add_source(source)  # pylint: disable=protected-access
+                return match
             return cls(source)
         else:
             return source.parent.lexicon
@@ -80,6 +158,19 @@ class Lexicon:
             self._sources.append(source)
         self._content_internal = []
         self._nodes = []
+        self._source_indexes: Dict[int, _ContentIndex] = {}
+        self._internal_indexes: Dict[int, _ContentIndex] = {}
+        self._indexes: Optional[List[_ContentIndex]] = None
+        self._indexes_renames = -1
+        self._node_index: Dict[str, Lexicon] = {}
+        self._node_count = 0
+        self._symbols = _SymbolTable()
+        # counter of changes of sources and nodes of lexicon tree, it is kept by the root and it is used to check
+        # if elements of the tree were all registered in cursor map after the last change
+        self._version = 0
+        self._registered_version = -1
+        # indexes of overloaded elements keyed by name with elements used to create them (see find_overloads)
+        self._overloads: Dict[str, Tuple[List, Any]] = {}
         if source is None:
             self._namespace = None
             self._parent = None
@@ -90,8 +181,46 @@ class Lexicon:
             else:
                 self._parent = source.parent.lexicon
                 self._parent.nodes.append(self)
+                self._changed()
             # special case for class definition like class A::B {};
 
+    def _add_source(self, source: CodeContainer):
+        """Add next source of lexicon namespace. Declarations and the definition of the same non-template element
+        are kept as one source - the definition, if it exists. ParserError is raised for the second definition."""
+        if hasattr(source, "is_declaration") and (hasattr(source, "template") and source.template is None):
+            sources = []
+            for s in self._sources:
+                if not hasattr(s, "is_declaration"):
+                    sources.append(s)
+                    continue
+                if hasattr(s, "template") and s.template is not None: # noqa
+                    sources.append(s)
+                    continue
+                if s.name == source.name: # noqa
+                    if source.is_declaration:
+                        if s.is_declaration: # noqa
+                            sources.append(s)
+                        else:
+                            sources.append(source)
+                    else:  # source is definition
+                        if s.is_definition: # noqa
+                            raise ParserError("Multiple definitions.")
+                        sources.append(source)
+            self._sources = sources
+        else:
+            self._sources.append(source)
+        self._changed()
+
+    def _changed(self):
+        """Mark that sources, content or nodes of lexicon tree were changed."""
+        self._indexes = None
+        self.root._version += 1  # pylint: disable=protected-access
+
+    @staticmethod
+    def renamed():
+        """Mark that name of an element was changed. Names of content are indexed again by next searches."""
+        Lexicon._renames += 1
+
     @property
     def parent(self) -> Optional:
         return self._parent
@@ -105,12 +234,71 @@ class Lexicon:
         """Return list of nested lexicons."""
         return self._nodes
 
+    def __getstate__(self):
+        # indexes are keyed by identifiers of objects, so they are created again after unpickling
+        state = dict(vars(self))
+        state.update(_source_indexes={}, _internal_indexes={}, _indexes=None, _node_index={}, _node_count=0,
+                     _symbols=_SymbolTable(), _registered_version=-1, _overloads={})
+        return state
+
+    def _get_node(self, namespace: Optional[str]) -> Optional["Lexicon"]:
+        """Nested lexicon of namespace. The index is updated when nodes were added or removed."""
+        if self._node_count != len(self._nodes):
+            self._node_index = {}
+            for node in self._nodes:
+                self._node_index.setdefault(node.namespace, node)
+            self._node_count = len(self._nodes)
+        return self._node_index.get(namespace)
+
+    def _content_indexes(self) -> List[_ContentIndex]:
+        """Indexes of code content in the same order as content property. They are created again only after change
+        of sources or their content (content lists of sources are observed, see ContentList), and indexes of not
+        changed sources are reused."""
+        renames = Lexicon._renames
+        if self._indexes is not None and self._indexes_renames == renames:
+            return self._indexes
+        root = self.root
+        version = root._version  # pylint: disable=protected-access
+        symbols = root._symbols  # pylint: disable=protected-access
+        internal = []
+        for c in self._content_internal:
+            content = c.content if issubclass(type(c), CodeContainer) else None
+            index = self._internal_indexes.get(id(c))
+            if index is None or not index.is_valid(c, content, renames):
+                index = _ContentIndex(c, content, [c] if content is None else content, symbols, renames=renames)
+                self._internal_indexes[id(c)] = index
+            self._observe(content)
+            internal.append(index)
+        indexes = []
+        for s in self._sources:
+            content = s.content if hasattr(s, "content") else None
+            index = self._source_indexes.get(id(s))
+            if index is None or not index.is_valid(s, content, renames):
+                items = ([] if content is None else list(content)) + [s]
+                index = _ContentIndex(s, content, items, symbols, renames=renames)
+                self._source_indexes[id(s)] = index
+            self._observe(content)
+            indexes.append(index)
+            indexes.extend(internal)
+        if root._version == version:  # pylint: disable=protected-access
+            # lexicon tree can be changed by content created above, then indexes are created again by the next call
+            self._indexes = indexes
+            self._indexes_renames = renames
+        return indexes
+
+    def _observe(self, content: Optional[List]):
+        if isinstance(content, ContentList):
+            content.observe(self._changed)
+
+    def _find_names(self, name: str) -> List:
+        """Code content with given name."""
+        return [c for index in self._content_indexes() for c in index.names.get(name, ())]
+
     def find_node(self, name):
         """Deep search node (namespace)."""
-        content = self.nodes
-        result = list(c for c in content if c.namespace == name)
-        if result:
-            return result[0]
+        result = self._get_node(name)
+        if result is not None:
+            return result
 
         for n in self.allowed_namespaces:
             if n.namespace == name:
@@ -142,6 +330,68 @@ class Lexicon:
 
     def append_content(self, value):
         self._content_internal.append(value)
+        self._changed()
+
+    def merge(self, other: "Lexicon", rejected: Optional[List] = None) -> Dict[int, Any]:
+        """Move sources, content and nested lexicons of other lexicon into this one. Nested lexicons with the same
+        namespace are merged recursively and their sources are added in the same way as by create - the second
+        definition of the same element is rejected and it is appended to rejected list with nested lexicons of
+        its namespace. Returns map from identifiers of merged (abandoned) lexicons and rejected sources to lexicons
+        and sources that replace them."""
+        self._changed()
+        self.root._symbols.merge(other._symbols)  # pylint: disable=protected-access
+        for source in other.sources:
+            if not any(s is source for s in self._sources):
+                self._sources.append(source)
+        return self._merge_nodes(other, [] if rejected is None else rejected)
+
+    def _merge_nodes(self, other: "Lexicon", rejected: List) -> Dict[int, Any]:
+        replacements = {id(other): self}
+        self._content_internal.extend(other._content_internal)  # pylint: disable=protected-access
+        for node in other.nodes:
+            match = self._get_node(node.namespace)
+            if match is None:
+                node._parent = self  # pylint: disable=protected-access
+                self.nodes.append(node)
+                continue
+            is_accepted = not node.sources
+            for source in node.sources:
+                try:
+                    match._add_source(source)  # pylint: disable=protected-access
+                    is_accepted = True
+                except ParserError:
+                    rejected.append(source)
+                    replacements[id(source)] = next(s for s in match.sources
+                                                    if _is_definition(s) and s.name == source.name)
+            if is_accepted:
+                replacements.update(match._merge_nodes(node, rejected))  # pylint: disable=protected-access
+            else:
+                replacements[id(node)] = match
+        return replacements
+
+    def remove_file(self, source_file) -> None:
+        """Remove all sources created from the given source file (except the file itself) and nested lexicons which
+        become empty."""
+
+        def is_from_file(source) -> bool:
+            element = source.parent
+            while element is not None:
+                if element is source_file:
+                    return True
+                element = getattr(element, "parent", None)
+            return False
+
+        self._changed()
+        self._sources = [s for s in self._sources if s is source_file or not is_from_file(s)]
+        self._source_indexes = {id(s): self._source_indexes[id(s)] for s in self._sources
+                                if id(s) in self._source_indexes}
+        for node in list(self._nodes):
+            node.remove_file(source_file)
+            if not node.sources and not node.nodes and not node._content_internal:  # pylint: disable=protected-access
+                self._nodes.remove(node)
+                self._node_count = -1
+        if self.parent is None:
+            self._symbols.remove(is_from_file)
 
     def find_content(self, name: str, namespaces=None) -> Optional[List]:
         if namespaces is None:
@@ -154,18 +404,22 @@ class Lexicon:
                 #raise CodeError("Namespace do not know in Lexicon.")
             return node.find_content(name, namespaces[1:])
 
-        content = self.content
-        result = list(c for c in content if hasattr(c, "name") and c.name == name)
+        result = self._find_names(name)
         if result:
             return result
 
+        searched = set()
         for s in self._sources:
             if s is not None:
+                if s.lexicon is not None:
+                    # allowed namespaces of sources are taken from their lexicon, so they are searched once
+                    if id(s.lexicon) in searched:
+                        continue
+                    searched.add(id(s.lexicon))
                 for n in s.allowed_namespaces:
                     if isinstance(n, CodeContainer):
                         if n.lexicon is not None:
-                            content = n.lexicon.content
-                            result = list(c for c in content if hasattr(c, "name") and c.name == name)
+                            result = n.lexicon._find_names(name)  # pylint: disable=protected-access
                             if result:
                                 return result
         if self.parent is None:
@@ -191,9 +445,9 @@ class Lexicon:
             return content[0]
         return None
 
-    def _find_type_from_cursor(self, cursor: cindex.Cursor):
-        result = self.find_type(cursor.spelling)
-
+    @staticmethod
+    def semantic_path(cursor: cindex.Cursor) -> List[str]:
+        """Names of semantic parents of cursor (namespaces and classes) from the root, including cursor name."""
         namespaces: List[str] = []
         c = cursor
         for _ in range(2048):
@@ -203,15 +457,53 @@ class Lexicon:
                 break
             namespaces.append(c.spelling)
             c = c.semantic_parent
+        namespaces.reverse()
+        return namespaces
 
-        if not namespaces:
+    def _find_registered_type(self, cursor: cindex.Cursor) -> Optional:
+        """Find type of declaration cursor in symbol table by USR. None is returned if the type definition or parent
+        classes of the type are not registered yet - the type has to be searched by its path then."""
+        # pylint: disable=import-outside-toplevel
+        from devana.syntax_abstraction.classinfo import ClassInfo
+        usrs = self.root._symbols.usrs  # pylint: disable=protected-access
+        usr = cursor.get_usr()
+        result = usrs.get(usr) if usr else None
+        if result is None:
+            return None
+        if not _is_definition(result) and cursor.get_definition() is not None:
+            # definition exists, but it is not created yet
+            return None
+        parent = cursor.semantic_parent
+        for _ in range(2048):
+            if parent is None:
+                raise ParserError("Class template namespace is not allowed.")
+            if parent.kind == cindex.CursorKind.TRANSLATION_UNIT:
+                return result
+            if parent.kind != cindex.CursorKind.NAMESPACE:
+                parent_usr = parent.get_usr()
+                parent_result = usrs.get(parent_usr) if parent_usr else None
+                if parent_result is None:
+                    return None
+                if isinstance(parent_result, ClassInfo) and parent_result.template is not None:
+                    raise ParserError("Class template namespace is not allowed.")
+            parent = parent.semantic_parent
+        return None
+
+    def _find_type_from_cursor(self, cursor: cindex.Cursor):
+        result = self._find_registered_type(cursor)
+        if result is not None:
             return result
+        namespaces = self.semantic_path(cursor)
+        if not namespaces:
+            return self.find_type(cursor.spelling)
+        return self._find_type_from_path(namespaces)
 
+    def _find_type_from_path(self, namespaces: List[str]):
         lex = self.root
         result = None
         templates_count = 0
         from devana.syntax_abstraction.classinfo import ClassInfo  # pylint: disable=import-outside-toplevel
-        for i, n in enumerate(reversed(namespaces)):
+        for i, n in enumerate(namespaces):
             if i == len(namespaces) - 1:
                 result = lex.find_content(n)
             else:
@@ -255,27 +547,57 @@ class Lexicon:
         else:
             return self._find_type_from_cursor(element)
 
+    def _register_tree(self):
+        """Register all elements of lexicon tree in cursor map of root. Content of all sources is created, so it
+        is done again only if sources or nodes were changed since the last registration."""
+        while self._registered_version != self._version:
+            version = self._version
+            stack = [self]
+            while stack:
+                lexicon = stack.pop()
+                lexicon._content_indexes()  # pylint: disable=protected-access
+                stack.extend(lexicon.nodes)
+            self._registered_version = version
+
     def find_cursor(self, cursor: cindex.Cursor) -> Optional:
+        """Find element of the whole lexicon tree created from cursor."""
+        root = self.root
+        result = root._symbols.cursors.get(cursor)  # pylint: disable=protected-access
+        if result is None:
+            root._register_tree()  # pylint: disable=protected-access
+            result = root._symbols.cursors.get(cursor)  # pylint: disable=protected-access
+        return result
 
-        def finder(lexicon, searched_cursor):
-            for c in lexicon.content:
-                if c._cursor == searched_cursor: # noqa pylint: disable=protected-access
-                    return c
-            for node in lexicon.nodes:
-                result = finder(node, searched_cursor)
-                if result is not None:
-                    return result
+    def find_template_family(self, cursor: cindex.Cursor) -> List:
+        """Find elements of the whole lexicon tree created from primary template of cursor (cursor itself, if it is
+        not a specialisation) and from all its specialisations."""
+        primary = cindex.conf.lib.clang_getSpecializedCursorTemplate(cursor)
+        usr = (cursor if primary is None else primary).get_usr()
+        if not usr:
+            return []
+        root = self.root
+        root._register_tree()  # pylint: disable=protected-access
+        return list(root._symbols.templates.get(usr, ()))  # pylint: disable=protected-access
+
+    def find_overloads(self, name: str, create: Callable[[List], Any]) -> Optional[Any]:
+        """Find index of overloads of name created by create from elements found by find_content. The index is kept
+        by lexicon and it is created again only when lexicon finds other elements. None is returned if nothing is
+        found."""
+        elements = self.find_content(name)
+        if elements is None:
             return None
-
-        return finder(self.root, cursor)
+        cached = self._overloads.get(name)
+        if cached is None or len(cached[0]) != len(elements) or any(a is not b for a, b in zip(cached[0], elements)):
+            cached = (elements, create(elements))
+            self._overloads[name] = cached
+        return cached[1]
 
     @property
     def allowed_namespaces(self) -> List:
         """List of all others allowed namespaces in container without Name:: prefix given by using namespace."""
-        from devana.syntax_abstraction.usingnamespace import UsingNamespace  # pylint: disable=import-outside-toplevel
         allowed = []
-        for c in self.content:
-            if isinstance(c, UsingNamespace):
+        for index in self._content_indexes():
+            for c in index.usings:
                 if c.namespace is not None:
                     allowed += c.namespace.allowed_namespaces # noqa
         if self.namespace is not None:
@@ -0,0 +1,72 @@
+import threading
+from typing import Optional, Any, List, Tuple
+from clang import cindex
+from devana.configuration import ParsingConfiguration
+from devana.syntax_abstraction.organizers.translationunitcache import TranslationUnitCache
+
+
+class ParsingSession:
+    """Shared libclang state used to parse files of one module (or other group of files).
+
+    Creating clang index sets up libclang global state, builtin headers and options parsing, so the index is created
+    once per session and thread (libclang index is not safe to share between threads) and reused for every parsed
+    file."""
+
+    _default: Optional["ParsingSession"] = None
+    _default_lock = threading.Lock()
+
+    def __init__(self):
+        self._local = threading.local()
+
+    @property
+    def index(self) -> cindex.Index:
+        """Clang index of the current thread."""
+        index = getattr(self._local, "index", None)
+        if index is None:
+            index = cindex.Index.create()
+            self._local.index = index
+        return index
+
+    def parse(self, path: str, args: Optional[List[str]] = None,
+              unsaved_files: Optional[List[Tuple[str, str]]] = None, options: int = 0) -> cindex.TranslationUnit:
+        """Parse file using index of the current thread."""
+        return self.index.parse(path, args=args, unsaved_files=unsaved_files, options=options)
+
+    def parse_file(self, path: str, configuration: ParsingConfiguration) -> cindex.TranslationUnit:
+        """Parse file according to configuration. If the translation unit cache is enabled, the file is loaded from
+        cache when possible and stored in cache after parsing otherwise."""
+        args = configuration.parsing_options()
+        options = configuration.parsing_flags()
+        if not configuration.cache.is_enabled:
+            return self.parse(path, args=args, options=options)
+        cache = TranslationUnitCache(configuration.cache)
+        translation_unit = cache.load(self.index, path, args, options)
+        if translation_unit is None:
+            translation_unit = self.parse(path, args=args, options=options)
+            cache.store(translation_unit, path, args, options)
+        return translation_unit
+
+    @classmethod
+    def default(cls) -> "ParsingSession":
+        """Session used by elements not bound to any module."""
+        with cls._default_lock:
+            if cls._default is None:
+                cls._default = cls()
+            return cls._default
+
+    @staticmethod
+    def get_session(this: Any) -> "ParsingSession":
+        """Find session of element by searching its parents. Default session is used if none is found."""
+        while this is not None:
+            session = getattr(this, "session", None)
+            if isinstance(session, ParsingSession):
+                return session
+            this = getattr(this, "parent", None)
+        return ParsingSession.default()
+
+    def __getstate__(self):
+        # indexes are bound to process and thread, so they are created again after unpickling
+        return {}
+
+    def __setstate__(self, state):
+        self._local = threading.local()
@@ -1,14 +1,24 @@
+import hashlib
+import os
+import time
 from pathlib import Path
 from typing import Optional, Union, Literal, List, Any
 from enum import Enum, auto
-import re
 from clang import cindex
+from devana.syntax_abstraction._cursortree import CursorTree, get_file_children
+from devana.syntax_abstraction._cursordispatch import CursorDispatch
+from devana.syntax_abstraction._directives import Directive, get_directives
+from devana.syntax_abstraction._tokenindex import TokenIndex
 from devana.syntax_abstraction.organizers.codecontainer import CodeContainer
+from devana.syntax_abstraction.codelocation import CodeLocation
+from devana.syntax_abstraction.codepiece import CodePiece
 from devana.syntax_abstraction.comment import CommentMarker, Comment, CommentsFactory
 from devana.syntax_abstraction.organizers.lexicon import Lexicon
-from devana.syntax_abstraction.codepiece import CodePiece
+from devana.syntax_abstraction.organizers.parsingsession import ParsingSession
+from devana.syntax_abstraction.organizers.translationunitcache import TranslationUnitCache
+from devana.syntax_abstraction.sourcebuffer import load, read_lines, set_unsaved_text
 from devana.syntax_abstraction.syntax import ISyntaxElement
-from devana.configuration import Configuration, ParsingErrorPolicy
+from devana.configuration import Configuration, ParsingErrorPolicy, StandardLibraryMode
 from devana.utility.lazy import LazyNotInit, lazy_invoke
 from devana.utility.init_params import init_params
 from devana.utility.traits import IFromParamsCreatable
@@ -18,6 +28,8 @@ from devana.utility.errors import ParserError
 class IncludeInfo(ISyntaxElement, IFromParamsCreatable):
     """Include present in file."""
 
+    __slots__ = ("_parent", "_cursor", "_value", "_text", "_is_standard", "_source_file", "_path")
+
     def __init__(self, cursor: Optional[cindex.FileInclusion] = None, parent: Optional[Any] = None):
         self._parent = parent
         self._cursor = cursor
@@ -31,19 +43,12 @@ class IncludeInfo(ISyntaxElement, IFromParamsCreatable):
             self._value = None
             self._is_standard = False
             self._text = ""
-            pattern = r'#\s*include\s*[<"](.+)[">]'
-            file = cursor.source.name
-            with open(file, "r") as f:  # pylint: disable=unspecified-encoding
-                for _ in range(cursor.location.line - 1):
-                    next(f)
-                self._text = f.readline().rstrip()
-            value: Optional = re.search(pattern, self._text)
-            if not value:
+            directive = get_directives(cursor.source.name).at_line(cursor.location.line)
+            if directive is None or directive.include is None:
                 raise ParserError("Wrong include directive (include_next?).")
-            self._value = value.group(1)
+            self._text = directive.text
+            self._value, self._is_standard = directive.include
             self._path = cursor.include.name
-            if "<" in self._text:
-                self._is_standard = True
 
     @classmethod
     @init_params(skip={"parent"})
@@ -112,25 +117,153 @@ class IncludeInfo(ISyntaxElement, IFromParamsCreatable):
     def source_file(self, value):
         self._source_file = value
 
+    @classmethod
+    def from_directive(cls, directive: Directive, path: str, parent: Optional[Any] = None) -> "IncludeInfo":
+        """Create include from directive of file. It is used for includes of translation units, as directives
+        have to be read from the same content as the parsed one, and for includes which are not reported by the
+        backend (for example, because they are provided by precompiled header)."""
+        instance = cls(None, parent)
+        instance._text = directive.text
+        instance._value, instance._is_standard = directive.include
+        instance._path = path
+        instance._source_file = LazyNotInit
+        return instance
+
     @staticmethod
-    def get_includes(translation_unit: cindex.TranslationUnit):
-        includes = []
-        pattern = r'#\s*include\s*[<"](.+)[">]'
-        code_piece = CodePiece(translation_unit.cursor)
-        match = re.findall(pattern, code_piece.text)
-        file_root_path: Path = Path(code_piece.file).parent
-        text_includes = [(file_root_path / Path(inc)).absolute() for inc in match]
+    def get_includes(translation_unit: cindex.TranslationUnit, precompiled: Optional[List[str]] = None,
+                     include_directories: Optional[List[str]] = None, main_file: Optional[str] = None):
+        """Includes of the main file of translation unit (or of the given file included by translation unit) in order
+        of directives.
+
+        The backend does not report inclusions of files which were already included by other headers and of
+        files provided by precompiled header. The former are matched with inclusions from other files, the latter
+        (standard includes listed as precompiled) are resolved using include directories."""
+        if main_file is None:
+            main_file = translation_unit.spelling
+
+            def is_direct(inclusion: cindex.FileInclusion) -> bool:
+                return inclusion.depth == 1
+        else:
+            main_path = os.path.abspath(main_file)
 
+            def is_direct(inclusion: cindex.FileInclusion) -> bool:
+                return inclusion.source is not None and os.path.abspath(inclusion.source.name) == main_path
+        directives = {d.line: d for d in get_directives(main_file, translation_unit).includes}
+        includes = {}
+        inclusions = []
         for inc in translation_unit.get_includes():
-            path_cursor = Path(inc.include.name).absolute()
-            # pylint: disable=cell-var-from-loop
-            result = list(filter(lambda p: p == path_cursor or p.name == path_cursor.name, text_includes))
-            if len(result) != 0:
-                includes.append(IncludeInfo(inc))
-                if len(text_includes) > 0 and len(result) > 0:
-                    text_includes.remove(result[0])
+            if is_direct(inc) and inc.location.line in directives and inc.location.line not in includes:
+                includes[inc.location.line] = IncludeInfo.from_directive(directives[inc.location.line],
+                                                                         inc.include.name)
+            else:
+                inclusions.append(Path(inc.include.name).absolute())
+        file_root_path = Path(main_file).parent
+        for line, directive in directives.items():
+            if line in includes:
+                continue
+            value, is_standard = directive.include
+            path = (file_root_path / value).absolute()
+            result = [p for p in inclusions if p == path or p.name == path.name]
+            if result:
+                includes[line] = IncludeInfo.from_directive(directive, str(result[0]))
+                continue
+            if not is_standard or value not in (precompiled or []):
+                continue
+            for directory in include_directories or []:
+                if os.path.isfile(os.path.join(directory, value)):
+                    includes[line] = IncludeInfo.from_directive(directive, os.path.join(directory, value))
+                    break
+        return [includes[line] for line in sorted(includes)]
+
+
+def _include_directories(options: List[str]) -> List[str]:
+    directories = []
+    for i, option in enumerate(options):
+        for flag in ("-I", "-isystem"):
+            if option == flag and i + 1 < len(options):
+                directories.append(options[i + 1])
+            elif option.startswith(flag) and len(option) > len(flag):
+                directories.append(option[len(flag):])
+    return directories
 
-        return includes
+
+_PARSE_CREATE_PREAMBLE_ON_FIRST_PARSE = 0x100
+"""The CXTranslationUnit_CreatePreambleOnFirstParse flag of libclang, which is not exposed by python bindings. The
+precompiled preamble is created by the first parse instead of the first reparse."""
+
+_REPARSE_OPTIONS = cindex.TranslationUnit.PARSE_PRECOMPILED_PREAMBLE | _PARSE_CREATE_PREAMBLE_ON_FIRST_PARSE
+"""Options of translation units which are parsed again."""
+
+
+class _SourceState:
+    """Content state of the main file of a translation unit at the time of parsing. The content hash is known for
+    unsaved text or if it was computed while parsing (by translation unit cache). Otherwise, it is computed on demand
+    as long as the file is not modified, so files are not read again only to check them."""
+
+    def __init__(self, path: str, mtime: int, size: int, content_hash: Optional[str], *, parse_time: int):
+        self.path = path
+        self.mtime = mtime
+        self.size = size
+        self.hash = content_hash
+        self.parse_time = parse_time
+
+    @staticmethod
+    def hash_text(text: bytes) -> str:
+        return hashlib.sha256(text).hexdigest()
+
+    @classmethod
+    def from_path(cls, path: str, unsaved_text: Optional[str] = None) -> Optional["_SourceState"]:
+        parse_time = time.time_ns()
+        if unsaved_text is not None:
+            return cls(path, -1, -1, cls.hash_text(unsaved_text.encode()), parse_time=parse_time)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        mtime, size = stat.st_mtime_ns, stat.st_size
+        return cls(path, mtime, size, TranslationUnitCache.known_hash(path, mtime, size), parse_time=parse_time)
+
+    def keep_known_hash(self):
+        """Keep hash of the parsed content if it was computed while parsing."""
+        if self.hash is None:
+            self.hash = TranslationUnitCache.known_hash(self.path, self.mtime, self.size)
+
+    def get_hash(self) -> Optional[str]:
+        """Hash of the parsed content. None if it is not known and the file was modified after parsing."""
+        if self.hash is None:
+            try:
+                stat = os.stat(self.path)
+            except OSError:
+                return None
+            if stat.st_mtime_ns == self.mtime and stat.st_size == self.size:
+                self.hash = TranslationUnitCache.file_hash(self.path, stat)
+        return self.hash
+
+    @staticmethod
+    def is_saved(path: str, text: str) -> bool:
+        """Check if text is the content of file on disk."""
+        try:
+            with open(path, "rb") as f:
+                return f.read() == text.encode()
+        except OSError:
+            return False
+
+    def is_changed(self, path: str) -> bool:
+        """Check if file on disk differs from the parsed content. Modified files are compared by hashes, if the hash
+        of the parsed content is known. Files parsed from disk which size was changed are not read."""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return True
+        if stat.st_mtime_ns == self.mtime and stat.st_size == self.size:
+            return False
+        if self.hash is None or (self.size >= 0 and stat.st_size != self.size):
+            return True
+        try:
+            # disk content, not the unsaved text which may be set for the path
+            return self.hash != TranslationUnitCache.file_hash(path, stat)
+        except OSError:
+            return True
 
 
 class SourceFileType(Enum):
@@ -150,6 +283,9 @@ class SourceFileType(Enum):
 class SourceFile(CodeContainer):
     """Information about a specific source code file."""
 
+    __slots__ = ("_source_state", "_is_reparsable", "_is_included", "_source", "_configuration", "_path", "_type",
+                 "_includes", "_header_guard", "_preamble", "_comments_factory")
+
     def __init__(self, source: Optional[Union[cindex.Cursor, str]] = None, parent: Optional[Any] = None,
                  configuration: Optional[Configuration] = None):
         cursor = None
@@ -158,13 +294,19 @@ class SourceFile(CodeContainer):
         else:
             self._configuration = configuration
         self._configuration.validate()
+        self._source_state = None
+        self._is_reparsable = False
+        self._is_included = False
         if source is not None:
             if not isinstance(source, str):
                 cursor = source
             else:
-                import clang  # pylint: disable=import-outside-toplevel
-                index = clang.cindex.Index.create()
-                cursor = index.parse(source, args=self.configuration.parsing.parsing_options()).cursor
+                self._source_state = _SourceState.from_path(source)
+                self._map_content()
+                session = ParsingSession.get_session(parent)
+                cursor = session.parse_file(source, self.configuration.parsing).cursor
+                if self._source_state is not None:
+                    self._source_state.keep_known_hash()
         super().__init__(cursor, parent)
         self._source = source
         self._cursor = cursor
@@ -189,6 +331,9 @@ class SourceFile(CodeContainer):
                 if not self.is_cursor_valid(cursor):
                     raise ParserError("It is not valid cursor kind.")
                 self._path = Path(cursor.spelling)
+                if self._source_state is None and self._path.is_file():
+                    self._source_state = _SourceState.from_path(str(self._path))
+                    self._map_content()
                 self._text_source = LazyNotInit
                 self._includes = LazyNotInit
                 self._type = LazyNotInit
@@ -196,6 +341,17 @@ class SourceFile(CodeContainer):
                 self._comments_factory = CommentsFactory(self)
         self._lexicon = Lexicon.create(self)
 
+    def _map_content(self):
+        # big files are mapped to memory before elements read their text (see ParsingConfiguration.mmap_threshold),
+        # other files are read on demand
+        threshold = self.configuration.parsing.mmap_threshold
+        state = self._source_state
+        if threshold is not None and state is not None and state.size > max(threshold, 0):
+            try:
+                load(state.path, threshold)
+            except OSError:
+                pass
+
     @staticmethod
     def is_cursor_valid(cursor: cindex.Cursor) -> bool:
         return cursor.kind == cindex.CursorKind.TRANSLATION_UNIT
@@ -231,6 +387,21 @@ class SourceFile(CodeContainer):
     def from_path(cls, source: str, parent: Optional[Any] = None, configuration: Optional[Configuration] = None):
         return cls(source, parent, configuration)
 
+    @classmethod
+    def from_translation_unit(cls, translation_unit: cindex.TranslationUnit, path: str, parent: Optional[Any] = None,
+                              configuration: Optional[Configuration] = None) -> "SourceFile":
+        """Create file from translation unit which includes it, for example, from umbrella translation unit of
+        module. Only declarations from the given file are content of the created file, so many files can share one
+        translation unit. Files have to be set as main files of translation unit (see CursorTree.set_main_files).
+        After reparse, the file is parsed as its own translation unit."""
+        instance = cls(translation_unit.cursor, parent, configuration)
+        instance._source = path
+        instance._path = Path(path)
+        instance._source_state = _SourceState.from_path(path)
+        instance._map_content()
+        instance._is_included = True
+        return instance
+
     @property
     @lazy_invoke
     def type(self) -> SourceFileType:
@@ -286,7 +457,14 @@ class SourceFile(CodeContainer):
     @lazy_invoke
     def includes(self) -> List[IncludeInfo]:
         self._includes = []
-        self._includes = IncludeInfo.get_includes(self._cursor.translation_unit)
+        standard_library = self.configuration.parsing.standard_library
+        if standard_library.precompiled_header and standard_library.mode == StandardLibraryMode.DEVANA_CLANG:
+            directories = _include_directories(self.configuration.parsing.parsing_options())
+            self._includes = IncludeInfo.get_includes(self._cursor.translation_unit,
+                                                      standard_library.precompiled_includes, directories,
+                                                      self._main_file)
+        else:
+            self._includes = IncludeInfo.get_includes(self._cursor.translation_unit, main_file=self._main_file)
         return self._includes
 
     @includes.setter
@@ -297,6 +475,7 @@ class SourceFile(CodeContainer):
     @lazy_invoke
     def preamble(self) -> Optional[Comment]:
         """First comment in file - Must start with the first line. Standard comment grouping policies apply. """
+        self.configuration.parsing.require_full_profile("comments")
         self._preamble = None
         if self._comments_factory.comments:
             preamble = self._comments_factory.comments[0]
@@ -312,49 +491,38 @@ class SourceFile(CodeContainer):
     @lazy_invoke
     def header_guard(self) -> Optional[str]:
         self._header_guard = None
-        def_name = None
-        if not self.text_source:
+        if not self.text_source or len(self.content) == 0:
             return self._header_guard
-
-        line_fist_content = -1
-        line_last_content = -1
-        if len(self.content) > 0:
-            line_fist_content = self.content[0].text_source.begin.row
-            line_last_content = self.content[-1].text_source.end.row
-
-        lines = self.text_source.text.split("\n")
-
-        for i, line in enumerate(lines[:line_fist_content]):
-            match = re.match(r"^#ifndef\s(\S+)", line)
-            if not match:
-                continue
-            if len(match.group()) < 1:
-                continue
-            def_name = match.group(1)
-            if line_fist_content > i:
-                match = re.match(r"^#define\s(\S+)", lines[i + 1])
-                if not match:
-                    return self._header_guard
-                if len(match.group()) < 1:
-                    return self._header_guard
-                if match.group(1) != def_name:
-                    return self._header_guard
-                break
-            else:
-                return self._header_guard
-
-        for line in reversed(lines[line_last_content:]):
-            match = re.match(r"^#endif", line)
-            if match:
-                self._header_guard = def_name
-                break
-
+        directives = get_directives(self.path, self.translation_unit)
+        self._header_guard = directives.header_guard(self.content[0].text_source.begin.row,
+                                                     self.content[-1].text_source.end.row)
         return self._header_guard
 
     @header_guard.setter
     def header_guard(self, value):
         self._header_guard = value
 
+    @property
+    @lazy_invoke
+    def text_source(self) -> Optional[CodePiece]:
+        if not self._is_included:
+            return super().text_source
+        # the same range as extent of translation unit - to the beginning of line after the last one
+        lines = read_lines(str(self.path), self.translation_unit)
+        self._text_source = CodePiece.from_location(CodeLocation(1, 1), CodeLocation(len(lines), 1), str(self.path),
+                                                    self.translation_unit)
+        return self._text_source
+
+    @property
+    def _main_file(self) -> Optional[str]:
+        """Path of file if it is not the main file of its translation unit."""
+        return str(self.path) if self._is_included else None
+
+    @property
+    def translation_unit(self) -> Optional[cindex.TranslationUnit]:
+        """Backend translation unit of file. None value mean file not bound to the backend."""
+        return None if self._cursor is None else self._cursor.translation_unit
+
     @property
     def configuration(self) -> Configuration:
         return self._configuration
@@ -366,17 +534,91 @@ class SourceFile(CodeContainer):
     def bind_comment(self, element) -> Optional[Comment]:
         """Function take code element present in this source file and return associated comment
         depending on the configuration. A common use case is when specific instances of code elements use this."""
+        self.configuration.parsing.require_full_profile("comments")
         if not hasattr(element, "text_source"):
             return None
         if self._comments_factory is None:
             return None
         return self._comments_factory.get_upper_comment(element.text_source)
 
+    def is_changed(self, unsaved_text: Optional[str] = None) -> bool:
+        """Check if file was changed since the last parsing. The file is changed if its content (or unsaved_text, if
+        given) differs from the parsed content, or if any of included files was modified after parsing."""
+        if self._source_state is None:
+            return unsaved_text is not None
+        if unsaved_text is not None:
+            return self._source_state.get_hash() != _SourceState.hash_text(unsaved_text.encode())
+        if self._source_state.is_changed(str(self.path)):
+            return True
+        if self._cursor is None:
+            return False
+        for include in self._cursor.translation_unit.get_includes():
+            try:
+                if os.stat(include.include.name).st_mtime_ns > self._source_state.parse_time:
+                    return True
+            except OSError:
+                return True
+        return False
+
+    def reparse(self, unsaved_text: Optional[str] = None) -> bool:
+        """Parse file again if it was changed (see is_changed). If unsaved_text is given, it is parsed instead of
+        the file content from disk and elements of the file read their text from it. Unsaved text is dropped when
+        the file is parsed again without it or when the same text is saved to disk.
+
+        The first reparse creates translation unit with precompiled preamble, so next reparses of the same file
+        skip included headers which were not changed. Content, lexicon entries and other lazy properties of the file
+        are created again, so elements previously taken from this file must not be used anymore.
+        Returns True if file was parsed again."""
+        if self._source is None:
+            raise ValueError("File without source can not be parsed again.")
+        path = str(self.path)
+        if unsaved_text is not None and _SourceState.is_saved(path, unsaved_text):
+            unsaved_text = None
+        if not self.is_changed(unsaved_text):
+            if unsaved_text is None and self.translation_unit is not None:
+                # parsed text was saved, so it is read from disk again
+                set_unsaved_text(self.translation_unit, path, None)
+            return False
+        unsaved_files = None if unsaved_text is None else [(path, unsaved_text)]
+        state = _SourceState.from_path(path, unsaved_text)
+        if self._is_reparsable:
+            translation_unit = self._cursor.translation_unit
+            CursorTree.invalidate(translation_unit)
+            TokenIndex.invalidate(translation_unit)
+            translation_unit.reparse(unsaved_files)
+        else:
+            translation_unit = ParsingSession.get_session(self).parse(
+                path, args=self.configuration.parsing.parsing_options(), unsaved_files=unsaved_files,
+                options=_REPARSE_OPTIONS | self.configuration.parsing.parsing_flags())
+            self._is_reparsable = True
+        set_unsaved_text(translation_unit, path, unsaved_text)
+        self._is_included = False
+        self._source_state = state
+        self._map_content()
+        is_content_created = self._content is not LazyNotInit
+        if self.lexicon is not None:
+            self.lexicon.remove_file(self)
+        self._cursor = translation_unit.cursor
+        self._content = LazyNotInit
+        self._text_source = LazyNotInit
+        self._includes = LazyNotInit
+        self._preamble = LazyNotInit
+        self._header_guard = LazyNotInit
+        self._comments_factory = CommentsFactory(self)
+        if is_content_created:
+            # restore lexicon entries of file content
+            _ = self.content
+        return True
+
     @property
     def diagnostics(self) -> List:
         """Information about backend parsing warnings and errors."""
         if self._cursor is None:
             return []
+        if self._is_included:
+            path = os.path.abspath(str(self.path))
+            return [d for d in self._cursor.translation_unit.diagnostics
+                    if d.location.file is not None and os.path.abspath(d.location.file.name) == path]
         return list(self._cursor.translation_unit.diagnostics)
 
     @property
@@ -399,16 +641,14 @@ class SourceFile(CodeContainer):
 
     def _create_content(self) -> List[Any]:
         """Overwrite this method to filter witch content should be parsed inside class."""
-        types = self._content_types
+        dispatch = CursorDispatch.get_dispatch(type(self), lambda: self._content_types)
         content = []
         config = Configuration.get_configuration(self)
         is_abort_on_error = config.parsing.error_strategy == ParsingErrorPolicy.ABORT
         is_ignore_on_error = config.parsing.error_strategy == ParsingErrorPolicy.IGNORE
-        for children in self._cursor.get_children():
-            if Path(children.location.file.name) != self.path:
-                continue
+        for children in get_file_children(self._cursor.translation_unit, str(self.path)):
             element: Optional = None
-            for t in types:
+            for t in dispatch.candidates(children.kind):
                 try:
                     element = t.from_cursor(children, self)
                     if element is None:
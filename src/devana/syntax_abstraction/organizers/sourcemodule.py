@@ -1,11 +1,54 @@
 import os
+import pickle
 import re
-from typing import Optional, List, Iterable, Any
-from dataclasses import dataclass
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, List, Iterable, Any, Tuple, Dict
+from dataclasses import dataclass, replace
+from clang import cindex
 from devana.syntax_abstraction.organizers.sourcefile import SourceFile
 from devana.syntax_abstraction.organizers.lexicon import Lexicon
+from devana.syntax_abstraction.organizers.parsingsession import ParsingSession
+from devana.syntax_abstraction.organizers.includegraph import IncludeGraph
+from devana.syntax_abstraction._cursortree import CursorTree
+from devana.syntax_abstraction._detached import detach, rebind
 from devana.utility.lazy import LazyNotInit
-from devana.configuration import Configuration
+from devana.utility.errors import ParserError
+from devana.configuration import Configuration, ParsingErrorPolicy
+
+
+def _parse_detached(path: str, configuration: Configuration) -> Tuple[SourceFile, List]:
+    """Worker process entry: parse file and return its complete model without libclang handles."""
+    source_file = SourceFile(path, None, configuration)
+    externals = detach(source_file)
+    return source_file, externals
+
+
+def _compile_command_arguments(command: cindex.CompileCommand, file: str) -> Tuple[str, ...]:
+    """Arguments of compile command which affect parsing: without compiler, source file, output and dependency
+    files options. Relative paths are resolved against the command directory."""
+    arguments = [f"-working-directory={command.directory}"]
+    options_with_value = ("-o", "-MF", "-MT", "-MQ")
+    skipped_options = ("-c", "-MD", "-MMD", "-MP", "--")
+    command_arguments = list(command.arguments)[1:]
+    skip_next = False
+    for argument in command_arguments:
+        if skip_next:
+            skip_next = False
+            continue
+        if argument in options_with_value:
+            skip_next = True
+            continue
+        if argument in skipped_options:
+            continue
+        if os.path.abspath(os.path.join(command.directory, argument)) == file:
+            continue
+        arguments.append(argument)
+    return tuple(arguments)
+
+
+_HEADER_EXTENSIONS = (".h", ".hh", ".hpp", ".hxx", ".h++", ".inl", ".ipp", ".tpp")
+"""Extensions of files included by umbrella translation units."""
 
 
 @dataclass
@@ -20,15 +63,48 @@ class SourceModule:
 
     # pylint: disable=too-many-positional-arguments
     def __init__(self, name: str, root_path: str, module_filter: Optional[ModuleFilter] = None,
-                 parent: Optional[Any] = None, configuration: Optional[Configuration] = None):
+                 parent: Optional[Any] = None, configuration: Optional[Configuration] = None,
+                 jobs: Optional[int] = None, session: Optional[ParsingSession] = None):
         self._path = root_path
         self._module_filter = module_filter
         self._parent = parent
         self._files = LazyNotInit
         self._name = name
         self._lexicon = Lexicon()
+        self._session = ParsingSession() if session is None else session
         self._configuration: Configuration = Configuration() if configuration is None else configuration
         self._configuration.validate()
+        self._jobs = self._configuration.parsing.jobs if jobs is None else jobs
+        if self._jobs < 1:
+            raise ValueError("Number of parsing jobs must be greater than zero.")
+        self._compile_commands: Optional[Dict[str, Tuple[str, ...]]] = None
+        self._file_configurations: Dict[Tuple[str, ...], Configuration] = {}
+        self._include_graph: Optional[IncludeGraph] = None
+
+    @classmethod
+    def from_compilation_database(cls, path: str, name: Optional[str] = None,  # pylint: disable=too-many-arguments
+                                  module_filter: Optional[ModuleFilter] = None, parent: Optional[Any] = None,
+                                  configuration: Optional[Configuration] = None, jobs: Optional[int] = None,
+                                  session: Optional[ParsingSession] = None) -> "SourceModule":
+        """Create module from compilation database (compile_commands.json file or directory containing it).
+        Module contains files listed in the database (limited by module_filter) and each file is parsed with
+        its own compilation arguments added to compiler_commands of configuration. Files with identical
+        arguments share one configuration, so they also share precompiled headers and cache entries."""
+        directory = os.path.dirname(path) if os.path.isfile(path) else path
+        try:
+            database = cindex.CompilationDatabase.fromDirectory(directory)
+        except cindex.CompilationDatabaseError as e:
+            raise ValueError(f"Unable to load compilation database from {directory}.") from e
+        module = cls(os.path.basename(os.path.abspath(directory)) if name is None else name, directory,
+                     module_filter, parent, configuration, jobs, session)
+        module._compile_commands = {}  # pylint: disable=protected-access
+        for command in database.getAllCompileCommands():
+            file = os.path.abspath(os.path.join(command.directory, command.filename))
+            if file not in module._compile_commands:  # pylint: disable=protected-access
+                # the first command is used if file is compiled multiple times
+                arguments = _compile_command_arguments(command, file)
+                module._compile_commands[file] = arguments  # pylint: disable=protected-access
+        return module
 
     @property
     def module_filter(self):
@@ -49,13 +125,121 @@ class SourceModule:
         """Name of module."""
         return self._name
 
+    @property
+    def jobs(self) -> int:
+        """Number of worker processes used to parse files of module."""
+        return self._jobs
+
+    @property
+    def session(self) -> ParsingSession:
+        """Parsing session shared by all files of module."""
+        return self._session
+
     @property
     def files(self) -> Iterable[SourceFile]:
         """List of SourceFile from module."""
         if not self._configuration.parsing.file_by_file_parsing and self._files is not LazyNotInit:
             yield from self._files # noqa
+            return
+
+        paths = list(self._find_paths())
+        if self._configuration.parsing.file_by_file_parsing:
+            if self._jobs > 1:
+                for source_file, externals in self._parse_in_pool(paths):
+                    module = SourceModule(self._name, self._path)
+                    module._attach(source_file, externals)  # pylint: disable=protected-access
+                    yield source_file
+            else:
+                for p in paths:
+                    module = SourceModule(self._name, self._path, session=self._session)
+                    yield SourceFile(p, module, self._configuration_for(p))
+            return
 
         self._files = []
+        order = {os.path.abspath(p): i for i, p in enumerate(paths)}
+        if self._configuration.parsing.umbrella_parsing:
+            headers = [p for p in paths if p.endswith(_HEADER_EXTENSIONS)]
+            paths = [p for p in paths if not p.endswith(_HEADER_EXTENSIONS)]
+            self._files.extend(self._parse_umbrellas(headers))
+        if self._jobs > 1:
+            externals = []
+            for source_file, file_externals in self._parse_in_pool(paths):
+                self._attach(source_file)
+                externals.extend(file_externals)
+            self._link_externals(externals)
+        else:
+            for p in paths:
+                self._files.append(SourceFile(p, self, self._configuration_for(p)))
+        self._files.sort(key=lambda f: order[os.path.abspath(str(f.path))])
+        yield from self._files
+
+    def refresh(self) -> List[SourceFile]:
+        """Update module after changes of files on disk: parse again changed files (see SourceFile.reparse),
+        parse files added to module and remove deleted files. Content of not changed files is kept.
+        Returns list of parsed files."""
+        if self._configuration.parsing.file_by_file_parsing:
+            raise ValueError("Refresh is not available for file by file parsing.")
+        self._include_graph = None
+        if self._files is LazyNotInit:
+            return list(self.files)
+
+        paths = list(self._find_paths())
+        normalized_paths = {os.path.abspath(p): p for p in paths}
+        for source_file in list(self._files):
+            if os.path.abspath(str(source_file.path)) not in normalized_paths:
+                self._lexicon.remove_file(source_file)
+                self._lexicon.sources[:] = [s for s in self._lexicon.sources if s is not source_file]
+                self._files = [f for f in self._files if f is not source_file]
+
+        parsed = [source_file for source_file in self._files if source_file.reparse()]
+        known_paths = {os.path.abspath(str(source_file.path)) for source_file in self._files}
+        for path, p in normalized_paths.items():
+            if path not in known_paths:
+                source_file = SourceFile(p, self, self._configuration_for(p))
+                self._files.append(source_file)
+                parsed.append(source_file)
+        return parsed
+
+    def include_graph(self) -> IncludeGraph:
+        """Graph of includes between files of module and files included by them. Included files are resolved by
+        backend to absolute paths, so files with the same names from different directories are distinguished.
+        Graph is created once and it is created again only after refresh."""
+        if self._include_graph is None:
+            self._include_graph = IncludeGraph((f.path, [i.path for i in f.includes if i.path is not None])
+                                               for f in self.files)
+        return self._include_graph
+
+    def snapshot(self, path: str):
+        """Save fully evaluated module to file. Snapshot can be loaded by load_snapshot without libclang.
+
+        Files of module are parsed again by a copy of module. All lazy properties of the copy are evaluated and all
+        libclang handles are removed from it, so this module is not changed and it can still be refreshed or parsed
+        again. Files are read from disk, so unsaved text of files (see SourceFile.reparse) is not saved."""
+        if self._configuration.parsing.file_by_file_parsing:
+            raise ValueError("Snapshot is not available for file by file parsing.")
+        module = self._copy()
+        list(module.files)
+        detach(module)
+        with open(path, "wb") as f:
+            pickle.dump(module, f, protocol=5)
+
+    @classmethod
+    def load_snapshot(cls, path: str) -> "SourceModule":
+        """Load module saved by snapshot. Loaded module does not use libclang."""
+        with open(path, "rb") as f:
+            module = pickle.load(f)
+        if not isinstance(module, cls):
+            raise ValueError(f"File {path} is not a snapshot of source module.")
+        return module
+
+    def _copy(self) -> "SourceModule":
+        """Not parsed module with the same files and configurations as this one, but with its own session."""
+        module = SourceModule(self._name, self._path, self._module_filter, self._parent, self._configuration,
+                              self._jobs)
+        module._compile_commands = self._compile_commands  # pylint: disable=protected-access
+        return module
+
+    def _find_paths(self) -> Iterable[str]:
         allowed = []
         forbidden = []
         if self._module_filter is not None:
@@ -73,22 +257,106 @@ class SourceModule:
                     return True
             return False
 
-        for r, _, f in os.walk(self.path):
-            for file in f:
-                p = os.path.join(r, file)
-                if is_in_filter_list(p, forbidden):
+        if self._compile_commands is not None:
+            candidates = iter(self._compile_commands)
+        else:
+            candidates = (os.path.join(r, file) for r, _, f in os.walk(self.path) for file in f)
+        for p in candidates:
+            if is_in_filter_list(p, forbidden):
+                continue
+            if allowed:
+                if not is_in_filter_list(p, allowed):
                     continue
-                if allowed:
-                    if not is_in_filter_list(p, allowed):
-                        continue
-                if self._configuration.parsing.file_by_file_parsing:
-                    module = SourceModule(self._name, self._path)
-                    yield SourceFile(p, module, self._configuration)
-                else:
-                    self._files.append(SourceFile(p, self, self._configuration))
+            yield p
+
+    def _configuration_for(self, path: str) -> Configuration:
+        """Configuration used to parse file of module."""
+        if self._compile_commands is None:
+            return self._configuration
+        arguments = self._compile_commands.get(os.path.abspath(path), ())
+        if arguments not in self._file_configurations:
+            parsing = replace(self._configuration.parsing,
+                              compiler_commands=self._configuration.parsing.compiler_commands + list(arguments))
+            self._file_configurations[arguments] = replace(self._configuration, parsing=parsing)
+        return self._file_configurations[arguments]
+
+    def _parse_in_pool(self, paths: List[str]) -> Iterable[Tuple[SourceFile, List]]:
+        configurations = [self._configuration_for(p) for p in paths]
+        with ProcessPoolExecutor(max_workers=self._jobs) as executor:
+            yield from executor.map(_parse_detached, paths, configurations)
+
+    def _parse_umbrellas(self, paths: List[str]) -> List[SourceFile]:
+        """Parse headers by umbrella translation units. Headers with the same configuration are split into shards
+        and each shard is parsed as one translation unit which includes all its headers."""
+        groups: Dict[int, Tuple[Configuration, List[str]]] = {}
+        for p in paths:
+            configuration = self._configuration_for(p)
+            groups.setdefault(id(configuration), (configuration, []))[1].append(p)
+        files = []
+        for configuration, group in groups.values():
+            group.sort()
+            shards = configuration.parsing.umbrella_shards
+            size = -(-len(group) // shards)
+            for begin in range(0, len(group), size):
+                shard = group[begin:begin + size]
+                translation_unit = self._parse_umbrella(shard, configuration, len(files))
+                CursorTree.set_main_files(translation_unit, shard)
+                files.extend(SourceFile.from_translation_unit(translation_unit, p, self, configuration) for p in shard)
+        return files
+
+    def _parse_umbrella(self, paths: List[str], configuration: Configuration, index: int) -> cindex.TranslationUnit:
+        # umbrella file exists only in memory, it is placed in module directory to keep diagnostics readable
+        umbrella = os.path.join(os.path.abspath(self.path), f"__devana_umbrella_{index}.h")
+        text = "".join(f'#include "{Path(os.path.abspath(p)).as_posix()}"\n' for p in paths)
+        return self._session.parse(umbrella, args=configuration.parsing.parsing_options(),
+                                   unsaved_files=[(umbrella, text)], options=configuration.parsing.parsing_flags())
+
+    def _attach(self, source_file: SourceFile, externals: Optional[List] = None):
+        """Bind a detached source file (parsed by worker process) to this module. Only objects of the file are
+        visited. Elements defined again by the file are removed from it, as they are not created by serial parsing
+        (see Lexicon.merge)."""
+        source_file.configuration = self._configuration_for(str(source_file.path))
+        rejected = []
+        replacements = self._lexicon.merge(source_file.lexicon, rejected)
+        for element in rejected:
+            self._reject(element)
+        rebind(source_file, replacements, is_bound=True)
+        source_file.lexicon = self._lexicon
+        source_file.parent = self
+        if self._files is LazyNotInit:
+            self._files = []
+        self._files.append(source_file)
+        if externals:
+            self._link_externals(externals)
+
+    @staticmethod
+    def _reject(element: Any):
+        """Remove element from content of its parent and report it as serial parsing reports content which cannot
+        be created."""
+        content = element.parent.content
+        content[:] = [c for c in content if c is not element]
+        config = Configuration.get_configuration(element.parent)
+        if config.parsing.error_strategy == ParsingErrorPolicy.ABORT:
+            raise ParserError(f"Cannot match any type for content of {element.parent} n cursor {element.name}.")
+        if config.parsing.error_strategy != ParsingErrorPolicy.IGNORE:
+            config.logger.warning("Cannot match any type for content of %s n cursor %s.", element.parent, element.name)
 
-        if not self._configuration.parsing.file_by_file_parsing:
-            yield from self._files
+    def _link_externals(self, externals: List):
+        """Replace types created as external by worker processes with types defined in files of module. Each path
+        is resolved once and files are visited once."""
+        resolved: Dict[Tuple[str, ...], Any] = {}
+        replacements = {}
+        for external, semantic_path in externals:
+            key = tuple(semantic_path)
+            if key not in resolved:
+                try:
+                    # pylint: disable=protected-access
+                    resolved[key] = self._lexicon._find_type_from_path(semantic_path)
+                except ParserError:
+                    resolved[key] = None
+            if resolved[key] is not None:
+                replacements[id(external)] = resolved[key]
+        rebind(self._files, replacements)
 
     @property
     def parent(self):
@@ -0,0 +1,150 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Optional, List, Dict, Tuple
+from clang import cindex
+from devana.configuration import TranslationUnitCacheConfiguration
+
+
+class TranslationUnitCache:
+    """On-disk cache of libclang translation units.
+
+    Each entry is a serialized translation unit (created by TranslationUnit.save) and a manifest. The entry is keyed
+    by the file path, the file content and parsing options. The manifest stores content hashes of all transitively
+    included files, so the entry is treated as stale (and removed) when any of them changes. The least recently used
+    entries are removed when the cache exceeds its maximum size."""
+
+    _ast_suffix = ".ast"
+    _manifest_suffix = ".json"
+    _hashes: Dict[str, Tuple[int, int, str]] = {}
+    """Content hashes of files keyed by absolute path, with modification time and size of the hashed content."""
+
+    def __init__(self, configuration: TranslationUnitCacheConfiguration):
+        self._configuration = configuration
+
+    @property
+    def directory(self) -> Path:
+        return self._configuration.directory
+
+    @classmethod
+    def file_hash(cls, path: str, stat: Optional[os.stat_result] = None) -> str:
+        """SHA-256 of file content. Hashes are kept, so the file is read again only when its modification time or
+        size is changed."""
+        key = os.path.abspath(path)
+        if stat is None:
+            stat = os.stat(key)
+        known = cls._hashes.get(key)
+        if known is not None and known[0] == stat.st_mtime_ns and known[1] == stat.st_size:
+            return known[2]
+        with open(key, "rb") as f:
+            content_hash = hashlib.sha256(f.read()).hexdigest()
+        cls._hashes[key] = (stat.st_mtime_ns, stat.st_size, content_hash)
+        return content_hash
+
+    @classmethod
+    def known_hash(cls, path: str, mtime: int, size: int) -> Optional[str]:
+        """Hash of file content with given modification time and size if it is known, without reading the file."""
+        known = cls._hashes.get(os.path.abspath(path))
+        if known is not None and known[0] == mtime and known[1] == size:
+            return known[2]
+        return None
+
+    @classmethod
+    def _file_record(cls, path: str) -> Dict:
+        stat = os.stat(path)
+        return {"mtime": stat.st_mtime_ns, "size": stat.st_size, "hash": cls.file_hash(path, stat)}
+
+    def key(self, path: str, args: List[str], options: int = 0) -> str:
+        """Cache key of file parsed with given arguments and translation unit options."""
+        digest = hashlib.sha256()
+        digest.update(str(Path(path).absolute()).encode())
+        digest.update(b"\0")
+        digest.update("\0".join(args).encode())
+        digest.update(f"\0{options}\0".encode())
+        digest.update(self.file_hash(path).encode())
+        return digest.hexdigest()
+
+    def _is_valid(self, manifest: Dict) -> bool:
+        for include, record in manifest["includes"].items():
+            try:
+                stat = os.stat(include)
+            except OSError:
+                return False
+            if stat.st_mtime_ns == record["mtime"] and stat.st_size == record["size"]:
+                continue
+            if stat.st_size != record["size"] or self.file_hash(include, stat) != record["hash"]:
+                return False
+        return True
+
+    def _remove(self, key: str):
+        for suffix in (self._ast_suffix, self._manifest_suffix):
+            try:
+                os.remove(self.directory / (key + suffix))
+            except OSError:
+                pass
+
+    def load(self, index: cindex.Index, path: str, args: List[str],
+             options: int = 0) -> Optional[cindex.TranslationUnit]:
+        """Load translation unit from cache. Returns None if there is no valid entry."""
+        key = self.key(path, args, options)
+        ast_path = self.directory / (key + self._ast_suffix)
+        manifest_path = self.directory / (key + self._manifest_suffix)
+        if not ast_path.exists() or not manifest_path.exists():
+            return None
+        try:
+            with open(manifest_path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+            if not self._is_valid(manifest):
+                self._remove(key)
+                return None
+            translation_unit = index.read(str(ast_path))
+        except (OSError, ValueError, KeyError, cindex.TranslationUnitLoadError):
+            self._remove(key)
+            return None
+        # update access time to keep the least recently used order
+        os.utime(ast_path)
+        return translation_unit
+
+    def store(self, translation_unit: cindex.TranslationUnit, path: str, args: List[str], options: int = 0):
+        """Save translation unit to cache. Translation units which libclang refuses to save are skipped."""
+        key = self.key(path, args, options)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        includes = {inc.include.name for inc in translation_unit.get_includes()}
+        try:
+            manifest = {"path": str(Path(path).absolute()),
+                        "includes": {include: self._file_record(include) for include in sorted(includes)}}
+        except OSError:
+            return
+        # entries are written to unique temporary files first, other processes may store the same entry
+        suffix = f".{os.getpid()}.tmp"
+        ast_path = self.directory / (key + self._ast_suffix)
+        manifest_path = self.directory / (key + self._manifest_suffix)
+        try:
+            translation_unit.save(str(ast_path) + suffix)
+        except cindex.TranslationUnitSaveError:
+            return
+        with open(str(manifest_path) + suffix, "w", encoding="utf-8") as f:
+            json.dump(manifest, f)
+        os.replace(str(manifest_path) + suffix, manifest_path)
+        os.replace(str(ast_path) + suffix, ast_path)
+        self.evict()
+
+    def evict(self):
+        """Remove the least recently used entries until cache size fits the limit."""
+        entries = []
+        total_size = 0
+        for ast_path in self.directory.glob("*" + self._ast_suffix):
+            manifest_path = ast_path.with_suffix(self._manifest_suffix)
+            try:
+                stat = os.stat(ast_path)
+                size = stat.st_size + (os.stat(manifest_path).st_size if manifest_path.exists() else 0)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime_ns, size, ast_path.stem))
+            total_size += size
+        for _, size, key in sorted(entries):
+            if total_size <= self._configuration.max_size:
+                break
+            self._remove(key)
+            total_size -= size
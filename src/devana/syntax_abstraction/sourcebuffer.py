@@ -0,0 +1,208 @@
+import mmap
+import os
+import re
+import threading
+from array import array
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, List, Union
+from clang import cindex
+
+
+class TextView:
+    """Fragment of file content. The fragment is not copied and it is decoded to string only when it is needed
+    (by str call), so it can be cheaply passed around, measured or searched by bytes patterns (see data)."""
+
+    __slots__ = ("_data", "_text")
+
+    def __init__(self, data: Union[bytes, memoryview]):
+        self._data = memoryview(data)
+        self._text: Optional[str] = None
+
+    def __str__(self) -> str:
+        if self._text is None:
+            self._text = bytes(self._data).decode()
+        return self._text
+
+    def __bytes__(self) -> bytes:
+        return bytes(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, TextView):
+            return self._data == other._data
+        if isinstance(other, str):
+            return str(self) == other
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(str(self))
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({str(self)!r})"
+
+    @property
+    def data(self) -> memoryview:
+        """Raw content of fragment."""
+        return self._data
+
+
+class _SourceBuffer:
+    """Content of file with its decoded forms, line offsets and values derived from the content (see
+    get_derived), created on demand."""
+
+    def __init__(self, mtime: int, size: int, data: Union[bytes, mmap.mmap]):
+        self.mtime = mtime
+        self.size = size
+        self.data = data
+        self.text: Optional[str] = None
+        self.lines: Optional[List[str]] = None
+        self.derived: Dict[str, Any] = {}
+        self._line_offsets: Optional[array] = None
+
+    @property
+    def line_offsets(self) -> array:
+        """Offsets of first bytes of lines."""
+        if self._line_offsets is None:
+            self._line_offsets = array("L", [0])
+            self._line_offsets.extend(m.end() for m in re.finditer(b"\n", self.data))
+        return self._line_offsets
+
+    def close(self) -> bool:
+        """Close memory map of content. Memory map can not be closed while views of it exist (for example, TextView
+        returned by read_view). Then closing is deferred: the map is closed and unmapped by the last released view,
+        as views hold the only references to it after the buffer is removed from cache. Returns False if closing
+        is deferred."""
+        if isinstance(self.data, mmap.mmap):
+            try:
+                self.data.close()
+            except BufferError:
+                return False
+        return True
+
+
+MAX_CACHED_FILES = 256
+"""Maximum number of files which content is cached. The least recently used files are removed above this limit."""
+
+_buffers: "OrderedDict[str, _SourceBuffer]" = OrderedDict()
+"""Content of files read from disk keyed by absolute path, in order of use. Buffer is valid as long as modification
+time and size of file are not changed."""
+
+_buffers_lock = threading.Lock()
+
+_unsaved_attribute = "_devana_unsaved_sources"
+"""Attribute of translation unit with content of its files parsed from unsaved (in-memory) text."""
+
+
+def _key(path: str) -> str:
+    return os.path.abspath(str(path))
+
+
+def set_unsaved_text(translation_unit: cindex.TranslationUnit, path: str, text: Optional[str]):
+    """Use text as the content of file for elements of translation unit parsed from this text. Elements read their
+    raw text from files, not from the backend, so text of such files has to be taken from the same content. The
+    content is kept by translation unit, so other translation units of the same file read it from disk. None value
+    restores the disk content."""
+    unsaved = getattr(translation_unit, _unsaved_attribute, None)
+    if text is None:
+        if unsaved is not None:
+            unsaved.pop(_key(path), None)
+        return
+    if unsaved is None:
+        unsaved = {}
+        setattr(translation_unit, _unsaved_attribute, unsaved)
+    unsaved[_key(path)] = _SourceBuffer(-1, -1, text.encode())
+
+
+def clear_cache():
+    """Remove content of all files from cache."""
+    with _buffers_lock:
+        for buffer in _buffers.values():
+            buffer.close()
+        _buffers.clear()
+
+
+def _get_buffer(path: str, translation_unit: Optional[cindex.TranslationUnit] = None,
+                mmap_threshold: Optional[int] = None) -> _SourceBuffer:
+    key = _key(path)
+    if translation_unit is not None:
+        unsaved = getattr(translation_unit, _unsaved_attribute, None)
+        if unsaved is not None and key in unsaved:
+            return unsaved[key]
+    stat = os.stat(key)
+    with _buffers_lock:
+        buffer = _buffers.get(key)
+        if buffer is not None and buffer.mtime == stat.st_mtime_ns and buffer.size == stat.st_size:
+            _buffers.move_to_end(key)
+            return buffer
+    with open(key, "rb") as f:
+        if mmap_threshold is not None and stat.st_size > max(mmap_threshold, 0):
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            data = f.read()
+    buffer = _SourceBuffer(stat.st_mtime_ns, stat.st_size, data)
+    with _buffers_lock:
+        removed = [_buffers.pop(key)] if key in _buffers else []
+        _buffers[key] = buffer
+        while len(_buffers) > MAX_CACHED_FILES:
+            removed.append(_buffers.popitem(last=False)[1])
+    for previous in removed:
+        previous.close()
+    return buffer
+
+
+def load(path: str, mmap_threshold: Optional[int] = None) -> Union[bytes, mmap.mmap]:
+    """Raw content of file, as read_bytes. If the file is not cached yet and it is bigger than mmap_threshold (in
+    bytes), it is mapped to memory instead of being read (see ParsingConfiguration.mmap_threshold). It avoids copying
+    huge (for example, generated) headers, only the used fragments are loaded."""
+    return _get_buffer(path, mmap_threshold=mmap_threshold).data
+
+
+def read_bytes(path: str, translation_unit: Optional[cindex.TranslationUnit] = None) -> Union[bytes, mmap.mmap]:
+    """Raw content of file (or unsaved content of file set for translation unit). Raises IOError if file does not
+    exist and no unsaved content is set. Content of mapped files (see load) is returned as read-only memory map
+    which supports slicing, searching and regular expressions like bytes."""
+    return _get_buffer(path, translation_unit).data
+
+
+def read_text(path: str, translation_unit: Optional[cindex.TranslationUnit] = None) -> str:
+    """Decoded content of file with universal newlines."""
+    buffer = _get_buffer(path, translation_unit)
+    if buffer.text is None:
+        buffer.text = bytes(buffer.data).decode().replace("\r\n", "\n").replace("\r", "\n")
+    return buffer.text
+
+
+def read_lines(path: str, translation_unit: Optional[cindex.TranslationUnit] = None) -> List[str]:
+    """Lines of decoded content of file. The returned list is shared and must not be modified."""
+    buffer = _get_buffer(path, translation_unit)
+    if buffer.lines is None:
+        buffer.lines = read_text(path, translation_unit).split("\n")
+    return buffer.lines
+
+
+def get_derived(path: str, name: str, factory: Callable[[], Any],
+                translation_unit: Optional[cindex.TranslationUnit] = None) -> Any:
+    """Value derived from content of file (for example, index of its directives) created by factory on the first
+    use. The value is kept with the content, so it is created again when the content is changed and it is removed
+    from cache together with the content."""
+    buffer = _get_buffer(path, translation_unit)
+    if name not in buffer.derived:
+        buffer.derived[name] = factory()
+    return buffer.derived[name]
+
+
+def offset(path: str, row: int, col: int, translation_unit: Optional[cindex.TranslationUnit] = None) -> int:
+    """Offset of byte on given position (rows and columns are counted from 1, as in libclang locations).
+    Raises ValueError if the position is outside the file."""
+    buffer = _get_buffer(path, translation_unit)
+    line_offsets = buffer.line_offsets
+    if row < 1 or row > len(line_offsets):
+        raise ValueError("Code begin and end extend file size.")
+    return min(line_offsets[row - 1] + col - 1, len(buffer.data))
+
+
+def read_view(path: str, begin: int, end: int, translation_unit: Optional[cindex.TranslationUnit] = None) -> TextView:
+    """View of file content between offsets, without copying it."""
+    return TextView(memoryview(_get_buffer(path, translation_unit).data)[begin:end])
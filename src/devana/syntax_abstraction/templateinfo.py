@@ -2,11 +2,14 @@ import re
 from pathlib import Path
 from typing import Optional, List, Union, Tuple, Any, Iterable
 from clang import cindex
+from devana.syntax_abstraction._tokenindex import get_token_spellings
+from devana.syntax_abstraction._cursortree import get_children
 from devana.syntax_abstraction.codepiece import CodePiece
 from devana.syntax_abstraction.typeexpression import TypeExpression, TypeModification
 from devana.syntax_abstraction.conceptinfo import ConceptUsage
 from devana.syntax_abstraction.organizers.codecontainer import CodeContainer
 from devana.syntax_abstraction.organizers.lexicon import Lexicon
+from devana.syntax_abstraction.organizers.parsingsession import ParsingSession
 from devana.utility.lazy import LazyNotInit, lazy_invoke
 from devana.utility.errors import ParserError
 from devana.utility.traits import IBasicCreatable, ICursorValidate
@@ -18,6 +21,8 @@ from devana.configuration import Configuration
 class GenericTypeParameter(ISyntaxElement):
     """An unresolved generic template parameter, known idiomatically in C++ as T."""
 
+    __slots__ = ("_name", "_parent")
+
     def __init__(self, name: str, parent: Optional = None):
         self._name = name
         self._parent = parent
@@ -36,7 +41,7 @@ class GenericTypeParameter(ISyntaxElement):
             if type_c.get_num_template_arguments() > 0:
                 return None
             if hasattr(cursor, 'get_children'):
-                for c in cursor.get_children():
+                for c in get_children(cursor):
                     if c.kind == cindex.CursorKind.TYPE_REF:
                         return GenericTypeParameter(c.type.spelling, parent)
                     elif c.kind == cindex.CursorKind.TEMPLATE_REF:
@@ -62,8 +67,14 @@ class GenericTypeParameter(ISyntaxElement):
 class TemplateInfo(IBasicCreatable, ICursorValidate, ISyntaxElement):
     """General template syntax information abut template definition."""
 
+    __slots__ = ("_cursor", "_parent", "_lexicon", "_specialisation_values", "_specialisations", "_parameters",
+                 "_is_empty", "_is_variadic", "_requires", "_specialisations_value")
+
     class TemplateParameter(IBasicCreatable, ICursorValidate, ISyntaxElement):
         """A description of the generic component for the type/function claim."""
+
+        __slots__ = ("_cursor", "_parent", "_lexicon", "_specifier", "_name", "_default_value", "_is_variadic")
+
         def __init__(self, cursor: Optional[cindex.Cursor] = None, parent: Optional = None):
             self._cursor = cursor
             self._parent = parent
@@ -271,8 +282,7 @@ class TemplateInfo(IBasicCreatable, ICursorValidate, ISyntaxElement):
         if self.parent is None:
             return self._specialisation_values
 
-        tokens = list(self._cursor.get_tokens())
-        tokens = [t.spelling for t in tokens]
+        tokens = get_token_spellings(self._cursor)
         base_text = "".join(tokens)
         pattern = self.parent.name + r"<(.+)>\("
         match = re.findall(pattern, base_text)
@@ -283,6 +293,8 @@ class TemplateInfo(IBasicCreatable, ICursorValidate, ISyntaxElement):
             text = code_piece.text
             fnc_text = self.parent.text_source.text
             text = text.split(fnc_text)
+            if len(text) < 2:
+                return self._specialisation_values
             function_placeholder = "void ___devana______fooPlaceholderToGetParm("
             for i, arg in enumerate(arguments):
                 function_placeholder += arg + f" a_{i}, "
@@ -292,9 +304,9 @@ class TemplateInfo(IBasicCreatable, ICursorValidate, ISyntaxElement):
             from devana.syntax_abstraction.functioninfo import FunctionInfo  # pylint: disable=import-outside-toplevel
             # pylint: disable=import-outside-toplevel
             from devana.syntax_abstraction.organizers.sourcefile import SourceFile
-            idx = cindex.Index.create()
-            tu = idx.parse('tmp.h', args=Configuration.get_configuration(self).parsing.parsing_options(),
-                           unsaved_files=[('tmp.h', text)], options=0)
+            tu = ParsingSession.get_session(self).parse(
+                'tmp.h', args=Configuration.get_configuration(self).parsing.parsing_options(),
+                unsaved_files=[('tmp.h', text)], options=0)
             file = SourceFile(tu.cursor)
             file.path = Path('tmp.h')  # normally file uses absolute paths, we need to work around
 
@@ -340,6 +352,16 @@ class TemplateInfo(IBasicCreatable, ICursorValidate, ISyntaxElement):
         if self.parent is None:
             return ()
 
+        from devana.syntax_abstraction.functioninfo import FunctionInfo  # pylint: disable=import-outside-toplevel
+        if isinstance(self.parent, FunctionInfo):  # handle overloading functions
+            if self.parent.template.specialisation_values:
+                return ()
+
+        if self._cursor is not None:
+            # specialisations are indexed by lexicon under USR of their primary template
+            self._specialisations = [s for s in self._find_family() if self._is_specialisation(s)]
+            return tuple(self._specialisations)
+
         values = self._lexicon.find_content(self.parent.name)
         if values is None:
             return ()
@@ -347,11 +369,7 @@ class TemplateInfo(IBasicCreatable, ICursorValidate, ISyntaxElement):
         values = filter(lambda v: v.template is not None, values)
         values = filter(lambda v: v.template.specialisation_values, values)
 
-        from devana.syntax_abstraction.functioninfo import FunctionInfo  # pylint: disable=import-outside-toplevel
         if isinstance(self.parent, FunctionInfo):  # handle overloading functions
-            if self.parent.template.specialisation_values:
-                return ()
-
             # find index of generic with names
             for s in values:
                 if len(s.template.specialisation_values) != len(self.parameters):
@@ -401,6 +419,9 @@ class TemplateInfo(IBasicCreatable, ICursorValidate, ISyntaxElement):
         if self._lexicon is None:
             return ()
 
+        if self._cursor is not None:
+            return tuple(f for f in self._find_family() if f.template is not None)
+
         functions = self._lexicon.find_content(self.parent.name)
         if functions is None:
             return ()
@@ -408,12 +429,24 @@ class TemplateInfo(IBasicCreatable, ICursorValidate, ISyntaxElement):
 
         return functions
 
+    @staticmethod
+    def _is_specialisation(element) -> bool:
+        template = element.template
+        if template is None or template._cursor is None:  # pylint: disable=protected-access
+            return False
+        return template._cursor.kind not in (  # pylint: disable=protected-access
+            cindex.CursorKind.FUNCTION_TEMPLATE, cindex.CursorKind.CLASS_TEMPLATE)
+
+    def _find_family(self) -> List:
+        """Primary template of parent and all its specialisations with the same kind as parent."""
+        return [f for f in self._lexicon.find_template_family(self._cursor) if isinstance(f, type(self.parent))]
+
     @property
     @lazy_invoke
     def parameters(self) -> List[TemplateParameter]:
         """Template parameters list."""
         self._parameters = []
-        for c in self._cursor.get_children():
+        for c in get_children(self._cursor):
             try:
                 self._parameters.append(self.TemplateParameter(c, self.parent))
             except ValueError:
@@ -462,7 +495,7 @@ class TemplateInfo(IBasicCreatable, ICursorValidate, ISyntaxElement):
         self._requires = []
 
         def find_concepts(cursor: cindex.Cursor) -> Iterable[cindex.Cursor]:
-            for child in cursor.get_children():
+            for child in get_children(cursor):
                 if child.kind == cindex.CursorKind.CONCEPT_SPECIALIZATION_EXPR:
                     yield child
                 if child.kind in (
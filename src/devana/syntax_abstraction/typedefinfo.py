@@ -15,6 +15,8 @@ from devana.syntax_abstraction.syntax import ISyntaxElement
 class TypedefInfo(IBasicCreatable, ICursorValidate, ISyntaxElement):
     """Class represented typedef declaration."""
 
+    __slots__ = ("_cursor", "_parent", "_lexicon", "_type_info", "_text_source", "_name", "_associated_comment")
+
     def __init__(self, cursor: Optional[cindex.Cursor] = None, parent: Optional[CodeContainer] = None):
         self._cursor = cursor
         self._parent = parent
@@ -54,9 +56,11 @@ class TypedefInfo(IBasicCreatable, ICursorValidate, ISyntaxElement):
     def create_default(cls, parent: Optional = None) -> "TypedefInfo":
         return cls(None, parent)
 
+    cursor_kinds = (cindex.CursorKind.TYPEDEF_DECL,)
+
     @staticmethod
     def is_cursor_valid(cursor: cindex.Cursor) -> bool:
-        return cursor.kind == cindex.CursorKind.TYPEDEF_DECL
+        return cursor.kind in TypedefInfo.cursor_kinds
 
     @property
     @lazy_invoke
@@ -79,6 +83,7 @@ class TypedefInfo(IBasicCreatable, ICursorValidate, ISyntaxElement):
     @name.setter
     def name(self, value):
         self._name = value
+        Lexicon.renamed()
 
     @property
     @lazy_invoke
@@ -1,7 +1,10 @@
-from typing import List, Optional, Union
+from typing import List, Optional, Union, Tuple, Any
 from enum import Enum, auto, IntFlag
 import re
+import weakref
 from clang import cindex
+from devana.syntax_abstraction._tokenindex import get_token_spellings
+from devana.syntax_abstraction._cursortree import get_children
 from devana.syntax_abstraction.codepiece import CodePiece
 from devana.syntax_abstraction.organizers.lexicon import Lexicon
 from devana.syntax_abstraction._external_source import create_external
@@ -12,6 +15,7 @@ from devana.utility.errors import ParserError
 from devana.utility.init_params import init_params
 from devana.syntax_abstraction.syntax import ISyntaxElement
 from devana.code_generation.stubtype import StubType
+from devana.configuration import Configuration
 
 
 class BasicType(Enum):
@@ -60,6 +64,10 @@ class BasicType(Enum):
     def name(self) -> str:  # pylint: disable=function-redefined disable=invalid-overridden-method
         return self.value.name  # pylint: disable=invalid-overridden-method
 
+    def __reduce_ex__(self, protocol):
+        # values are instances of a nested class which cannot be pickled by value, so members are pickled by name
+        return getattr, (type(self), self._name_)  # pylint: disable=no-member
+
     @staticmethod
     def from_cursor(cursor: Union[cindex.Cursor, cindex.Type]):
         try:
@@ -103,6 +111,8 @@ class BasicType(Enum):
 class TypeModification(metaclass=FakeEnum):
     """Possible type modifications like const or being a pointer type."""
 
+    __slots__ = ("_value", "_pointer_order", "_array_order")
+
     class ModificationKind(IntFlag):
         """Internal enum list."""
         NONE = auto()
@@ -381,10 +391,67 @@ class TypeModification(metaclass=FakeEnum):
         return self.value == TypeModification.ModificationKind.NONE
 
 
+class TypeRecord:
+    """Canonical record of type: details, modification, namespaces and template arguments (as records).
+
+    Records are interned - all types with the same details, modification, namespaces and template arguments share
+    one record - so they are compared and hashed by identity. Records keep their own copies of modification and
+    namespaces, so changes of type expressions never change records."""
+
+    __slots__ = ("details", "modification", "namespaces", "template_arguments", "__weakref__")
+
+    _records: "weakref.WeakValueDictionary[Tuple, TypeRecord]" = weakref.WeakValueDictionary()
+
+    def __init__(self, details: Any, modification: TypeModification, namespaces: Tuple[str, ...],
+                 template_arguments: Optional[Tuple["TypeRecord", ...]]):
+        self.details = details
+        self.modification = modification
+        self.namespaces = namespaces
+        self.template_arguments = template_arguments
+
+    def __reduce__(self):
+        # unpickled records are interned again
+        return TypeRecord.intern, (self.details, self.modification, self.namespaces, self.template_arguments)
+
+    @staticmethod
+    def _details_key(details: Any) -> Any:
+        if type(details).__hash__ is None:
+            # elements compared by value, like generic parameters compared by names
+            return type(details), getattr(details, "name", None), getattr(details, "is_variadic", None)
+        return details
+
+    @classmethod
+    def intern(cls, details: Any, modification: TypeModification, namespaces: List[str],
+               template_arguments: Optional[Tuple["TypeRecord", ...]]) -> "TypeRecord":
+        """Find the record of type or create a new one."""
+        array_order = modification.array_order
+        key = (cls._details_key(details), modification.value, modification.pointer_order,
+               None if array_order is None else tuple(array_order), tuple(namespaces), template_arguments)
+        record = cls._records.get(key)
+        if record is None:
+            copy = TypeModification(modification.value)
+            copy._pointer_order = modification.pointer_order  # pylint: disable=protected-access
+            copy._array_order = None if array_order is None else list(array_order)  # pylint: disable=protected-access
+            record = cls(details, copy, tuple(namespaces), template_arguments)
+            cls._records[key] = record
+        return record
+
+    @classmethod
+    def from_expression(cls, expression: "TypeExpression") -> "TypeRecord":
+        """Record of type expression."""
+        template_arguments = expression.template_arguments
+        if template_arguments is not None:
+            template_arguments = tuple(cls.from_expression(a) for a in template_arguments)
+        return cls.intern(expression.details, expression.modification, expression.namespaces, template_arguments)
+
+
 class TypeExpression(IBasicCreatable, ISyntaxElement):
     """Hold information about C++ type usage in common expression, for example, function argument declaration,
     class field, function return value or part of typedef declaration."""
 
+    __slots__ = ("_cursor", "_parent", "_is_input_type", "_lexicon", "_name", "_modification", "_details",
+                 "_text_source", "_namespaces", "_template_arguments", "_base_type_c")
+
     def __init__(self, cursor: Optional[Union[cindex.Cursor, cindex.Type]] = None, parent: Optional = None):
         self._cursor = cursor
         self._parent = parent
@@ -413,7 +480,7 @@ class TypeExpression(IBasicCreatable, ISyntaxElement):
             if not self._is_input_type:
                 if self._cursor.kind == cindex.CursorKind.TYPEDEF_DECL:
                     if self._cursor.type == cindex.TypeKind.ELABORATED:
-                        for children in self._cursor.get_children():
+                        for children in get_children(self._cursor):
                             self._base_type_c = children.underlying_typedef_type
                     else:
                         self._base_type_c = self._cursor.underlying_typedef_type
@@ -532,28 +599,29 @@ class TypeExpression(IBasicCreatable, ISyntaxElement):
     @lazy_invoke
     def modification(self) -> TypeModification:
         """Usages modifications."""
-        self._modification = TypeModification.NONE
+        modification = TypeModification.NONE
 
         if hasattr(self._cursor, "is_mutable_field"):
             if self._cursor.is_mutable_field():
-                self._modification |= TypeModification.MUTABLE
+                modification |= TypeModification.MUTABLE
 
-        if self.text_source is not None and self.text_source.text.find("inline ") != -1:
-            self._modification |= TypeModification.INLINE
+        text = self.text_source.text if self.text_source is not None else None
+        if text is not None and text.find("inline ") != -1:
+            modification |= TypeModification.INLINE
 
         if self._cursor.kind == cindex.CursorKind.VAR_DECL:
-            self._modification |= TypeModification.STATIC
-            if self.text_source is not None and self.text_source.text.find("static ") == -1:
-                self._modification &= ~TypeModification.STATIC
+            modification |= TypeModification.STATIC
+            if text is not None and text.find("static ") == -1:
+                modification &= ~TypeModification.STATIC
         tmp_modification = TypeModification.NONE
         type_c = self._base_type_c
 
         if type_c.kind in (cindex.TypeKind.CONSTANTARRAY, cindex.TypeKind.INCOMPLETEARRAY):
             if type_c.kind == cindex.TypeKind.INCOMPLETEARRAY:
-                self._modification |= TypeModification.ARRAY
+                modification |= TypeModification.ARRAY
             else:
                 order = re.findall(r"\[(.*?)\]", CodePiece(self._cursor).text) # noqa pylint: disable=not-callable
-                self._modification |= TypeModification.ARRAY(order) # noqa pylint: disable=not-callable
+                modification |= TypeModification.ARRAY(order) # noqa pylint: disable=not-callable
             while True:
                 type_c = type_c.get_array_element_type()
                 if type_c.kind not in (cindex.TypeKind.CONSTANTARRAY, cindex.TypeKind.INCOMPLETEARRAY):
@@ -583,12 +651,11 @@ class TypeExpression(IBasicCreatable, ISyntaxElement):
                 type_source = type_c.get_pointee()
 
         if isinstance(self._cursor, cindex.Cursor):
-            is_constinit = list(filter(lambda token: token.spelling == "constinit", self._cursor.get_tokens()))
-            if is_constinit:
+            if "constinit" in get_token_spellings(self._cursor):
                 tmp_modification |= TypeModification.CONSTINIT
 
         if type_source.is_const_qualified():
-            if self.text_source is not None and self.text_source.text.find("constexpr ") != -1:
+            if text is not None and text.find("constexpr ") != -1:
                 tmp_modification |= TypeModification.CONSTEXPR
             else:
                 tmp_modification |= TypeModification.CONST
@@ -596,7 +663,8 @@ class TypeExpression(IBasicCreatable, ISyntaxElement):
         if type_source.is_volatile_qualified():
             tmp_modification |= TypeModification.VOLATILE
 
-        self._modification |= tmp_modification
+        modification |= tmp_modification
+        self._modification = modification
         return self._modification # noqa
 
     @modification.setter
@@ -631,7 +699,7 @@ class TypeExpression(IBasicCreatable, ISyntaxElement):
             else:
                 self._namespaces = self._cursor.spelling.split("::")[:-1]
             return self._namespaces
-        for children in self._cursor.get_children():
+        for children in get_children(self._cursor):
             if children.kind == cindex.CursorKind.NAMESPACE_REF:
                 self._namespaces.append(children.spelling)
             else:
@@ -716,27 +784,28 @@ class TypeExpression(IBasicCreatable, ISyntaxElement):
             self._details = FunctionType(type_c, self.parent)
             return self._details
 
-        self._details = BasicType.from_cursor(type_c)
+        details = BasicType.from_cursor(type_c)
 
         # check template
-        if self._details is None:
+        if details is None:
             from devana.syntax_abstraction.templateinfo import GenericTypeParameter
-            self._details = GenericTypeParameter.from_cursor(type_c, self._cursor, self._lexicon)
+            details = GenericTypeParameter.from_cursor(type_c, self._cursor, self._lexicon)
 
-        if self._details is None:
+        if details is None:
             type_c = type_c.get_declaration()
             # check internal types
             if self.parent is not None:
                 if self.parent.lexicon is not None:  # check current lexicon scope
-                    self._details = self.parent.lexicon.find_type(type_c)
-                if self._details is None:
-                    self._details = self.parent.lexicon.find_type(type_c.spelling, self.namespaces)
+                    details = self.parent.lexicon.find_type(type_c)
+                if details is None:
+                    details = self.parent.lexicon.find_type(type_c.spelling, self.namespaces)
             # check external types
-            if self._details is None:
-                self._details = create_external(type_c)
-            if self._details is None:
+            if details is None:
+                details = create_external(type_c)
+            if details is None:
                 raise ParserError("Unable to parse type.")
 
+        self._details = details
         return self._details
 
     @details.setter
@@ -744,6 +813,16 @@ class TypeExpression(IBasicCreatable, ISyntaxElement):
         self._details = value
         self._name = LazyNotInit
 
+    @property
+    def record(self) -> Optional[TypeRecord]:
+        """Canonical record of the current type, shared by all expressions of the same type, or None if types are not
+        interned (see ParsingConfiguration.intern_types). Records can be compared and hashed by identity. They take
+        namespaces and template arguments into account, so unlike comparison of expressions, std::string and string
+        have different records."""
+        if not Configuration.get_configuration(self).parsing.intern_types:
+            return None
+        return TypeRecord.from_expression(self)
+
     @property
     @lazy_invoke
     def text_source(self) -> Optional[CodePiece]:
@@ -1,5 +1,6 @@
 from typing import Optional, List, Any
 from clang import cindex
+from devana.syntax_abstraction._tokenindex import get_token_spellings
 from devana.syntax_abstraction.organizers.codecontainer import CodeContainer
 from devana.syntax_abstraction.organizers.lexicon import Lexicon
 from devana.syntax_abstraction.classinfo import FieldInfo
@@ -13,6 +14,8 @@ from devana.utility.init_params import init_params
 class UnionInfo(CodeContainer):
     """Named or anonymous union."""
 
+    __slots__ = ("_name", "_is_declaration", "_associated_comment")
+
     def __init__(self, cursor: Optional[cindex.Cursor] = None, parent: Optional[CodeContainer] = None):
         super().__init__(cursor, parent)
         if cursor is None:
@@ -42,18 +45,20 @@ class UnionInfo(CodeContainer):
     ) -> "UnionInfo":
         return cls(None, parent)
 
+    cursor_kinds = (cindex.CursorKind.UNION_DECL,)
+
     @staticmethod
     def is_cursor_valid(cursor: cindex.Cursor) -> bool:
-        return cursor.kind == cindex.CursorKind.UNION_DECL
+        return cursor.kind in UnionInfo.cursor_kinds
 
     @property
     @lazy_invoke
     def name(self) -> Optional[str]:
         """Name of union or None is anonymous."""
-        tokens = list(self._cursor.get_tokens())
+        tokens = get_token_spellings(self._cursor)
         is_set = False
         if len(tokens) >= 2:
-            if tokens[0].spelling == "union" and tokens[1].spelling == "{":
+            if tokens[0] == "union" and tokens[1] == "{":
                 self._name = None
                 is_set = True
         if not is_set:
@@ -65,16 +70,15 @@ class UnionInfo(CodeContainer):
     @name.setter
     def name(self, value):
         self._name = value
+        Lexicon.renamed()
 
     @property
     @lazy_invoke
     def is_declaration(self) -> bool:
         """Determine kind, definition or declaration."""
         self._is_declaration = True
-        for token in self._cursor.get_tokens():
-            if "{" == token.spelling:
-                self._is_declaration = False
-                break
+        if "{" in get_token_spellings(self._cursor):
+            self._is_declaration = False
         return self._is_declaration
 
     @is_declaration.setter
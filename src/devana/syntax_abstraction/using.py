@@ -1,5 +1,6 @@
 from typing import Optional, Union
 from clang import cindex
+from devana.syntax_abstraction._cursortree import get_children
 from devana.syntax_abstraction.codepiece import CodePiece
 from devana.syntax_abstraction.typeexpression import TypeExpression
 from devana.syntax_abstraction.organizers.codecontainer import CodeContainer
@@ -17,6 +18,9 @@ class Using(IFromCursorCreatable, ICursorValidate, IFromParamsCreatable, ISyntax
     """Class represented typedef declaration e.g., using AliasTypeName = const namespace::namespace::Type.
     Using without "=" as using namespace::Type; is not supported."""
 
+    __slots__ = ("_cursor", "_parent", "_lexicon", "_type_info", "_text_source", "_name", "_associated_comment",
+                 "_template")
+
     def __init__(self, cursor: Optional[cindex.Cursor] = None, parent: Optional[CodeContainer] = None):
         self._cursor = cursor
         self._parent = parent
@@ -55,19 +59,18 @@ class Using(IFromCursorCreatable, ICursorValidate, IFromParamsCreatable, ISyntax
     ) -> "Using":
         return cls(None, parent)
 
+    cursor_kinds = (cindex.CursorKind.TYPE_ALIAS_DECL, cindex.CursorKind.TYPE_ALIAS_TEMPLATE_DECL)
+
     @staticmethod
     def is_cursor_valid(cursor: cindex.Cursor) -> bool:
-        return cursor.kind in (
-            cindex.CursorKind.TYPE_ALIAS_DECL,
-            cindex.CursorKind.TYPE_ALIAS_TEMPLATE_DECL
-        )
+        return cursor.kind in Using.cursor_kinds
 
     @property
     @lazy_invoke
     def type_info(self) -> Union[TypeExpression, "ISyntaxElement"]:
         """Type alias can be true type or next typedef."""
         cursor = self._cursor
-        for child in self._cursor.get_children():
+        for child in get_children(self._cursor):
             # template using scenario
             if child.kind == cindex.CursorKind.TYPE_ALIAS_DECL:
                 cursor = child
@@ -85,7 +88,7 @@ class Using(IFromCursorCreatable, ICursorValidate, IFromParamsCreatable, ISyntax
     def name(self) -> str:
         """Typedef alias name."""
         cursor = self._cursor
-        for child in self._cursor.get_children():
+        for child in get_children(self._cursor):
             # template using scenario
             if child.kind == cindex.CursorKind.TYPE_ALIAS_DECL:
                 cursor = child
@@ -97,6 +100,7 @@ class Using(IFromCursorCreatable, ICursorValidate, IFromParamsCreatable, ISyntax
     @name.setter
     def name(self, value):
         self._name = value
+        Lexicon.renamed()
 
     @property
     @lazy_invoke
@@ -1,5 +1,6 @@
 from typing import Optional, List, Union
 from clang import cindex
+from devana.syntax_abstraction._cursortree import get_children
 from devana.syntax_abstraction.codepiece import CodePiece
 from devana.syntax_abstraction.organizers.codecontainer import CodeContainer
 from devana.syntax_abstraction.organizers.lexicon import Lexicon
@@ -13,6 +14,8 @@ from devana.syntax_abstraction.syntax import ISyntaxElement
 class UsingNamespace(IFromCursorCreatable, ICursorValidate, IFromParamsCreatable, ISyntaxElement):
     """Using namespace in scope."""
 
+    __slots__ = ("_cursor", "_parent", "_lexicon", "_namespace", "_namespaces", "_text_source")
+
     def __init__(self, cursor: Optional[cindex.Cursor] = None, parent: Optional[CodeContainer] = None):
         self._cursor = cursor
         self._parent = parent
@@ -50,16 +53,18 @@ class UsingNamespace(IFromCursorCreatable, ICursorValidate, IFromParamsCreatable
     ) -> "UsingNamespace":
         return cls(None, parent)
 
+    cursor_kinds = (cindex.CursorKind.USING_DIRECTIVE,)
+
     @staticmethod
     def is_cursor_valid(cursor: cindex.Cursor) -> bool:
-        return cursor.kind == cindex.CursorKind.USING_DIRECTIVE
+        return cursor.kind in UsingNamespace.cursor_kinds
 
     @property
     @lazy_invoke
     def namespaces(self) -> Union[List[str], List[Lexicon]]:
         self._namespaces = []
         if self._lexicon is None:
-            for children in self._cursor.get_children():
+            for children in get_children(self._cursor):
                 self._namespaces.append(children.spelling)
         else:
             def get_namespaces(children_list: List, container: Lexicon, result: List):
@@ -73,7 +78,7 @@ class UsingNamespace(IFromCursorCreatable, ICursorValidate, IFromParamsCreatable
                 result.append(content[0])
                 return get_namespaces(children_list[1:], content[0], result)
 
-            self._namespaces = get_namespaces(list(self._cursor.get_children()), self.lexicon, [])
+            self._namespaces = get_namespaces(list(get_children(self._cursor)), self.lexicon, [])
         return self._namespaces
 
     @namespaces.setter
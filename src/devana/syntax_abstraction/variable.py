@@ -15,6 +15,8 @@ from devana.syntax_abstraction.syntax import ISyntaxElement
 class Variable(IBasicCreatable, ISyntaxElement):
     """Data about variable used in code"""
 
+    __slots__ = ("_cursor", "_parent", "_lexicon", "_name", "_type", "_text_source", "_default_value")
+
     def __init__(self, cursor: Optional[cindex.Cursor] = None, parent: Optional = None):
         self._cursor = cursor
         self._parent = parent
@@ -62,6 +64,7 @@ class Variable(IBasicCreatable, ISyntaxElement):
     @name.setter
     def name(self, value):
         self._name = value
+        Lexicon.renamed()
 
     @property
     @lazy_invoke
@@ -116,6 +119,8 @@ class Variable(IBasicCreatable, ISyntaxElement):
 class GlobalVariable(Variable, ICursorValidate):
     """Data about global, independent variable used in code (out of class scope)"""
 
+    __slots__ = ("_associated_comment",)
+
     def __init__(self, cursor: Optional[cindex.Cursor] = None, parent: Optional = None):
         super().__init__(cursor, parent)
         if cursor is not None:
@@ -126,9 +131,11 @@ class GlobalVariable(Variable, ICursorValidate):
         else:
             self._associated_comment = LazyNotInit
 
+    cursor_kinds = (cindex.CursorKind.VAR_DECL,)
+
     @staticmethod
     def is_cursor_valid(cursor: cindex.Cursor) -> bool:
-        return cursor.kind == cindex.CursorKind.VAR_DECL
+        return cursor.kind in GlobalVariable.cursor_kinds
 
     @classmethod
     def from_cursor(cls, cursor: cindex.Cursor, parent: Optional = None) -> Optional["GlobalVariable"]:
@@ -3,7 +3,7 @@ Sets of utility classes.
 """
 
 from .lazy import LazyNotInit, lazy_invoke
-from .errors import CodeError, ParserError
+from .errors import CodeError, ParserError, ParsingProfileError
 from .fakeenum import FakeEnum
 from .init_params import init_params
 from .typeregister import register
@@ -4,3 +4,7 @@ class CodeError(ValueError):
 
 class ParserError(CodeError):
     """Parsing error, most commonly due to backend errors or the use of unsupported syntax."""
+
+
+class ParsingProfileError(ValueError):
+    """Requested information is not extracted by the parsing profile in use."""
@@ -5,13 +5,12 @@ class FakeEnum(type):
     def __new__(mcs, name, bases, args):
         result = type.__new__(mcs, name, bases, args)
         result.__enum_source__ = args["enum_source"]
+        result.__enum_names__ = frozenset(e.name for e in args["enum_source"])
         return result
 
     def __getattribute__(cls, item):
-        enum_source = type.__getattribute__(cls, "__enum_source__")
-        available_enums = [e.name for e in list(enum_source)]
-        if item in available_enums:
-            enum = getattr(enum_source, item)
+        if item in type.__getattribute__(cls, "__enum_names__"):
+            enum = getattr(type.__getattribute__(cls, "__enum_source__"), item)
             return cls(enum.value)  # pylint: disable=no-value-for-parameter
         return type.__getattribute__(cls, item)
 
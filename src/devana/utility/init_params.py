@@ -38,7 +38,7 @@ def init_params(skip: Optional[Set[str]] = None) -> Callable:
             excluding properties."""
             if not isinstance(getattr(instance.__class__, name, property()), property):
                 return True
-            return name in instance.__dict__
+            return name in getattr(instance, "__dict__", ())
 
         @wraps(_classmethod)
         def wrapper(*args: Any, **kwargs: Any) -> object:
@@ -10,6 +10,16 @@ class LazyNotInit:
         return cls
 
 
+class LazyError:
+    """The value of property which evaluation failed. It is stored when properties are evaluated eagerly (for
+    example, by detaching model from backend) and lazy_invoke raises the stored error again on access."""
+
+    __slots__ = ("error",)
+
+    def __init__(self, error: Exception):
+        self.error = error
+
+
 def lazy_invoke(func):
     name = f"_{func.__name__}"
 
@@ -18,7 +28,15 @@ def lazy_invoke(func):
         if hasattr(self, name):
             atr = getattr(self, name)
             if atr is not LazyNotInit:
+                if isinstance(atr, LazyError):
+                    raise atr.error.with_traceback(None)
                 return atr
         return func(self)
 
+    wrapper.is_lazy = True
     return wrapper
+
+
+def is_lazy(func) -> bool:
+    """Check if function is a getter created by lazy_invoke."""
+    return getattr(func, "is_lazy", False)
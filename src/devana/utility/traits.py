@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Optional, Tuple
 from clang import cindex
 from devana.syntax_abstraction.syntax import ISyntaxElement
 
@@ -7,6 +7,12 @@ from devana.syntax_abstraction.syntax import ISyntaxElement
 class ICursorValidate(ABC):
     """An interface that specifies that an object can only work with certain types of clang cursors."""
 
+    __slots__ = ()
+
+    cursor_kinds: Optional[Tuple[cindex.CursorKind, ...]] = None
+    """Kinds of cursors which can be valid for the class. They are used to choose candidate types for cursor before
+    is_cursor_valid is called. None means that any kind of cursor can be valid."""
+
     @staticmethod
     @abstractmethod
     def is_cursor_valid(cursor: cindex.Cursor) -> bool:
@@ -16,6 +22,8 @@ class ICursorValidate(ABC):
 class IDefaultCreatable(ABC):
     """The interface of an object that can be created with default sets of values."""
 
+    __slots__ = ()
+
     @classmethod
     @abstractmethod
     def create_default(cls, parent: Optional = None) -> ISyntaxElement:
@@ -26,6 +34,8 @@ class IDefaultCreatable(ABC):
 class IFromCursorCreatable(ABC):
     """The interface of an object that can be created from many clang cursor."""
 
+    __slots__ = ()
+
     @classmethod
     @abstractmethod
     def from_cursor(cls, cursor: cindex.Cursor, parent: Optional = None) -> Optional[ISyntaxElement]:
@@ -36,6 +46,8 @@ class IFromCursorCreatable(ABC):
 class IFromParamsCreatable(ABC):
     """The interface of an object that can be created from many parameters."""
 
+    __slots__ = ()
+
     @classmethod
     @abstractmethod
     def from_params(cls) -> ISyntaxElement:
@@ -45,3 +57,5 @@ class IFromParamsCreatable(ABC):
 
 class IBasicCreatable(IDefaultCreatable, IFromCursorCreatable, IFromParamsCreatable, ABC):
     """An interface that describes a set of constructors for a code element."""
+
+    __slots__ = ()
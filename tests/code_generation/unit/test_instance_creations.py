@@ -181,9 +181,14 @@ class TestInstanceCreations(unittest.TestCase):
         self.assertEqual(my_enum.is_declaration, False)
 
     def test_class_member_creation(self):
-        class_member = ClassMember.from_params(
+        with self.assertRaises(TypeError):
+            ClassMember.from_params(
+                access_specifier=AccessSpecifier.PROTECTED
+            )
+        class_member = FieldInfo.from_params(
             access_specifier=AccessSpecifier.PROTECTED
         )
+        self.assertIsInstance(class_member, ClassMember)
         self.assertEqual(class_member.access_specifier, AccessSpecifier.PROTECTED)
 
     def test_method_creation(self):
@@ -1,3 +1,11 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from typing import Optional
+
+
 def find_by_name(node, text):
     if node.spelling == text:
         return node
@@ -11,3 +19,26 @@ def find_by_name(node, text):
 def stub_lexicon(value):
     from devana.syntax_abstraction.organizers.lexicon import Lexicon
     value.lexicon = Lexicon()
+
+
+class TemporaryFiles:
+    """Temporary directory for tests which modify source files. Directory is removed after the test and can start
+    as a copy of static files."""
+
+    def __init__(self, test_case: unittest.TestCase, source: Optional[str] = None):
+        self._directory = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        test_case.addCleanup(self._directory.cleanup)
+        self.root = self._directory.name
+        if source is not None:
+            shutil.copytree(source, self.root, dirs_exist_ok=True)
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.root, name)
+
+    def write(self, name: str, text: str, modification: bool = False):
+        path = self.path(name)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+        if modification:
+            # make sure that modification is visible even on file systems with coarse time resolution
+            os.utime(path, ns=(time.time_ns() + 10 ** 9, time.time_ns() + 10 ** 9))
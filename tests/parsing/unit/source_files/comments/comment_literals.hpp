@@ -0,0 +1,11 @@
+const char* url = "http://x/*y*/";
+int n = 1'000; // after number
+char c = '"'; /* block */ // line
+auto r = R"d(// not /* comment )d";
+// a
+// b
+void f();
+/* multi
+   line */
+int g();
+/* unterminated
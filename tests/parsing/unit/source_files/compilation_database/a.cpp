@@ -0,0 +1,6 @@
+#include "common.hpp"
+#ifdef VARIANT_A
+struct VariantA { Common c; };
+#else
+struct VariantB { Common c; };
+#endif
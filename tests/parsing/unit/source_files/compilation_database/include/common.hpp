@@ -0,0 +1 @@
+struct Common { int x; };
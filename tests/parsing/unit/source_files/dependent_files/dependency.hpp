@@ -0,0 +1 @@
+struct A { int x; };
@@ -0,0 +1,2 @@
+#include "dependency.hpp"
+struct Source { A a; };
@@ -0,0 +1,10 @@
+#pragma once
+/*
+#include "commented.hpp"
+*/
+#ifndef GUARD
+  #  define GUARD 1
+const char* text = "#include <fake>";
+#include "a.hpp" // "b.hpp"
+#include <vector>
+#endif
@@ -0,0 +1,2 @@
+#include "b.hpp"
+#include "detail/c.hpp"
@@ -0,0 +1 @@
+struct Other { int y; };
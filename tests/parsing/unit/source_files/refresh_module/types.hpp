@@ -0,0 +1 @@
+namespace types { struct A { int x; }; }
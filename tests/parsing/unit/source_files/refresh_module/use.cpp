@@ -0,0 +1,2 @@
+#include "types.hpp"
+types::A a;
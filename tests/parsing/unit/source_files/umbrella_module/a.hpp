@@ -0,0 +1,4 @@
+#pragma once
+#include "base.hpp"
+struct A : Base { int y; };
+void f(A a);
@@ -0,0 +1,6 @@
+#ifndef B_HPP
+#define B_HPP
+#include "base.hpp"
+#include "a.hpp"
+namespace n { struct B { A a; }; }
+#endif
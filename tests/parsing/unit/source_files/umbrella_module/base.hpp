@@ -0,0 +1,3 @@
+#pragma once
+// Base comment
+struct Base { int x; };
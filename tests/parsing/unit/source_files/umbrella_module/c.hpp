@@ -0,0 +1,2 @@
+#pragma once
+unknown_type c;
@@ -0,0 +1,2 @@
+#include "b.hpp"
+n::B b;
@@ -165,6 +165,17 @@ class TestAttributesDeclarationParser(unittest.TestCase):
         self.assertEqual(None, element.attributes[0].attributes[0].namespace)
         self.assertEqual("nodiscard", element.attributes[0].attributes[0].name)
 
+    def test_attributes_created_for_scope(self):
+        first: FunctionInfo = self.file.content[0]
+        second: FunctionInfo = self.file.content[1]
+        self.assertEqual(1, len(first.attributes))
+        self.assertIsInstance(second._attributes, list)  # pylint: disable=protected-access
+        self.assertEqual(3, len(second.attributes))
+        self.assertIs(second.attributes[0].parent, second)
+        element: FunctionInfo = self.file.content[2]
+        self.assertEqual([1, 0, 2], [len(argument.attributes) for argument in element.arguments])
+        self.assertIsNone(element.arguments[2].attributes[0].parent)
+
     def test_attribute_function_args(self):
         element: FunctionInfo = self.file.content[2]
         self.assertEqual(3, len(element.arguments))
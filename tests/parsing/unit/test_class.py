@@ -850,6 +850,18 @@ class TestClassTemplatePartial(unittest.TestCase):
         self.assertTrue(result.template.specialisation_values[2].modification.is_pointer)
 
 
+    def test_specialisations_index(self):
+        file = SourceFile.from_cursor(self.cursor)
+        classes = [c for c in file.content if isinstance(c, ClassInfo) and c.name == "template_struct"]
+        self.assertEqual(len(classes), 4)
+        base = classes[0]
+        self.assertEqual(base.template.specialisations, tuple(classes[1:]))
+        self.assertEqual(base.template.specialisations_family, tuple(classes))
+        self.assertEqual(classes[3].template.specialisations, tuple(classes[1:]))
+        other = [c for c in file.content if isinstance(c, ClassInfo) and c.name == "multiple_types"]
+        self.assertEqual(other[0].template.specialisations, (other[1],))
+
+
 class TestClassLexicon(unittest.TestCase):
 
     def setUp(self):
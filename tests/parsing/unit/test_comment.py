@@ -122,6 +122,29 @@ class TestComment(unittest.TestCase):
         self.assertEqual(comment.text[0], "test 9")
 
 
+class TestCommentFactoryLiterals(unittest.TestCase):
+
+    def setUp(self):
+        self.source_file = SourceFile(os.path.dirname(__file__) + r"/source_files/comments/comment_literals.hpp")
+        self.comments_factory = CommentsFactory(self.source_file)
+
+    def test_comments_outside_literals(self):
+        comments = self.comments_factory.comments
+        self.assertEqual([c.text for c in comments],
+                         [[" after number"], [" block "], [" line"], [" a"], [" b"], [" multi", "   line "]])
+        self.assertEqual([c.marker for c in comments],
+                         [CommentMarker.ONE_LINE, CommentMarker.MULTI_LINE, CommentMarker.ONE_LINE,
+                          CommentMarker.ONE_LINE, CommentMarker.ONE_LINE, CommentMarker.MULTI_LINE])
+
+    def test_accumulated_comment(self):
+        function = self.source_file.content[4]
+        comment = self.comments_factory.get_upper_comment(function.text_source)
+        self.assertEqual(comment.text, [" a", " b"])
+        self.assertIs(self.comments_factory.get_upper_comment(function.text_source), comment)
+        self.assertEqual(self.source_file.content[5].associated_comment.text, [" multi", "   line "])
+        self.assertIsNone(self.comments_factory.get_upper_comment(self.source_file.content[1].text_source))
+
+
 class TestCommentFactoryAssigned(unittest.TestCase):
 
     def setUp(self):
@@ -128,6 +128,17 @@ class TestDeclarationDefinition(unittest.TestCase):
             self.assertEqual(declaration.definition, definition)
             self.assertEqual(definition.definition, definition)
 
+    def test_declaration_link_to_definition_by_usr(self):
+        lexicon = self.file.lexicon
+        # register all elements of lexicon
+        self.assertIs(lexicon.find_cursor(self.cursor), self.file)
+        for declaration, definition in ((0, 6), (1, 7), (2, 8), (5, 11)):
+            with self.subTest(self.file.content[definition].name):
+                cursor = self.file.content[declaration]._cursor  # pylint: disable=protected-access
+                self.assertIs(lexicon._find_registered_type(cursor),  # pylint: disable=protected-access
+                              self.file.content[definition])
+                self.assertIs(lexicon.find_type(cursor), self.file.content[definition])
+
     def test_class_declaration_namespace_str(self):
         declaration = self.file.content[19].content[0]
         self.assertEqual(declaration.namespaces, [])
@@ -1,6 +1,10 @@
 import unittest
 import os
 import sys
+import tempfile
+from pathlib import Path
+from unittest import mock
+from devana.configuration import Configuration, LanguageStandard, StandardLibraryMode, StandardLibraryConfiguration
 from devana.syntax_abstraction.organizers.sourcemodule import SourceFile
 from devana.syntax_abstraction.classinfo import ClassInfo, FieldInfo, MethodInfo, AccessSpecifier
 from devana.syntax_abstraction.typeexpression import BasicType, TypeExpression
@@ -13,6 +17,12 @@ class TestParsingStandardLibrary(unittest.TestCase):
         module_path = os.path.dirname(__file__) + r"/source_files/std_lib.hpp"
         self.file = SourceFile(module_path)
 
+    def test_includes(self):
+        self.assertEqual([include.value for include in self.file.includes], ["vector", "string", "memory"])
+        self.assertTrue(all(include.is_standard for include in self.file.includes))
+        self.assertEqual(Path(self.file.includes[0].path).name, "vector")
+        self.assertEqual(self.file.includes[1].text, "#include <string>")
+
     def test_simple_field(self):
         c: ClassInfo = self.file.content[1]
         with self.subTest("string"):
@@ -132,3 +142,52 @@ class TestParsingStandardLibrary(unittest.TestCase):
         self.assertEqual(len(c.inheritance.type_parents[0].template_arguments), 1)
         self.assertEqual(c.inheritance.type_parents[0].template_arguments[0].name, "TestTemplateInheritance")
         self.assertEqual(c.inheritance.type_parents[0].template_arguments[0].details, c)
+
+
+@unittest.skipIf(sys.platform == "darwin", "MacOS need manual std configuration")
+class TestParsingStandardLibraryPrecompiled(TestParsingStandardLibrary):
+    """The same as TestParsingStandardLibrary, but std lib is provided by precompiled header."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.cache = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.cache.cleanup()
+
+    def setUp(self):
+        module_path = os.path.dirname(__file__) + r"/source_files/std_lib.hpp"
+        self.configuration = Configuration()
+        self.configuration.parsing.standard_library.mode = StandardLibraryMode.DEVANA_CLANG
+        self.configuration.parsing.standard_library.precompiled_header = True
+        self.configuration.parsing.standard_library.precompiled_cache = Path(self.cache.name)
+        self.file = SourceFile(module_path, configuration=self.configuration)
+
+    def test_precompiled_header_options(self):
+        options = self.configuration.parsing.parsing_options()
+        self.assertIn("-include-pch", options)
+        path = Path(options[options.index("-include-pch") + 1])
+        self.assertTrue(path.exists())
+        self.assertEqual(path.parent, Path(self.cache.name))
+        with self.subTest("built once per standard"):
+            self.assertEqual(self.configuration.parsing.parsing_options(), options)
+            self.assertEqual(len(list(Path(self.cache.name).glob("*.pch"))), 1)
+        with self.subTest("path is resolved once"):
+            with mock.patch.object(StandardLibraryConfiguration, "_precompiled_header_path") as build:
+                self.configuration.parsing.parsing_options()
+                build.assert_not_called()
+        with self.subTest("header per compiler commands"):
+            self.configuration.parsing.compiler_commands = ["-DDEVANA_TEST"]
+            other_options = self.configuration.parsing.parsing_options()
+            self.assertNotEqual(other_options[other_options.index("-include-pch") + 1],
+                                options[options.index("-include-pch") + 1])
+            self.assertEqual(len(list(Path(self.cache.name).glob("*.pch"))), 2)
+        with self.subTest("no precompiled header for C"):
+            self.configuration.parsing.language_version = LanguageStandard.C_11
+            self.assertNotIn("-include-pch", self.configuration.parsing.parsing_options())
+
+    def test_precompiled_header_requires_devana_clang(self):
+        self.configuration.parsing.standard_library.mode = StandardLibraryMode.PLATFORM
+        with self.assertRaises(ValueError):
+            self.configuration.validate()
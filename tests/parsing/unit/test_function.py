@@ -403,6 +403,20 @@ class TestFunctionsOverload(unittest.TestCase):
         self.assertEqual(base.overloading[1], self.file.content[2])
         self.assertEqual(base.overloading[2], self.file.content[3])
 
+    def test_overload_index(self):
+        base: FunctionInfo = self.file.content[4]
+        family = base.overloading_family
+        index = self.file.lexicon._overloads[base.name]  # pylint: disable=protected-access
+        self.assertEqual(self.file.content[2].overloading_family, family)
+        self.assertEqual(self.file.content[2].overloading, (family[0], family[1], family[3]))
+        self.assertIs(self.file.lexicon._overloads[base.name], index)  # pylint: disable=protected-access
+
+        other = SourceFile(clang.cindex.Index.create().parse(
+            os.path.dirname(__file__) + r"/source_files/overload.hpp").cursor)
+        self.file.lexicon.append_content(other.content[1])
+        self.assertEqual(base.overloading_family, family)
+        self.assertIsNot(self.file.lexicon._overloads[base.name], index)  # pylint: disable=protected-access
+
     def test_bad_overload(self):
         base: FunctionInfo = self.file.content[5]
         with self.assertRaises(CodeError):
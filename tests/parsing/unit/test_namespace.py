@@ -213,3 +213,17 @@ class TestNamespacesLexicon(unittest.TestCase):
         self.assertEqual(class_info.inheritance.type_parents[0].type, expected_from_namespace)
         class_info: ClassInfo = self.file.content[14]
         self.assertEqual(class_info.inheritance.type_parents[0].type, expected_from_namespace_deeper)
+
+
+class TestNamespacesLexiconRegisteredCursors(TestNamespacesLexicon):
+    """The same checks for types resolved by cursors of already registered elements."""
+
+    def setUp(self):
+        super().setUp()
+        self.assertIs(self.file.lexicon.find_cursor(self.cursor), self.file)
+
+    def test_find_cursor(self):
+        for element in self.file.content:
+            self.assertIs(self.file.lexicon.find_cursor(element._cursor), element)  # pylint: disable=protected-access
+        nested = self.file.content[0].content[1].content[0]
+        self.assertIs(self.file.lexicon.find_cursor(nested._cursor), nested)  # pylint: disable=protected-access
@@ -0,0 +1,107 @@
+import mmap
+import os
+import time
+import unittest
+import weakref
+from pathlib import Path
+from types import SimpleNamespace
+from devana.syntax_abstraction import sourcebuffer
+
+
+class TestSourceBuffer(unittest.TestCase):
+
+    def setUp(self):
+        import tempfile  # pylint: disable=import-outside-toplevel
+        self.directory = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.path = Path(self.directory.name) / "file.hpp"
+        self.path.write_bytes(b"struct A {};\r\nstruct B {};\n")
+
+    def tearDown(self):
+        sourcebuffer.clear_cache()
+        self.directory.cleanup()
+
+    def test_cached_content(self):
+        self.assertEqual(sourcebuffer.read_bytes(self.path), b"struct A {};\r\nstruct B {};\n")
+        self.assertIs(sourcebuffer.read_bytes(self.path), sourcebuffer.read_bytes(self.path))
+        self.assertEqual(sourcebuffer.read_text(self.path), "struct A {};\nstruct B {};\n")
+        self.assertIs(sourcebuffer.read_text(self.path), sourcebuffer.read_text(self.path))
+        self.assertEqual(sourcebuffer.read_lines(self.path), ["struct A {};", "struct B {};", ""])
+
+    def test_changed_file(self):
+        self.assertEqual(sourcebuffer.read_text(self.path), "struct A {};\nstruct B {};\n")
+        self.path.write_bytes(b"struct C {};\n")
+        os.utime(self.path, ns=(time.time_ns() + 10 ** 9, time.time_ns() + 10 ** 9))
+        self.assertEqual(sourcebuffer.read_text(self.path), "struct C {};\n")
+        self.assertEqual(sourcebuffer.read_lines(self.path), ["struct C {};", ""])
+
+    def test_unsaved_text(self):
+        translation_unit = SimpleNamespace()
+        sourcebuffer.set_unsaved_text(translation_unit, self.path, "struct D {};")
+        self.assertEqual(sourcebuffer.read_bytes(self.path, translation_unit), b"struct D {};")
+        self.assertEqual(sourcebuffer.read_lines(self.path, translation_unit), ["struct D {};"])
+        self.assertEqual(sourcebuffer.read_lines(self.path), ["struct A {};", "struct B {};", ""])
+        self.assertEqual(sourcebuffer.read_lines(self.path, SimpleNamespace()), ["struct A {};", "struct B {};", ""])
+        sourcebuffer.set_unsaved_text(translation_unit, self.path, None)
+        self.assertEqual(sourcebuffer.read_lines(self.path, translation_unit), ["struct A {};", "struct B {};", ""])
+
+    def test_mmap(self):
+        content = sourcebuffer.load(self.path, 8)
+        self.assertIsInstance(content, mmap.mmap)
+        self.assertIs(sourcebuffer.read_bytes(self.path), content)
+        self.assertEqual(content[7:12], b"A {};")
+        self.assertEqual(sourcebuffer.read_text(self.path), "struct A {};\nstruct B {};\n")
+
+    def test_mmap_threshold_configuration(self):
+        from devana.configuration import Configuration  # pylint: disable=import-outside-toplevel
+        from devana.syntax_abstraction.organizers.sourcefile import SourceFile  # pylint: disable=import-outside-toplevel
+        configuration = Configuration()
+        configuration.parsing.mmap_threshold = 8
+        source = SourceFile(str(self.path), configuration=configuration)
+        self.assertIsInstance(sourcebuffer.read_bytes(self.path), mmap.mmap)
+        self.assertEqual([c.name for c in source.content], ["A", "B"])
+        self.assertEqual(source.content[1].text_source.text, "struct B {}")
+
+    def test_mmap_deferred_close(self):
+        content = weakref.ref(sourcebuffer.load(self.path, 8))
+        view = sourcebuffer.read_view(self.path, 0, 8)
+        sourcebuffer.clear_cache()
+        self.assertEqual(view, "struct A")
+        self.assertFalse(content().closed)
+        del view
+        self.assertIsNone(content())
+
+    def test_bounded_cache(self):
+        paths = [Path(self.directory.name) / f"file_{i}.hpp" for i in range(sourcebuffer.MAX_CACHED_FILES + 1)]
+        for path in paths:
+            path.write_bytes(b"struct A {};")
+        text = sourcebuffer.read_text(paths[0])
+        for path in paths[1:]:
+            sourcebuffer.read_text(path)
+        self.assertIs(sourcebuffer.read_text(paths[-1]), sourcebuffer.read_text(paths[-1]))
+        self.assertIsNot(sourcebuffer.read_text(paths[0]), text)
+
+    def test_derived(self):
+        index = sourcebuffer.get_derived(self.path, "test", object)
+        self.assertIs(sourcebuffer.get_derived(self.path, "test", object), index)
+        sourcebuffer.clear_cache()
+        self.assertIsNot(sourcebuffer.get_derived(self.path, "test", object), index)
+
+    def test_text_view(self):
+        begin = sourcebuffer.offset(self.path, 2, 1)
+        end = sourcebuffer.offset(self.path, 2, 9)
+        view = sourcebuffer.read_view(self.path, begin, end)
+        self.assertIsInstance(view, sourcebuffer.TextView)
+        self.assertEqual(len(view), 8)
+        self.assertEqual(bytes(view.data), b"struct B")
+        self.assertEqual(view, "struct B")
+        self.assertEqual(str(view), "struct B")
+        with self.assertRaises(ValueError):
+            sourcebuffer.offset(self.path, 10, 1)
+
+    def test_code_piece_from_location(self):
+        from devana.syntax_abstraction.codepiece import CodePiece  # pylint: disable=import-outside-toplevel
+        from devana.syntax_abstraction.codelocation import CodeLocation  # pylint: disable=import-outside-toplevel
+        piece = CodePiece.from_location(CodeLocation(1, 8), CodeLocation(2, 8), str(self.path))
+        self.assertEqual(piece.text, "A {};\r\nstruct B")
+        piece = CodePiece.from_location(CodeLocation(2, 1), CodeLocation(2, 12), str(self.path))
+        self.assertEqual(piece.text, "struct B {};")
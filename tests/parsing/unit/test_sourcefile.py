@@ -1,11 +1,25 @@
+import hashlib
 import os
 import sys
+import time
 import unittest
+from unittest import mock
 from pathlib import Path
 import clang.cindex
 import clang
+from devana.configuration import Configuration, ParsingProfile
+from devana.syntax_abstraction._cursordispatch import CursorDispatch
+from devana.syntax_abstraction._cursortree import CursorTree, get_children
+from devana.syntax_abstraction._detached import detach, _children
+from devana.syntax_abstraction._directives import get_directives
+from devana.syntax_abstraction._tokenindex import TokenIndex, get_token_spellings
+from devana.syntax_abstraction.functioninfo import FunctionInfo
+from devana.syntax_abstraction.organizers.codecontainer import CodeContainer
 from devana.syntax_abstraction.organizers.sourcefile import SourceFile, SourceFileType
+from devana.syntax_abstraction.syntax import ISyntaxElement
 from devana.syntax_abstraction.classinfo import *
+from devana.utility.errors import ParsingProfileError
+from tests.helpers import TemporaryFiles
 
 
 class TestSourceFile(unittest.TestCase):
@@ -144,3 +158,359 @@ class TestSourceFile(unittest.TestCase):
         file = SourceFile(os.path.dirname(__file__) + r"/source_files/complex_includes/include_4.hpp")
         self.assertEqual(len(file.includes), 1)
         self.assertEqual(file.includes[0].value, "subdir/subinc.hpp")
+
+
+class TestSourceFileDirectives(unittest.TestCase):
+
+    def setUp(self):
+        self.path = os.path.dirname(__file__) + r"/source_files/directives.hpp"
+
+    def test_directives(self):
+        index = get_directives(self.path)
+        self.assertIs(get_directives(self.path), index)
+        self.assertEqual([(d.name, d.line) for d in index.directives],
+                         [("pragma", 1), ("ifndef", 5), ("define", 6), ("include", 8), ("include", 9), ("endif", 10)])
+        self.assertEqual(index.pragma_once.line, 1)
+        self.assertEqual([d.include for d in index.includes], [("a.hpp", False), ("vector", True)])
+        self.assertEqual(index.header_guard(7, 7), "GUARD")
+        self.assertIsNone(index.header_guard(4, 7))
+        self.assertEqual(index.at_line(8).text, '#include "a.hpp" // "b.hpp"')
+
+
+class TestSourceFileCursorTree(unittest.TestCase):
+
+    def setUp(self):
+        self.file = SourceFile(os.path.dirname(__file__) + r"/source_files/advanced_class.hpp")
+
+    def test_recorded_children(self):
+        tree = CursorTree.get_tree(self.file._cursor.translation_unit)
+        stack = [c for c in get_children(self.file._cursor)  # pylint: disable=protected-access
+                 if c.location.file is not None and Path(c.location.file.name) == self.file.path]
+        self.assertGreater(len(stack), 0)
+        while stack:
+            cursor = stack.pop()
+            recorded = tree.children(cursor)
+            self.assertIsNotNone(recorded)
+            expected = list(cursor.get_children())
+            self.assertEqual([(c.kind, c.spelling) for c in recorded], [(c.kind, c.spelling) for c in expected])
+            stack.extend(recorded)
+        self.assertIs(CursorTree.get_tree(self.file._cursor.translation_unit), tree)
+
+
+class TestSourceFileSlots(unittest.TestCase):
+
+    def setUp(self):
+        self.file = SourceFile(os.path.dirname(__file__) + r"/source_files/advanced_class.hpp")
+
+    def test_elements_without_dict(self):
+        detach(self.file)
+        stack = [self.file]
+        visited = set()
+        while stack:
+            value = stack.pop()
+            if id(value) in visited:
+                continue
+            visited.add(id(value))
+            if isinstance(value, ISyntaxElement):
+                self.assertFalse(hasattr(value, "__dict__"), type(value).__name__)
+            stack.extend(_children(value))
+        self.assertGreater(len(visited), 1)
+
+
+class TestSourceFileTokenIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.file = SourceFile(os.path.dirname(__file__) + r"/source_files/simple_functions.hpp")
+
+    def test_token_spellings(self):
+        translation_unit = self.file._cursor.translation_unit  # pylint: disable=protected-access
+        cursors = [c for c in translation_unit.cursor.walk_preorder()
+                   if c.location.file is not None and Path(c.location.file.name) == self.file.path]
+        self.assertGreater(len(cursors), 0)
+        for cursor in cursors:
+            self.assertEqual(get_token_spellings(cursor), [t.spelling for t in cursor.get_tokens()])
+        index = TokenIndex.get_index(translation_unit, translation_unit.spelling)
+        self.assertEqual(len(index), len(list(translation_unit.get_tokens(extent=translation_unit.cursor.extent))))
+
+
+class TestSourceFileLexiconIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.file = SourceFile(os.path.dirname(__file__) + r"/source_files/using_namespace.hpp")
+
+    def test_find_content(self):
+        lexicon = self.file.lexicon
+        for name in ("foo", "fnc1", "fnc2", "fnc3", "bar", "unknown"):
+            expected = [c for c in lexicon.content if hasattr(c, "name") and c.name == name]
+            result = lexicon.find_content(name)
+            if expected:
+                self.assertEqual(len(result), len(expected))
+                for r, e in zip(result, expected):
+                    self.assertIs(r, e)
+        self.assertIs(lexicon.find_content("fnc1", ["foo"])[0], self.file.content[0].content[0])
+        self.assertIs(lexicon.find_content("fnc3", ["foo", "bar"])[0], self.file.content[0].content[2].content[0])
+        self.assertIsNone(lexicon.find_content("unknown"))
+        self.assertEqual([n.namespace for n in lexicon.allowed_namespaces], ["foo", "bar"])
+
+    def test_find_overloads(self):
+        lexicon = self.file.content[0].lexicon
+        created = []
+        index = lexicon.find_overloads("fnc1", lambda elements: created.append(elements) or len(created))
+        self.assertEqual(index, 1)
+        self.assertEqual(lexicon.find_overloads("fnc1", lambda elements: created.append(elements) or len(created)), 1)
+        self.assertEqual(len(created), 1)
+        self.assertEqual(created[0], lexicon.find_content("fnc1"))
+        self.assertIsNone(lexicon.find_overloads("unknown", lambda elements: created.append(elements)))
+        self.assertEqual(len(created), 1)
+
+    def test_find_node(self):
+        foo = self.file.lexicon.find_node("foo")
+        self.assertEqual(foo.namespace, "foo")
+        self.assertIs(foo.find_node("bar"), foo.nodes[0])
+        self.assertIs(foo.find_node("foo"), foo)
+        self.assertIsNone(foo.find_node("baz"))
+
+    def test_content_changed(self):
+        self.assertIsNone(self.file.lexicon.find_content("fnc4"))
+        function = FunctionInfo.create_default(self.file)
+        function.name = "fnc4"
+        self.file.content.append(function)
+        self.assertEqual(self.file.lexicon.find_content("fnc4"), [function])
+        self.file.content = self.file.content[:-1]
+        self.assertIsNone(self.file.lexicon.find_content("fnc4"))
+
+    def test_content_replaced_in_place(self):
+        lexicon = self.file.lexicon
+        self.assertIsNone(lexicon.find_content("fnc4"))
+        indexes = lexicon._content_indexes()  # pylint: disable=protected-access
+        self.assertIs(lexicon._content_indexes(), indexes)  # pylint: disable=protected-access
+        function = FunctionInfo.create_default(self.file)
+        function.name = "fnc4"
+        self.assertIsNotNone(lexicon.find_content("foo"))
+        self.file.content[0] = function
+        self.assertEqual(lexicon.find_content("fnc4"), [function])
+        self.assertIsNone(lexicon.find_content("foo"))
+
+    def test_content_renamed(self):
+        lexicon = self.file.content[0].lexicon
+        function = lexicon.find_content("fnc1")[0]
+        function.name = "renamed_fn"
+        self.assertIsNone(lexicon.find_content("fnc1"))
+        self.assertEqual(lexicon.find_content("renamed_fn"), [function])
+        namespace = self.file.content[0]
+        namespace.name = "renamed_ns"
+        self.assertIsNone(self.file.lexicon.find_content("foo"))
+        self.assertIs(self.file.lexicon.find_content("renamed_ns")[0], namespace)
+
+    def test_version_per_tree(self):
+        lexicon = self.file.lexicon
+        lexicon.find_cursor(self.file.content[0]._cursor)  # pylint: disable=protected-access
+        version = lexicon._version  # pylint: disable=protected-access
+        other = SourceFile(os.path.dirname(__file__) + r"/source_files/advanced_namespace.hpp")
+        other.lexicon.find_type("FooStruct1")
+        self.assertEqual(lexicon._version, version)  # pylint: disable=protected-access
+        self.assertEqual(lexicon._registered_version, version)  # pylint: disable=protected-access
+        lexicon.find_node("foo").append_content(object())
+        self.assertEqual(lexicon._version, version + 1)  # pylint: disable=protected-access
+
+
+class TestSourceFileCache(unittest.TestCase):
+
+    def setUp(self):
+        self.root = Path(TemporaryFiles(self, os.path.dirname(__file__) + r"/source_files/dependent_files").root)
+        self.source_path = self.root / "main.hpp"
+        self.dependency_path = self.root / "dependency.hpp"
+        self.configuration = Configuration()
+        self.configuration.parsing.cache.directory = self.root / "cache"
+
+    def entries(self):
+        return list((self.root / "cache").glob("*.ast"))
+
+    def test_cache_hit(self):
+        file = SourceFile(str(self.source_path), configuration=self.configuration)
+        self.assertEqual(len(self.entries()), 1)
+        entry_time = self.entries()[0].stat().st_mtime_ns
+        cached = SourceFile(str(self.source_path), configuration=self.configuration)
+        self.assertEqual(len(self.entries()), 1)
+        self.assertEqual([c.name for c in cached.content], [c.name for c in file.content])
+        self.assertEqual(cached.content[0].content[0].type.details.name, "A")
+        self.assertEqual(len(cached.includes), 1)
+        self.assertGreaterEqual(self.entries()[0].stat().st_mtime_ns, entry_time)
+
+    def test_stale_entry(self):
+        SourceFile(str(self.source_path), configuration=self.configuration)
+        old_entries = self.entries()
+        self.dependency_path.write_text("struct A { int x; int y; };\n")
+        file = SourceFile(str(self.source_path), configuration=self.configuration)
+        self.assertEqual(len(file.content[0].content[0].type.details.content), 2)
+        self.assertEqual(self.entries(), old_entries)
+        with self.subTest("options are part of the key"):
+            self.configuration.parsing.compiler_commands = ["-DDEVANA_TEST"]
+            SourceFile(str(self.source_path), configuration=self.configuration)
+            self.assertEqual(len(self.entries()), 2)
+
+    def test_hash_once(self):
+        with mock.patch.object(hashlib, "sha256", wraps=hashlib.sha256) as sha256:
+            file = SourceFile(str(self.source_path), configuration=self.configuration)
+            self.assertEqual(len([c for c in sha256.call_args_list if c.args]), 2)
+            self.assertIsNotNone(file._source_state.hash)  # pylint: disable=protected-access
+            sha256.reset_mock()
+            cached = SourceFile(str(self.source_path), configuration=self.configuration)
+            self.assertEqual([c for c in sha256.call_args_list if c.args], [])
+            self.assertFalse(cached.is_changed(self.source_path.read_text()))
+            self.assertEqual(len([c for c in sha256.call_args_list if c.args]), 1)
+
+    def test_eviction(self):
+        SourceFile(str(self.source_path), configuration=self.configuration)
+        self.configuration.parsing.cache.max_size = 0
+        self.configuration.parsing.compiler_commands = ["-DDEVANA_TEST"]
+        SourceFile(str(self.source_path), configuration=self.configuration)
+        self.assertEqual(len(self.entries()), 0)
+
+
+class TestSourceFileReparse(unittest.TestCase):
+
+    def setUp(self):
+        self.root = Path(TemporaryFiles(self, os.path.dirname(__file__) + r"/source_files/dependent_files").root)
+        self.source_path = self.root / "main.hpp"
+        self.dependency_path = self.root / "dependency.hpp"
+        self.file = SourceFile(str(self.source_path))
+
+    def test_not_changed(self):
+        content = self.file.content
+        self.assertFalse(self.file.is_changed())
+        self.assertFalse(self.file.reparse())
+        self.assertIs(self.file.content, content)
+
+    def test_hash_on_demand(self):
+        state = self.file._source_state  # pylint: disable=protected-access
+        self.assertIsNone(state.hash)
+        self.assertFalse(self.file.is_changed())
+        self.assertIsNone(state.hash)
+        self.assertFalse(self.file.is_changed(self.source_path.read_text()))
+        self.assertIsNotNone(state.hash)
+        self.source_path.write_text('#include "dependency.hpp"\nstruct C { A a; };\n')
+        self.assertTrue(self.file.is_changed())
+
+    def test_reparse_changed_file(self):
+        self.assertEqual([c.name for c in self.file.content], ["Source"])
+        self.source_path.write_text('#include "dependency.hpp"\nstruct Source { A a; };\nstruct C { int c; };\n')
+        self.assertTrue(self.file.is_changed())
+        self.assertTrue(self.file.reparse())
+        self.assertEqual([c.name for c in self.file.content], ["Source", "C"])
+        self.assertEqual(self.file.content[1].text_source.text, "struct C { int c; }")
+        self.assertIsNotNone(self.file.lexicon.find_type("C"))
+        with self.subTest("second reparse"):
+            self.source_path.write_text('#include "dependency.hpp"\nstruct D { A a; };\n')
+            self.assertTrue(self.file.reparse())
+            self.assertEqual([c.name for c in self.file.content], ["D"])
+            self.assertIsNone(self.file.lexicon.find_type("Source"))
+            self.assertIsNone(self.file.lexicon.find_type("C"))
+
+    def test_reparse_changed_include(self):
+        os.utime(self.dependency_path, ns=(time.time_ns() + 10 ** 9, time.time_ns() + 10 ** 9))
+        self.assertTrue(self.file.is_changed())
+
+    def test_reparse_unsaved_text(self):
+        text = '#include "dependency.hpp"\n// comment\nstruct E { A a; };\n'
+        self.assertTrue(self.file.reparse(text))
+        self.assertEqual([c.name for c in self.file.content], ["E"])
+        self.assertEqual(self.file.content[0].text_source.text, "struct E { A a; }")
+        self.assertEqual(self.file.content[0].associated_comment.text, [" comment"])
+        self.assertFalse(self.file.reparse(text))
+        with self.subTest("other files use disk content"):
+            other = SourceFile(str(self.source_path))
+            self.assertEqual([c.name for c in other.content], ["Source"])
+            self.assertEqual(other.content[0].text_source.text, "struct Source { A a; }")
+        with self.subTest("back to disk content"):
+            self.assertTrue(self.file.reparse())
+            self.assertEqual([c.name for c in self.file.content], ["Source"])
+            self.assertEqual(self.file.content[0].text_source.text, "struct Source { A a; }")
+
+    def test_reparse_saved_text(self):
+        text = '#include "dependency.hpp"\nstruct E { A a; };\n'
+        self.assertTrue(self.file.reparse(text))
+        self.source_path.write_text(text)
+        self.assertFalse(self.file.reparse())
+        self.assertFalse(hasattr(self.file.translation_unit, "_devana_unsaved_sources")
+                         and self.file.translation_unit._devana_unsaved_sources)
+        self.assertEqual(self.file.content[0].text_source.text, "struct E { A a; }")
+        with self.subTest("saved text is not kept"):
+            self.source_path.write_text('#include "dependency.hpp"\nstruct F { A a; };\n')
+            self.assertTrue(self.file.reparse('#include "dependency.hpp"\nstruct F { A a; };\n'))
+            self.assertFalse(self.file.translation_unit._devana_unsaved_sources)
+
+
+class TestSourceFileFastIndexProfile(unittest.TestCase):
+
+    def setUp(self):
+        self.configuration = Configuration()
+        self.configuration.parsing.profile = ParsingProfile.FAST_INDEX
+
+    @staticmethod
+    def describe(container) -> list:
+        result = []
+        for element in container.content:
+            description = (type(element).__name__, getattr(element, "name", None))
+            if isinstance(element, FunctionInfo):
+                description += (element.is_declaration, [a.type.name for a in element.arguments])
+            result.append(description)
+            if isinstance(element, CodeContainer):
+                result.append(TestSourceFileFastIndexProfile.describe(element))
+        return result
+
+    def test_same_declarations(self):
+        for name in ("simple_functions.hpp", "definition_declaration.hpp", "core_class.hpp", "overload.hpp"):
+            with self.subTest(name):
+                path = os.path.dirname(__file__) + r"/source_files/" + name
+                self.assertEqual(self.describe(SourceFile(path, configuration=self.configuration)),
+                                 self.describe(SourceFile(path)))
+
+    def test_disabled_features(self):
+        file = SourceFile(os.path.dirname(__file__) + r"/source_files/simple_functions.hpp",
+                          configuration=self.configuration)
+        function = file.content[3]
+        self.assertEqual(function.name, "procedure_def")
+        self.assertTrue(function.is_definition)
+        with self.assertRaises(ParsingProfileError):
+            _ = function.body
+        with self.assertRaises(ParsingProfileError):
+            _ = function.associated_comment
+        with self.assertRaises(ParsingProfileError):
+            _ = function.attributes
+        with self.assertRaises(ParsingProfileError):
+            _ = file.preamble
+
+    def test_attributes_raise_again(self):
+        file = SourceFile(os.path.dirname(__file__) + r"/source_files/attributes.hpp",
+                          configuration=self.configuration)
+        function = file.content[2]
+        self.assertEqual(function.name, "foo_functions")
+        for element in (function, function.arguments[0]):
+            for _ in range(2):
+                with self.assertRaises(ParsingProfileError):
+                    _ = element.attributes
+
+
+class TestSourceFileCursorDispatch(unittest.TestCase):
+
+    def test_candidates(self):
+        file = SourceFile(os.path.dirname(__file__) + r"/source_files/core_class.hpp")
+        dispatch = CursorDispatch.get_dispatch(SourceFile, lambda: file._content_types)
+        self.assertEqual(dispatch.candidates(cindex.CursorKind.STRUCT_DECL), [ClassInfo])
+        self.assertEqual(dispatch.candidates(cindex.CursorKind.FUNCTION_TEMPLATE), [FunctionInfo, MethodInfo])
+        self.assertEqual(dispatch.candidates(cindex.CursorKind.MACRO_DEFINITION), [])
+        with self.subTest("Types without declared kinds"):
+            class AnyCursor(FieldInfo):
+                cursor_kinds = None
+            dispatch = CursorDispatch([FieldInfo, AnyCursor, ConstructorInfo])
+            self.assertEqual(dispatch.candidates(cindex.CursorKind.FIELD_DECL), [FieldInfo, AnyCursor])
+            self.assertEqual(dispatch.candidates(cindex.CursorKind.CONSTRUCTOR), [AnyCursor, ConstructorInfo])
+            self.assertEqual(dispatch.candidates(cindex.CursorKind.MACRO_DEFINITION), [AnyCursor])
+
+    def test_content(self):
+        file = SourceFile(os.path.dirname(__file__) + r"/source_files/core_class.hpp")
+        class_info = next(e for e in file.content if isinstance(e, ClassInfo))
+        self.assertTrue(class_info.content)
+        for element in class_info.content:
+            self.assertIn(element._cursor.kind, type(element).cursor_kinds)
@@ -1,9 +1,20 @@
 import unittest
+import json
 import os
+import pickle
+import subprocess
+import sys
+import threading
+from typing import Optional
 from devana.syntax_abstraction.organizers.sourcemodule import SourceModule, ModuleFilter
+from devana.syntax_abstraction.organizers.sourcefile import SourceFile
+from devana.syntax_abstraction.organizers.parsingsession import ParsingSession
+from devana.syntax_abstraction.organizers.codecontainer import CodeContainer
 from devana.syntax_abstraction.classinfo import ClassInfo
 from devana.syntax_abstraction.functioninfo import FunctionInfo
 from devana.syntax_abstraction.variable import GlobalVariable
+from devana.configuration import Configuration
+from tests.helpers import TemporaryFiles
 
 
 class TestSourceModule(unittest.TestCase):
@@ -27,14 +38,70 @@ class TestSourceModule(unittest.TestCase):
         module = SourceModule("Test_1", self.module_path, f)
         self.assertEqual(len(list(module.files)), 2)
 
+    def test_parallel_creation(self):
+        module = SourceModule("Test_1", self.module_path, jobs=2)
+        self.assertEqual(module.jobs, 2)
+        self.assertEqual(sorted(file.name for file in module.files),
+                         sorted(file.name for file in SourceModule("Test_1", self.module_path).files))
+        for file in module.files:
+            self.assertIs(file.parent, module)
+            self.assertIs(file.lexicon, module.lexicon)
+
+    def test_invalid_jobs(self):
+        with self.assertRaises(ValueError):
+            SourceModule("Test_1", self.module_path, jobs=0)
+
+
+class TestSourceModuleParallelModel(unittest.TestCase):
+
+    @staticmethod
+    def attribute(element, name):
+        try:
+            return getattr(element, name, None)
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            return type(e)
+
+    @classmethod
+    def reference(cls, value):
+        if value is None or isinstance(value, (str, int, float, type)):
+            return value
+        details = cls.attribute(value, "details")
+        return type(value), cls.attribute(value, "name"), details if isinstance(details, type) else type(details), \
+            cls.attribute(details, "name")
+
+    @classmethod
+    def describe(cls, element):
+        result = [type(element)]
+        for name in ("name", "type", "return_type", "arguments"):
+            value = cls.attribute(element, name)
+            if isinstance(value, list):
+                result.append([(cls.attribute(v, "name"), cls.reference(cls.attribute(v, "type"))) for v in value])
+            else:
+                result.append(cls.reference(value))
+        if isinstance(element, CodeContainer):
+            result.append([cls.describe(e) for e in element.content])
+        return result
+
+    def test_same_model(self):
+        module_path = os.path.dirname(__file__) + r"/source_files"
+        serial = {str(f.path): self.describe(f) for f in SourceModule("Test_1", module_path, jobs=1).files}
+        parallel = {str(f.path): self.describe(f) for f in SourceModule("Test_1", module_path, jobs=2).files}
+        self.assertEqual(serial.keys(), parallel.keys())
+        for path, model in serial.items():
+            self.assertEqual(model, parallel[path], path)
+
 
 class TestSourceModuleSearchingTypes(unittest.TestCase):
+    jobs = 1
+    umbrella_parsing = False
 
     def setUp(self):
         module_path = os.path.dirname(__file__) + r"/source_files/multiple_files/module"
         f = ModuleFilter()
         f.allowed_filter = [r"inc_types\.hpp", r"src_types\.cpp"]
-        self.module = SourceModule("Test_1", module_path, f)
+        configuration = Configuration()
+        configuration.parsing.umbrella_parsing = self.umbrella_parsing
+        self.module = SourceModule("Test_1", module_path, f, jobs=self.jobs, configuration=configuration)
         self.assertEqual(len(list(self.module.files)), 2)
         inc_file = next(file for file in self.module.files if file.name == "inc_types.hpp")
         self.src_file = next(file for file in self.module.files if file.name == "src_types.cpp")
@@ -75,3 +142,269 @@ class TestSourceModuleSearchingTypes(unittest.TestCase):
         class_info: ClassInfo = self.src_file.content[9]
         self.assertEqual(class_info.inheritance.type_parents[0].type, self.expected_type_namespace)
         self.assertTrue(class_info.inheritance.type_parents[0].is_virtual)
+
+
+class TestSourceModuleSearchingTypesParallel(TestSourceModuleSearchingTypes):
+    jobs = 2
+
+
+class TestSourceModuleSearchingTypesUmbrella(TestSourceModuleSearchingTypes):
+    umbrella_parsing = True
+
+
+class TestSourceModuleUmbrella(unittest.TestCase):
+
+    def setUp(self):
+        self.root = os.path.dirname(__file__) + r"/source_files/umbrella_module"
+
+    def create_module(self, umbrella_parsing: bool, shards: int = 1, root: Optional[str] = None) -> SourceModule:
+        configuration = Configuration()
+        configuration.parsing.umbrella_parsing = umbrella_parsing
+        configuration.parsing.umbrella_shards = shards
+        return SourceModule("Test_1", self.root if root is None else root, configuration=configuration)
+
+    @staticmethod
+    def describe(module: SourceModule):
+        return [(f.name, [type(c).__name__ + ":" + getattr(c, "name", "") for c in f.content],
+                 [i.value for i in f.includes], f.header_guard) for f in module.files]
+
+    def test_same_model(self):
+        self.assertEqual(self.describe(self.create_module(True)), self.describe(self.create_module(False)))
+        self.assertEqual(self.describe(self.create_module(True, 3)), self.describe(self.create_module(False)))
+
+    def test_shared_translation_unit(self):
+        module = self.create_module(True)
+        files = {f.name: f for f in module.files}
+        headers = [files[name] for name in ("a.hpp", "b.hpp", "base.hpp", "c.hpp")]
+        for header in headers:
+            self.assertIs(header.lexicon, module.lexicon)
+            self.assertEqual(header.text_source.file, str(header.path))
+        self.assertEqual(len({id(h._cursor.translation_unit) for h in headers}), 1)  # pylint: disable=protected-access
+        self.assertIsNot(files["use.cpp"]._cursor.translation_unit,  # pylint: disable=protected-access
+                         files["a.hpp"]._cursor.translation_unit)  # pylint: disable=protected-access
+        self.assertEqual(len(files["c.hpp"].diagnostics), 1)
+        self.assertEqual(files["a.hpp"].diagnostics, [])
+        a = files["a.hpp"].content[0]
+        self.assertIs(a.inheritance.type_parents[0].type, files["base.hpp"].content[0])
+        self.assertIs(files["b.hpp"].content[0].content[0].fields[0].type.details, a)
+        self.assertEqual(files["base.hpp"].content[0].associated_comment.text, [" Base comment"])
+
+    def test_shards(self):
+        module = self.create_module(True, 2)
+        translation_units = {id(f._cursor.translation_unit) for f in module.files}  # pylint: disable=protected-access
+        self.assertEqual(len(translation_units), 3)
+
+    def test_refresh(self):
+        temporary = TemporaryFiles(self, self.root)
+        module = self.create_module(True, root=temporary.root)
+        files = {f.name: f for f in module.files}
+        temporary.write("a.hpp", '#pragma once\n#include "base.hpp"\nstruct A : Base { int y; int z; };\n', True)
+        self.assertIn(files["a.hpp"], module.refresh())
+        self.assertEqual(len(files["a.hpp"].content[0].fields), 2)
+        self.assertEqual(len(files["a.hpp"].content), 1)
+
+    def test_invalid_configuration(self):
+        configuration = Configuration()
+        configuration.parsing.umbrella_shards = 0
+        with self.assertRaises(ValueError):
+            SourceModule("Test_1", self.root, configuration=configuration)
+        configuration = Configuration()
+        configuration.parsing.umbrella_parsing = True
+        configuration.parsing.file_by_file_parsing = True
+        with self.assertRaises(ValueError):
+            SourceModule("Test_1", self.root, configuration=configuration)
+
+
+class TestSourceModuleSession(unittest.TestCase):
+
+    def setUp(self):
+        self.module_path = os.path.dirname(__file__) + r"/source_files/multiple_files/module"
+
+    def test_files_share_index(self):
+        module = SourceModule("Test_1", self.module_path)
+        indexes = {id(file._cursor.translation_unit.index) for file in module.files}  # pylint: disable=protected-access
+        self.assertEqual(indexes, {id(module.session.index)})
+
+    def test_session_index_per_thread(self):
+        session = ParsingSession()
+        indexes = []
+        thread = threading.Thread(target=lambda: indexes.append(session.index))
+        thread.start()
+        thread.join()
+        self.assertIs(session.index, session.index)
+        self.assertIsNot(indexes[0], session.index)
+
+    def test_default_session(self):
+        file = SourceFile(os.path.join(self.module_path, "inc_types.hpp"))
+        self.assertIs(file._cursor.translation_unit.index, ParsingSession.default().index)  # pylint: disable=protected-access
+
+
+class TestSourceModuleRefresh(unittest.TestCase):
+
+    def setUp(self):
+        self.temporary = TemporaryFiles(self, os.path.dirname(__file__) + r"/source_files/refresh_module")
+        self.module = SourceModule("Test_1", self.temporary.root)
+        self.files = {file.name: file for file in self.module.files}
+        for file in self.files.values():
+            self.assertTrue(file.content)
+
+    def test_refresh_not_changed(self):
+        self.assertEqual(self.module.refresh(), [])
+
+    def test_refresh_changed(self):
+        other_content = self.files["other.hpp"].content
+        self.temporary.write("types.hpp", "namespace types { struct A { int x; }; struct B { int z; }; }\n", True)
+        parsed = self.module.refresh()
+        self.assertEqual(sorted(file.name for file in parsed), ["types.hpp", "use.cpp"])
+        self.assertIs(self.files["other.hpp"].content, other_content)
+        self.assertIsNotNone(self.module.lexicon.find_type("B", ["types"]))
+        self.assertEqual(self.files["use.cpp"].content[0].type.details,
+                         self.files["types.hpp"].content[0].content[0])
+
+    def test_refresh_added_and_removed(self):
+        os.remove(self.temporary.path("other.hpp"))
+        self.temporary.write("new.hpp", "struct New { int w; };\n", True)
+        parsed = self.module.refresh()
+        self.assertEqual([file.name for file in parsed], ["new.hpp"])
+        self.assertEqual(sorted(file.name for file in self.module.files), ["new.hpp", "types.hpp", "use.cpp"])
+        self.assertIsNone(self.module.lexicon.find_type("Other"))
+        self.assertIsNotNone(self.module.lexicon.find_type("New"))
+
+
+class TestSourceModuleCompilationDatabase(unittest.TestCase):
+
+    def setUp(self):
+        # compilation database needs absolute directory of sources, so only the database itself is created
+        self.root = os.path.abspath(os.path.dirname(__file__) + r"/source_files/compilation_database")
+        temporary = TemporaryFiles(self)
+        self.build = temporary.path("build")
+        os.mkdir(self.build)
+        commands = [{"directory": self.root, "file": name,
+                     "arguments": ["clang++", "-I", "include", f"-D{define}", "-c", name, "-o", f"build/{name}.o"]}
+                    for name, define in (("a.cpp", "VARIANT_A"), ("b.cpp", "VARIANT_B"), ("c.cpp", "VARIANT_B"))]
+        temporary.write("build/compile_commands.json", json.dumps(commands))
+
+    def check_module(self, module: SourceModule):
+        files = {file.name: file for file in module.files}
+        self.assertEqual(sorted(files), ["a.cpp", "b.cpp", "c.cpp"])
+        self.assertEqual([c.name for c in files["a.cpp"].content], ["VariantA"])
+        self.assertEqual([c.name for c in files["b.cpp"].content], ["VariantB"])
+        self.assertEqual(files["b.cpp"].content[0].content[0].type.details.name, "Common")
+        self.assertIs(files["b.cpp"].configuration, files["c.cpp"].configuration)
+        self.assertIsNot(files["a.cpp"].configuration, files["b.cpp"].configuration)
+        self.assertNotIn("-c", files["a.cpp"].configuration.parsing.compiler_commands)
+
+    def test_from_compilation_database(self):
+        module = SourceModule.from_compilation_database(os.path.join(self.build, "compile_commands.json"))
+        self.assertEqual(module.name, "build")
+        self.check_module(module)
+
+    def test_from_compilation_database_parallel(self):
+        module = SourceModule.from_compilation_database(self.build, "Test_1", jobs=2)
+        self.check_module(module)
+
+    def test_from_compilation_database_filter(self):
+        f = ModuleFilter()
+        f.forbidden_filter = [r"a\.cpp"]
+        module = SourceModule.from_compilation_database(self.build, module_filter=f)
+        self.assertEqual(sorted(file.name for file in module.files), ["b.cpp", "c.cpp"])
+
+    def test_missing_compilation_database(self):
+        with self.assertRaises(ValueError):
+            SourceModule.from_compilation_database(self.root)
+
+
+class TestSourceModuleSnapshot(unittest.TestCase):
+
+    def setUp(self):
+        self.path = TemporaryFiles(self).path("module.snapshot")
+        module_path = os.path.dirname(__file__) + r"/source_files/multiple_files/module"
+        f = ModuleFilter()
+        f.allowed_filter = [r"inc_types\.hpp", r"src_types\.cpp"]
+        self.module = SourceModule("Test_1", module_path, f)
+
+    def test_snapshot(self):
+        self.module.snapshot(self.path)
+        module = SourceModule.load_snapshot(self.path)
+        self.assertEqual(module.name, "Test_1")
+        files = {file.name: file for file in module.files}
+        self.assertEqual(sorted(files), ["inc_types.hpp", "src_types.cpp"])
+        expected_type = files["inc_types.hpp"].content[0]
+        variable: GlobalVariable = files["src_types.cpp"].content[0]
+        self.assertIs(variable.type.details, expected_type)
+        function: FunctionInfo = files["src_types.cpp"].content[2]
+        self.assertIs(function.arguments[0].type.details, expected_type)
+        self.assertIn(function.name, function.text_source.text)
+        self.assertIs(module.lexicon.find_type(expected_type.name), expected_type)
+
+    def test_module_after_snapshot(self):
+        files = {file.name: file for file in self.module.files}
+        self.module.snapshot(self.path)
+        self.assertEqual({file.name: file for file in self.module.files}, files)
+        variable: GlobalVariable = files["src_types.cpp"].content[0]
+        self.assertIs(variable.type.details, files["inc_types.hpp"].content[0])
+        self.assertIsNotNone(files["src_types.cpp"].translation_unit)
+        self.assertEqual(self.module.refresh(), [])
+        self.assertEqual(sorted(file.name for file in SourceModule.load_snapshot(self.path).files), sorted(files))
+
+    def test_snapshot_without_backend(self):
+        self.module.snapshot(self.path)
+        script = ("import sys\n"
+                  "from clang import cindex\n"
+                  "cindex.Config.set_library_file('/nonexistent/libclang.so')\n"
+                  "from devana.syntax_abstraction.organizers.sourcemodule import SourceModule\n"
+                  "module = SourceModule.load_snapshot(sys.argv[1])\n"
+                  "print(sorted(c.name for f in module.files for c in f.content if hasattr(c, 'name'))[0])\n")
+        result = subprocess.run([sys.executable, "-c", script, self.path], capture_output=True, text=True,
+                                check=True, env=dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path)))
+        self.assertNotEqual(result.stdout.strip(), "")
+
+    def test_load_invalid_snapshot(self):
+        with open(self.path, "wb") as f:
+            pickle.dump([1, 2, 3], f)
+        with self.assertRaises(ValueError):
+            SourceModule.load_snapshot(self.path)
+
+
+class TestSourceModuleIncludeGraph(unittest.TestCase):
+
+    def setUp(self):
+        self.root = os.path.dirname(__file__) + r"/source_files/include_graph"
+        self.module = SourceModule("Test_1", self.root)
+
+    def path(self, name: str) -> str:
+        return os.path.abspath(os.path.join(self.root, name))
+
+    def test_edges(self):
+        graph = self.module.include_graph()
+        self.assertEqual(sorted(graph.nodes), sorted(self.path(n) for n in ("a.hpp", "b.hpp", "c.hpp", "detail/c.hpp")))
+        self.assertEqual(graph.includes(self.path("a.hpp")), [self.path("b.hpp"), self.path("detail/c.hpp")])
+        self.assertEqual(graph.includes(self.path("b.hpp")), [self.path("c.hpp")])
+        self.assertEqual(graph.included_by(self.path("detail/c.hpp")), [self.path("a.hpp")])
+        self.assertEqual(sorted(graph.included_by(self.path("b.hpp"))), [self.path("a.hpp"), self.path("c.hpp")])
+        with self.assertRaises(KeyError):
+            graph.includes(self.path("d.hpp"))
+
+    def test_order(self):
+        graph = self.module.include_graph()
+        self.assertEqual(len(graph.cycles), 1)
+        self.assertEqual(sorted(graph.cycles[0]), [self.path("b.hpp"), self.path("c.hpp")])
+        self.assertEqual(len(graph.strongly_connected_components), 3)
+        order = graph.topological_order
+        self.assertEqual(order[-1], self.path("a.hpp"))
+        self.assertEqual(sorted(order), sorted(graph.nodes))
+
+    def test_transitive(self):
+        graph = self.module.include_graph()
+        self.assertEqual(graph.transitive_includes(self.path("a.hpp")),
+                         {self.path("b.hpp"), self.path("c.hpp"), self.path("detail/c.hpp")})
+        self.assertEqual(graph.transitive_includes(self.path("b.hpp")), {self.path("b.hpp"), self.path("c.hpp")})
+        self.assertEqual(graph.transitive_includes(self.path("detail/c.hpp")), set())
+        self.assertEqual(graph.transitive_included_by(self.path("c.hpp")),
+                         {self.path("a.hpp"), self.path("b.hpp"), self.path("c.hpp")})
+
+    def test_cache(self):
+        graph = self.module.include_graph()
+        self.assertIs(self.module.include_graph(), graph)
+        self.module.refresh()
+        self.assertIsNot(self.module.include_graph(), graph)
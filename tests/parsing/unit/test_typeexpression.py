@@ -4,9 +4,10 @@ import clang
 import os
 import sys
 from tests.helpers import find_by_name, stub_lexicon
-from devana.syntax_abstraction.typeexpression import TypeExpression, BasicType, TypeModification
+from devana.syntax_abstraction.typeexpression import TypeExpression, BasicType, TypeModification, TypeRecord
 from devana.syntax_abstraction.functioninfo import FunctionInfo
 from devana.syntax_abstraction.organizers.sourcefile import SourceFile
+from devana.configuration import Configuration, ParsingConfiguration
 
 
 class TestTypeExpressionBasic(unittest.TestCase):
@@ -528,3 +529,72 @@ class TestTypeExpressionBasic(unittest.TestCase):
         self.assertEqual(result.arguments[0].type.modification.array_order, [""])
         self.assertEqual(result.arguments[0].type.modification.pointer_order, None)
         self.assertEqual(result.arguments[0].type.details, BasicType.INT)
+
+
+class TestTypeExpressionInterning(unittest.TestCase):
+
+    def setUp(self):
+        path = os.path.dirname(__file__) + r"/source_files/overload.hpp"
+        configuration = Configuration(ParsingConfiguration(intern_types=True))
+        self.file = SourceFile.from_path(path, configuration=configuration)
+        self.default_file = SourceFile.from_path(path)
+
+    def test_equal_types_share_record(self):
+        first: FunctionInfo = self.file.content[1]
+        second: FunctionInfo = self.file.content[8]
+        self.assertEqual(first.arguments[0].type, second.arguments[0].type)
+        self.assertIs(first.arguments[0].type.record, second.arguments[0].type.record)
+        self.assertIsNot(first.arguments[0].type.modification, second.arguments[0].type.modification)
+        self.assertIs(first.return_type.record, second.return_type.record)
+        self.assertIs(self.file.content[2].arguments[0].type.record.details, BasicType.DOUBLE)
+        self.assertNotEqual(self.file.content[2].arguments[0].type, self.file.content[3].arguments[0].type)
+        self.assertIsNone(self.default_file.content[1].arguments[0].type.record)
+
+    def test_copy_on_write(self):
+        first: FunctionInfo = self.file.content[1]
+        second: FunctionInfo = self.file.content[8]
+        record = first.arguments[0].type.record
+        first.arguments[0].type.modification = TypeModification.CONST
+        self.assertIsNot(first.arguments[0].type.record, record)
+        self.assertNotEqual(first.arguments[0].type, second.arguments[0].type)
+        self.assertIs(second.arguments[0].type.record, record)
+        self.assertTrue(second.arguments[0].type.modification.is_no_modification)
+
+    def test_change_in_place(self):
+        path = os.path.dirname(__file__) + r"/source_files/overload.hpp"
+        other_file = SourceFile.from_path(path, configuration=Configuration(ParsingConfiguration(intern_types=True)))
+        first = self.file.content[3].arguments[0].type
+        second = other_file.content[3].arguments[0].type
+        record = second.record
+        self.assertIs(first.record, record)
+        first.modification.pointer_order = 2
+        first.namespaces.append("zzz")
+        self.assertEqual(second.modification.pointer_order, 1)
+        self.assertEqual(second.namespaces, [])
+        self.assertEqual(record.modification.pointer_order, 1)
+        self.assertEqual(record.namespaces, ())
+        self.assertIsNot(first.record, record)
+        self.assertIs(second.record, record)
+        self.assertIsInstance(record, TypeRecord)
+        self.assertNotEqual(first, second)
+
+    def test_same_equality(self):
+        def types(file):
+            result = []
+            for function in file.content:
+                if isinstance(function, FunctionInfo):
+                    result.append(function.return_type)
+                    result += [a.type for a in function.arguments]
+            return result
+
+        interned = types(self.file)
+        default = types(self.default_file)
+        self.assertEqual(len(interned), len(default))
+        for i, (a, b) in enumerate(zip(interned, default)):
+            for c, d in zip(interned[i:], default[i:]):
+                self.assertEqual(a == c, b == d)
+        first = self.file.content[1].arguments[0].type
+        second = self.file.content[8].arguments[0].type
+        first.namespaces = ["std"]
+        self.assertIsNot(first.record, second.record)
+        self.assertEqual(first, second)